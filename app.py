@@ -3,7 +3,7 @@ import streamlit as st
 # load external modules
 from style import add_custom_css      
 from state import init_session_state  
-from helpers import TARGET_COL        
+from helpers import TARGET_COL, collect_train_job, show_training_progress
 
 # import pages
 from pages.home import show_home                      
@@ -91,6 +91,12 @@ with st.sidebar:
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+    # Progres training model di latar belakang (terlihat dari halaman mana pun);
+    # hasilnya dipublikasikan ke session_state begitu job selesai
+    train_job = collect_train_job()
+    if train_job is not None and not train_job.finished:
+        show_training_progress(train_job.id, with_cancel=False)
+
 
 # ----------------------------
 #   PAGE ROUTER
@@ -0,0 +1,52 @@
+# benchmarks/bench_ingest.py
+"""
+Benchmark ingest: pd.read_csv standar vs mode chunked pyarrow (core.ingest),
+serta Parquet dengan proyeksi kolom fitur + target.
+
+Contoh:
+    python benchmarks/bench_ingest.py --rows 2000000
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import MODEL_COLUMNS, make_dataset, run_isolated
+
+from core.ingest import read_columnar, read_csv_chunked, read_csv_standard
+
+
+def read_parquet_projected(path):
+    return read_columnar(path, "parquet", columns=MODEL_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="jumlah baris dataset sintetis")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "heart.csv"
+        parquet_path = Path(tmp) / "heart.parquet"
+        df = make_dataset(args.rows)
+        df.to_csv(csv_path, index=False)
+        df.to_parquet(parquet_path, index=False)
+        del df
+        size_mb = csv_path.stat().st_size / (1024 * 1024)
+        print(f"Dataset: {args.rows:,} baris, {size_mb:.1f} MB CSV\n")
+
+        cases = [
+            ("standar (pandas)", read_csv_standard, csv_path),
+            ("chunked (pyarrow)", read_csv_chunked, csv_path),
+            ("parquet (proyeksi)", read_parquet_projected, parquet_path),
+        ]
+        print(f"{'mode':<20}{'wall (s)':>10}{'peak RSS (MB)':>16}{'delta RSS (MB)':>16}")
+        for name, fn, path in cases:
+            res = run_isolated(fn, str(path))
+            print(
+                f"{name:<20}{res['wall_s']:>10.2f}{res['peak_rss_mb']:>16.1f}"
+                f"{res['peak_rss_mb'] - res['baseline_rss_mb']:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
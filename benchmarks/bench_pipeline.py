@@ -0,0 +1,64 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark pipeline lengkap tanpa Streamlit (core.pipeline): ingest file -> preprocessing ->
+training Random Forest -> evaluasi -> scoring batch.
+
+Waktu & memori tiap tahap dicatat dengan core.instrument.StageTimer (trace_memory=True), lalu
+pipeline yang sama dijalankan sekali lagi di proses terpisah (seperti worker, tanpa tracemalloc)
+untuk mengukur wall time & peak RSS.
+
+Contoh:
+    python benchmarks/bench_pipeline.py --rows 200000 --n-estimators 100
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import MODEL_COLUMNS, make_dataset, run_isolated
+
+from core.instrument import StageTimer, stages_frame
+from core.pipeline import evaluate_model, load_dataset, preprocess_frame, score_batch, train_model
+
+FEATURES = MODEL_COLUMNS[:-1]
+TARGET = MODEL_COLUMNS[-1]
+
+
+def run_pipeline(path, n_estimators, timer=None):
+    # satu putaran pipeline; jika timer diberikan, tiap tahap diukur
+    timer = timer or StageTimer()
+    with timer.stage("ingest"):
+        df = load_dataset(path, path, FEATURES, TARGET)
+    with timer.stage("preprocessing"):
+        clean, info = preprocess_frame(df, FEATURES, TARGET)
+    with timer.stage("training"):
+        result = train_model(clean, FEATURES, TARGET, n_estimators=n_estimators)
+    with timer.stage("evaluasi"):
+        evaluate_model(result.model, result.X_test, result.y_test)
+    with timer.stage("scoring"):
+        score_batch(result.model, info["preprocessor"], df[FEATURES])
+    return timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="jumlah baris dataset sintetis")
+    parser.add_argument("--n-estimators", type=int, default=100, help="jumlah tree Random Forest")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "heart.parquet")
+        make_dataset(args.rows, missing_frac=0.02, dup_frac=0.05).to_parquet(path, index=False)
+        print(f"Dataset: {args.rows:,} baris, {args.n_estimators} tree\n")
+
+        timer = run_pipeline(path, args.n_estimators, StageTimer(trace_memory=True))
+        print(stages_frame(timer.records).to_string(index=False))
+
+        res = run_isolated(run_pipeline, path, args.n_estimators)
+        print(
+            f"\nproses terpisah: wall {res['wall_s']:.2f} s, "
+            f"peak RSS {res['peak_rss_mb']:.1f} MB (baseline {res['baseline_rss_mb']:.1f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
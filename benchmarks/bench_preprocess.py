@@ -0,0 +1,83 @@
+# benchmarks/bench_preprocess.py
+"""
+Benchmark preprocessing: alur lama (copy -> subset kolom -> drop_duplicates -> dropna ->
+encoding per kolom) vs alur tanpa salinan perantara (core.preprocess, satu mask keep),
+serta mode out-of-core (core.outofcore) yang langsung membaca file.
+
+Data mentah dimuat dulu ke memori dan tidak ikut diukur, kecuali untuk mode out-of-core
+yang memang membaca file sendiri.
+
+Contoh:
+    python benchmarks/bench_preprocess.py --rows 1000000
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from common import MODEL_COLUMNS, make_dataset, run_isolated
+
+from core.outofcore import preprocess_out_of_core
+from core.preprocess import preprocess_frame
+
+FEATURES = MODEL_COLUMNS[:-1]
+TARGET = MODEL_COLUMNS[-1]
+
+
+def preprocess_legacy(df):
+    # alur preprocess_data sebelum dioptimasi (disalin apa adanya, tanpa Streamlit)
+    df = df.copy()
+    df = df[MODEL_COLUMNS]
+    dup_count = df.duplicated().sum()
+    missing_before = df.isna().sum()
+    df = df.drop_duplicates()
+    df = df.dropna()
+    for col in df.columns:
+        if df[col].dtype == "object":
+            df[col] = df[col].astype("category").cat.codes
+    return df, {"duplicates_removed": int(dup_count), "missing_values_before": missing_before.to_dict()}
+
+
+def preprocess_copy_free(df):
+    return preprocess_frame(df, FEATURES, TARGET)
+
+
+def preprocess_ooc(path):
+    with tempfile.TemporaryDirectory() as store_dir:
+        preprocess_out_of_core(path, path, FEATURES, TARGET, store_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="jumlah baris dataset sintetis")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet_path = str(Path(tmp) / "heart.parquet")
+        df = make_dataset(args.rows, missing_frac=0.02, dup_frac=0.05)
+        df.to_parquet(parquet_path, index=False)
+
+        # pastikan kedua alur in-memory menghasilkan data yang sama sebelum diukur
+        legacy, _ = preprocess_legacy(df)
+        clean, _ = preprocess_copy_free(df)
+        pd.testing.assert_frame_equal(legacy, clean)
+        del df, legacy, clean
+        print(f"Dataset: {args.rows:,} baris, {len(MODEL_COLUMNS)} kolom model (hasil kedua alur identik)\n")
+
+        cases = [
+            ("lama (5 salinan)", preprocess_legacy, pd.read_parquet),
+            ("tanpa salinan", preprocess_copy_free, pd.read_parquet),
+            ("out-of-core (file)", preprocess_ooc, None),
+        ]
+        print(f"{'mode':<22}{'wall (s)':>10}{'peak RSS (MB)':>16}{'delta RSS (MB)':>16}")
+        for name, fn, setup in cases:
+            res = run_isolated(fn, parquet_path, setup=setup)
+            print(
+                f"{name:<22}{res['wall_s']:>10.2f}{res['peak_rss_mb']:>16.1f}"
+                f"{res['peak_rss_mb'] - res['baseline_rss_mb']:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_search.py
+"""
+Benchmark pencarian hyperparameter: successive halving vs randomized search (semua kandidat
+dengan seluruh data training) pada kandidat yang sama, tanpa batas waktu.
+
+Untuk tiap strategi dicatat waktu total, jumlah fit, akurasi validasi kandidat terbaik dan
+akurasi testing model terbaik yang dilatih ulang (train_model, sama seperti tombol
+"Latih Model dengan Konfigurasi Terbaik"). Waktu grid penuh (semua kombinasi SEARCH_SPACE
+dengan seluruh data) diperkirakan dari rata-rata fit time randomized search.
+
+Contoh:
+    python benchmarks/bench_search.py --rows 50000 --candidates 27
+"""
+import argparse
+import math
+
+import joblib
+
+from common import MODEL_COLUMNS, make_dataset
+
+from core.pipeline import evaluate_model, train_model
+from core.preprocess import preprocess_frame
+from core.search import SEARCH_SPACE, SEARCH_STRATEGIES, search_hyperparameters
+
+FEATURES = MODEL_COLUMNS[:-1]
+TARGET = MODEL_COLUMNS[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="jumlah baris dataset sintetis")
+    parser.add_argument("--candidates", type=int, default=27, help="jumlah kandidat konfigurasi")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="jumlah fit bersamaan (-1 = semua core)")
+    args = parser.parse_args()
+
+    clean, _ = preprocess_frame(make_dataset(args.rows)[MODEL_COLUMNS], FEATURES, TARGET)
+    n_jobs = joblib.effective_n_jobs(args.n_jobs)
+    print(f"Dataset: {len(clean):,} baris bersih • {args.candidates} kandidat • {n_jobs} fit bersamaan\n")
+
+    print(f"{'strategi':<10}{'waktu (s)':>11}{'fit':>6}{'ronde':>7}{'akurasi val':>13}{'akurasi test':>14}  konfigurasi terbaik")
+    results = {}
+    for strategy in SEARCH_STRATEGIES:
+        result = search_hyperparameters(
+            clean, FEATURES, TARGET, strategy=strategy, n_candidates=args.candidates,
+            time_budget=math.inf, n_jobs=args.n_jobs,
+        )
+        params = dict(result["best_params"])
+        model = train_model(clean, FEATURES, TARGET, n_estimators=params.pop("n_estimators"), model_params=params)
+        test_acc = evaluate_model(model.model, model.X_test, model.y_test)["accuracy"]
+        results[strategy] = result
+        print(
+            f"{strategy:<10}{result['elapsed']:>11.2f}{result['fits']:>6}{result['rounds']:>7}"
+            f"{result['best_score']:>13.4f}{test_acc:>14.4f}  {result['best_params']}"
+        )
+
+    # grid penuh diperkirakan dari rata-rata fit time dengan seluruh data training
+    board = results["random"]["leaderboard"]
+    grid_size = math.prod(len(v) for v in SEARCH_SPACE.values())
+    grid_s = board["Fit Time (s)"].mean() * grid_size / n_jobs
+    halving_s = results["halving"]["elapsed"]
+    print(f"\nPerkiraan grid penuh ({grid_size} kombinasi, seluruh data): {grid_s:,.0f} s")
+    print(f"Successive halving: {halving_s / results['random']['elapsed']:.1%} waktu randomized search, "
+          f"{halving_s / grid_s:.2%} waktu grid penuh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/common.py
+"""
+Utilitas bersama untuk script benchmark:
+- pembuat dataset sintetis yang meniru dataset Heart Attack Prediction in Indonesia (Kaggle)
+- pengukuran waktu & peak RSS yang dijalankan di proses terpisah
+"""
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# supaya modul di root repo (core/, helpers.py, dll.) bisa di-import dari folder benchmarks/
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.pipeline import DEFAULT_FEATURES, TARGET_COL  # noqa: E402
+
+# kolom fitur + target yang dipakai aplikasi (sama dengan state.init_session_state)
+MODEL_COLUMNS = DEFAULT_FEATURES + [TARGET_COL]
+
+
+def make_dataset(n_rows: int, seed: int = 42, missing_frac: float = 0.01, dup_frac: float = 0.01) -> pd.DataFrame:
+    """
+    Membuat DataFrame sintetis dengan kolom fitur, target, dan beberapa kolom tambahan
+    yang tidak dipakai model (seperti pada dataset aslinya).
+    Parameter:
+    - n_rows       : jumlah baris
+    - seed         : seed random agar hasil bisa direproduksi
+    - missing_frac : proporsi baris yang diberi missing value
+    - dup_frac     : proporsi baris duplikat
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "age": rng.integers(18, 90, n_rows),
+        "gender": rng.choice(["Male", "Female"], n_rows),
+        "region": rng.choice(["Urban", "Rural"], n_rows),
+        "income_level": rng.choice(["Low", "Middle", "High"], n_rows),
+        "hypertension": rng.integers(0, 2, n_rows),
+        "diabetes": rng.integers(0, 2, n_rows),
+        "cholesterol_level": rng.integers(100, 350, n_rows),
+        "obesity": rng.integers(0, 2, n_rows),
+        "waist_circumference": rng.integers(60, 150, n_rows),
+        "family_history": rng.integers(0, 2, n_rows),
+        "smoking_status": rng.choice(["Never", "Past", "Current"], n_rows),
+        "alcohol_consumption": rng.choice(["None", "Moderate", "High"], n_rows),
+        "physical_activity": rng.choice(["Low", "Moderate", "High"], n_rows),
+        "dietary_habits": rng.choice(["Healthy", "Unhealthy"], n_rows),
+        "air_pollution_exposure": rng.choice(["Low", "Moderate", "High"], n_rows),
+        "stress_level": rng.choice(["Low", "Moderate", "High"], n_rows),
+        "sleep_hours": rng.normal(6.5, 1.2, n_rows).round(1),
+        "blood_pressure_systolic": rng.integers(90, 200, n_rows),
+        "blood_pressure_diastolic": rng.integers(60, 120, n_rows),
+        "fasting_blood_sugar": rng.integers(70, 250, n_rows),
+        "cholesterol_hdl": rng.integers(20, 100, n_rows),
+        "cholesterol_ldl": rng.integers(50, 250, n_rows),
+        "triglycerides": rng.integers(50, 400, n_rows),
+        "EKG_results": rng.choice(["Normal", "Abnormal"], n_rows),
+        "previous_heart_disease": rng.integers(0, 2, n_rows),
+        "medication_usage": rng.integers(0, 2, n_rows),
+        "participated_in_free_screening": rng.integers(0, 2, n_rows),
+        "heart_attack": rng.integers(0, 2, n_rows),
+    })
+
+    # sisipkan missing value pada kolom fitur
+    n_missing = int(n_rows * missing_frac)
+    if n_missing:
+        idx = rng.choice(n_rows, n_missing, replace=False)
+        df.loc[idx, "cholesterol_ldl"] = np.nan
+
+    # ganti sebagian baris dengan salinan baris lain agar ada duplikat
+    n_dup = int(n_rows * dup_frac)
+    if n_dup:
+        order = np.arange(n_rows)
+        order[rng.choice(n_rows, n_dup, replace=False)] = rng.choice(n_rows, n_dup, replace=False)
+        df = df.iloc[order].reset_index(drop=True)
+
+    return df
+
+
+# --- PENGUKURAN PEAK RSS ---
+def peak_rss_mb() -> float:
+    """
+    Mengembalikan peak RSS (resident set size) proses saat ini dalam MB.
+    Di Linux dipakai VmHWM karena ru_maxrss ikut mewarisi nilai proses induk saat fork.
+    """
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS melaporkan byte
+        return peak / (1024 * 1024)
+    except ImportError:  # Windows
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def reset_peak_rss():
+    """
+    Mereset peak RSS proses saat ini ke RSS sekarang (Linux, /proc/self/clear_refs).
+    Mengembalikan False jika tidak didukung (peak RSS tetap mencakup tahap sebelumnya).
+    """
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def _child(queue, fn, args, setup):
+    # fungsi yang dijalankan di proses anak: ukur waktu & peak RSS dari satu pemanggilan fn
+    if setup is not None:
+        # data input disiapkan dulu (mis. dimuat ke memori) dan tidak ikut diukur
+        args = (setup(*args),)
+        reset_peak_rss()
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    fn(*args)
+    wall = time.perf_counter() - start
+    queue.put((wall, peak_rss_mb(), rss_before))
+
+
+def run_isolated(fn, *args, setup=None):
+    """
+    Menjalankan fn(*args) di proses baru agar peak RSS tiap skenario tidak saling mempengaruhi.
+    Jika setup diberikan, yang diukur adalah fn(setup(*args)) dan peak RSS direset setelah setup.
+    Mengembalikan dict berisi wall time (detik), peak RSS (MB), dan baseline RSS sebelum fn dipanggil.
+    """
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(queue, fn, args, setup))
+    proc.start()
+    wall, peak, baseline = queue.get()
+    proc.join()
+    return {"wall_s": wall, "peak_rss_mb": peak, "baseline_rss_mb": baseline}
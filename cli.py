@@ -0,0 +1,241 @@
+# cli.py
+"""
+Menjalankan pipeline preprocessing -> training -> scoring tanpa server Streamlit (mis. dari cron).
+
+Hasil yang ditulis ke --out-dir:
+- model.joblib : model Random Forest + encoding kategori + urutan fitur (core.pipeline.save_model)
+- metrics.json : akurasi, confusion matrix, classification report, ringkasan preprocessing,
+                 pelanggaran skema, dan waktu tiap tahap (+ peak memori jika --trace-memory)
+- scores.csv   : data yang di-scoring + kolom "proba", "prediksi", "kategori_dikenal"
+                 (False = nilai kategori tidak ada di data training, baris tidak diprediksi),
+                 dan "valid_skema" (False = ada nilai di luar rentang / pilihan skema core.schema);
+                 dengan --out-of-core file scoring juga dibaca & ditulis per chunk
+
+Contoh:
+    python cli.py data/heart.csv --out-dir runs/2025-01-01 --n-estimators 300 --test-size 0.25
+    python cli.py data/heart.parquet --out-dir runs/latest --score data/pasien_baru.csv
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from core.arrow_dtypes import DTYPE_BACKENDS, NUMPY_BACKEND
+from core.ingest import read_dataset
+from core.instrument import StageTimer, stages_frame
+from core.outofcore import load_clean_store, preprocess_out_of_core, score_out_of_core
+from core.pipeline import (
+    DEFAULT_FEATURES,
+    DEFAULT_N_ESTIMATORS,
+    DEFAULT_TEST_SIZE,
+    RANDOM_STATE,
+    TARGET_COL,
+    evaluate_model,
+    load_dataset,
+    preprocess_frame,
+    save_model,
+    score_batch,
+    train_model,
+)
+from core.schema import schema_for, validate_frame
+
+MODEL_FILE = "model.joblib"
+METRICS_FILE = "metrics.json"
+SCORES_FILE = "scores.csv"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="file dataset training (csv / csv.gz / parquet / feather / arrow)")
+    parser.add_argument("--out-dir", required=True, help="direktori output (dibuat jika belum ada)")
+    parser.add_argument(
+        "--features",
+        default=",".join(DEFAULT_FEATURES),
+        help="daftar kolom fitur dipisah koma (default: fitur aplikasi)",
+    )
+    parser.add_argument("--target", default=TARGET_COL, help=f"kolom target (default: {TARGET_COL})")
+    parser.add_argument("--n-estimators", type=int, default=DEFAULT_N_ESTIMATORS, help="jumlah tree")
+    parser.add_argument("--test-size", type=float, default=DEFAULT_TEST_SIZE, help="proporsi data testing")
+    parser.add_argument("--random-state", type=int, default=RANDOM_STATE, help="seed split & model")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="jumlah core untuk training (-1 = semua)")
+    parser.add_argument("--score", help="file yang di-scoring (default: file input)")
+    parser.add_argument(
+        "--dtype-backend",
+        choices=DTYPE_BACKENDS,
+        default=NUMPY_BACKEND,
+        help="tipe data kolom saat ingest & preprocessing (pyarrow = string/dictionary/integer nullable Arrow; "
+        "tidak untuk --out-of-core)",
+    )
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="preprocessing & scoring per chunk tanpa memuat data mentah ke memori (untuk file sangat besar)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="ukur peak memori tiap tahap dengan tracemalloc (memperlambat pipeline)",
+    )
+    args = parser.parse_args(argv)
+    args.features = [c.strip() for c in args.features.split(",") if c.strip()]
+    if not args.features:
+        parser.error("--features tidak boleh kosong")
+    if not 0 < args.test_size < 1:
+        parser.error("--test-size harus di antara 0 dan 1")
+    if args.out_of_core and args.dtype_backend != NUMPY_BACKEND:
+        # mode out-of-core membaca record batch Arrow langsung (tanpa DataFrame mentah), jadi
+        # pilihan backend dtype tidak berlaku; ditolak supaya metrics.json tidak mencatat backend yang salah
+        parser.error("--dtype-backend tidak bisa dipakai bersama --out-of-core")
+    return args
+
+
+def _violations_summary(report) -> dict:
+    # ringkasan hasil validate_frame untuk metrics.json (None jika validasi tidak dijalankan)
+    if report is None:
+        return None
+    counts = report["columns"].set_index("Kolom")["Pelanggaran"]
+    return {
+        "invalid_rows": report["invalid_rows"],
+        "columns": {col: int(n) for col, n in counts.items() if n},
+        "missing_columns": report["missing_columns"],
+    }
+
+
+def run(args) -> dict:
+    """Menjalankan seluruh pipeline dan menulis file output. Mengembalikan isi metrics.json."""
+    os.makedirs(args.out_dir, exist_ok=True)
+    timer = StageTimer(trace_memory=args.trace_memory)
+
+    input_report = None
+    if args.out_of_core:
+        # ingest + preprocessing sekaligus secara streaming, hasil bersih dimuat dari store Feather
+        with tempfile.TemporaryDirectory(prefix="heart_ooc_") as store_dir:
+            with timer.stage("preprocessing (out-of-core)"):
+                info = preprocess_out_of_core(args.input, args.input, args.features, args.target, store_dir)
+                clean = load_clean_store(info["store_path"])
+    else:
+        with timer.stage("ingest"):
+            raw = load_dataset(args.input, args.input, args.features, args.target, dtype_backend=args.dtype_backend)
+        with timer.stage("validasi skema"):
+            input_report = validate_frame(raw, schema_for(args.features + [args.target]))
+        with timer.stage("preprocessing"):
+            clean, info = preprocess_frame(raw, args.features, args.target)
+        del raw
+
+    with timer.stage("training"):
+        result = train_model(
+            clean,
+            args.features,
+            args.target,
+            n_estimators=args.n_estimators,
+            test_size=args.test_size,
+            random_state=args.random_state,
+            n_jobs=args.n_jobs,
+        )
+    del clean
+
+    with timer.stage("evaluasi"):
+        metrics = evaluate_model(result.model, result.X_test, result.y_test)
+
+    with timer.stage("simpan model"):
+        save_model(os.path.join(args.out_dir, MODEL_FILE), result.model, info["preprocessor"], result.features)
+
+    score_path = args.score or args.input
+    scores_file = os.path.join(args.out_dir, SCORES_FILE)
+    if args.out_of_core:
+        # file scoring (default: file input yang besar) juga dibaca & ditulis per batch
+        with timer.stage("scoring & tulis scores (out-of-core)"):
+            scoring = score_out_of_core(result.model, info["preprocessor"], score_path, score_path, scores_file)
+        score_violations = {
+            "invalid_rows": scoring["invalid_rows"],
+            "columns": {col: n for col, n in scoring["violations"].items() if n},
+            "missing_columns": scoring["missing_columns"],
+        }
+    else:
+        with timer.stage("scoring"):
+            df_score = read_dataset(score_path, score_path, columns=args.features, dtype_backend=args.dtype_backend)
+            scored = score_batch(result.model, info["preprocessor"], df_score)
+            score_report = validate_frame(df_score, schema_for(args.features))
+            scored["valid_skema"] = ~score_report["invalid"]
+
+        with timer.stage("tulis scores"):
+            # ditulis lewat writer CSV pyarrow (jauh lebih cepat dari DataFrame.to_csv untuk file besar)
+            pacsv.write_csv(pa.Table.from_pandas(scored, preserve_index=False), scores_file)
+        scoring = {
+            "scored_rows": int(scored["prediksi"].notna().sum()),
+            "unscored_rows": int(scored["prediksi"].isna().sum()),
+            "unknown_category_rows": int((~scored["kategori_dikenal"]).sum()),
+        }
+        score_violations = _violations_summary(score_report)
+
+    summary = {
+        "input": args.input,
+        "features": result.features,
+        "target": args.target,
+        "params": {
+            "n_estimators": args.n_estimators,
+            "test_size": args.test_size,
+            "random_state": args.random_state,
+            "dtype_backend": args.dtype_backend,
+        },
+        "preprocess": {
+            "rows_before": info["rows_before"],
+            "rows_after": info["rows_after"],
+            "duplicates_removed": info["duplicates_removed"],
+            "missing_values_before": info["missing_values_before"],
+        },
+        "accuracy": float(metrics["accuracy"]),
+        "confusion_matrix": metrics["confusion_matrix"].tolist(),
+        "report": metrics["report"],
+        "scored_rows": scoring["scored_rows"],
+        "unscored_rows": scoring["unscored_rows"],
+        "unknown_category_rows": scoring["unknown_category_rows"],
+        "schema_violations": {
+            "input": _violations_summary(input_report),
+            "score": score_violations,
+        },
+        "stage_timings": timer.records,
+        "preprocess_stage_timings": info.get("stage_timings", []),
+    }
+    with open(os.path.join(args.out_dir, METRICS_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        summary = run(args)
+    except (KeyError, ValueError, OSError) as e:
+        message = e.args[0] if isinstance(e, KeyError) and e.args else e
+        print(f"Gagal: {message}", file=sys.stderr)
+        return 1
+
+    print(
+        f"Baris: {summary['preprocess']['rows_before']:,} -> {summary['preprocess']['rows_after']:,} "
+        f"(duplikat dihapus: {summary['preprocess']['duplicates_removed']:,})"
+    )
+    print(f"Akurasi: {summary['accuracy'] * 100:.2f}%")
+    print(
+        f"Scoring: {summary['scored_rows']:,} baris ({summary['unscored_rows']:,} tidak diprediksi, "
+        f"{summary['unknown_category_rows']:,} di antaranya berisi kategori tak dikenal)"
+    )
+    for name, violations in summary["schema_violations"].items():
+        if violations is not None:
+            print(f"Pelanggaran skema ({name}): {violations['invalid_rows']:,} baris {violations['columns'] or ''}")
+    print()
+    print("Waktu per tahap:")
+    print(stages_frame(summary["stage_timings"]).to_string(index=False))
+    if summary["preprocess_stage_timings"]:
+        print("\nRincian preprocessing:")
+        print(stages_frame(summary["preprocess_stage_timings"]).to_string(index=False))
+    print(f"\nOutput ditulis ke {args.out_dir}: {MODEL_FILE}, {METRICS_FILE}, {SCORES_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# core/append.py
+"""
+Append batch data baru ke dataset mentah (dan data bersih) dengan biaya sebanding ukuran batch.
+
+AppendState menyimpan keadaan inkremental satu dataset di session:
+- FrameBuffer dataset mentah & data bersih (tanpa pd.concat yang menyalin seluruh data lama)
+- RowHashSet hash baris mentah kolom fitur + target, untuk hitung duplikat yang sama persis
+  dengan preprocess_frame pada dataset gabungan
+- ProfileAccumulator & ValidationAccumulator, sehingga profil kolom dan hasil validasi versi
+  dataset baru dihitung dari baris batch saja lalu disimpan ke PROFILE_CACHE / VALIDATION_CACHE
+  dengan fingerprint baru (rerun halaman tidak memprofil & memvalidasi ulang seluruh data)
+
+Keadaan awal dibangun sekali dari dataset saat append pertama (satu pemindaian, sebagian besar
+dari cache hash/profil/validasi); append berikutnya hanya memproses baris batch. Jika batch
+membawa kolom baru, ringkasan dibangun ulang sekali dari dataset gabungan.
+"""
+from typing import NamedTuple
+
+import pandas as pd
+
+from core.cache import bytes_fingerprint
+from core.dedup import RowHashSet, duplicated_mask, get_row_hashes, row_hashes
+from core.frame_buffer import FrameBuffer
+from core.preprocess import append_frame
+from core.profiling import PROFILE_CACHE, ProfileAccumulator, get_profile
+from core.schema import VALIDATION_CACHE, ValidationAccumulator, get_validation
+
+
+class AppendResult(NamedTuple):
+    """Hasil AppendState.append: versi dataset mentah baru (+ data bersih jika ada)."""
+    raw_df: pd.DataFrame
+    fingerprint: str
+    clean_df: pd.DataFrame = None
+    info: dict = None
+
+
+def append_fingerprint(fingerprint: str, batch_fingerprint: str) -> str:
+    """Fingerprint versi dataset setelah append = gabungan fingerprint lama + fingerprint batch."""
+    return bytes_fingerprint(f"{fingerprint}|{batch_fingerprint}".encode())
+
+
+class AppendState:
+    """
+    Keadaan inkremental untuk append batch ke satu dataset mentah.
+    Parameter:
+    - raw_df      : dataset mentah saat ini (tidak diubah)
+    - fingerprint : fingerprint versi dataset raw_df
+    - features    : daftar kolom fitur
+    - target      : nama kolom target
+    """
+
+    def __init__(self, raw_df: pd.DataFrame, fingerprint: str, features, target: str):
+        self.features = list(features)
+        self.target = target
+        self.fingerprint = fingerprint
+        self._raw = FrameBuffer(raw_df)
+        self._clean = None  # (clean_df terakhir, FrameBuffer-nya)
+        self._summarize(raw_df)
+
+    def matches(self, fingerprint: str, features) -> bool:
+        """True jika keadaan ini masih milik versi dataset & daftar fitur tersebut."""
+        return fingerprint == self.fingerprint and list(features) == self.features
+
+    def _summarize(self, raw_df: pd.DataFrame):
+        # dibangun sekali dari dataset utuh (hash, profil & validasi diambil dari cache jika ada)
+        all_cols = self.features + [self.target]
+        self._profile = ProfileAccumulator(
+            raw_df, get_profile(raw_df, self.fingerprint), get_row_hashes(raw_df, self.fingerprint)
+        )
+        self._validation = ValidationAccumulator(get_validation(raw_df, self.fingerprint))
+        self._dedup = None
+        if all(c in raw_df.columns for c in all_cols):
+            self._dedup = RowHashSet(get_row_hashes(raw_df, self.fingerprint, all_cols))
+
+    def append(self, batch: pd.DataFrame, batch_fingerprint: str, clean_df: pd.DataFrame = None,
+               info: dict = None) -> AppendResult:
+        """
+        Menambahkan batch ke dataset mentah, memperbarui profil & validasi di cache untuk versi
+        dataset baru, dan (jika clean_df + info preprocessing diberikan) memproses baris batch
+        lalu menambahkannya ke data bersih.
+        Mengembalikan AppendResult (raw_df, fingerprint, clean_df, info).
+        """
+        all_cols = self.features + [self.target]
+        start, columns_before = len(self._raw), self._raw.columns
+        rows = self._raw.append(batch)
+        raw_df = self._raw.frame
+        self.fingerprint = append_fingerprint(self.fingerprint, batch_fingerprint)
+
+        dup_mask = None
+        if self._raw.columns != columns_before:
+            # kolom baru dari batch mengubah hash baris seluruh kolom: ringkasan dibangun ulang
+            self._summarize(raw_df)
+            if self._dedup is not None:
+                dup_mask = duplicated_mask(get_row_hashes(raw_df, self.fingerprint, all_cols))[start:]
+        else:
+            self._profile.add(rows)
+            self._validation.add(rows)
+            if self._dedup is not None:
+                dup_mask = ~self._dedup.add(row_hashes(rows, all_cols))
+        PROFILE_CACHE.put(self.fingerprint, self._profile.profile(raw_df))
+        VALIDATION_CACHE.put(self.fingerprint, self._validation.report())
+
+        if clean_df is None:
+            return AppendResult(raw_df, self.fingerprint)
+        if self._clean is None or self._clean[0] is not clean_df:
+            self._clean = (clean_df, FrameBuffer(clean_df))
+        buffer = self._clean[1]
+        clean_df, info = append_frame(buffer, info, rows, self.features, self.target, dup_mask)
+        self._clean = (clean_df, buffer)
+        return AppendResult(raw_df, self.fingerprint, clean_df, info)
@@ -0,0 +1,113 @@
+# core/arrow_dtypes.py
+"""
+Dukungan tipe data berbasis Arrow (pd.ArrowDtype) dari ingest sampai preprocessing.
+
+Dengan dtype_backend="pyarrow" buffer kolom hasil parsing dipakai langsung oleh pandas
+(tanpa konversi ke numpy/object):
+- kolom teks            -> string[pyarrow] (tanpa objek str Python per baris)
+- kolom teks nilai unik sedikit -> category, di-encode dengan dictionary_encode Arrow
+- kolom integer         -> int64[pyarrow] dst. (nullable, null tidak mengubahnya jadi float)
+- kolom float           -> double[pyarrow]
+
+Data bersih hasil Preprocessor tetap berupa array numpy (kode kategori & angka tanpa null),
+diambil dari buffer Arrow tanpa salinan jika kolomnya terdiri dari satu chunk, sehingga model
+dan chart menerima array numpy biasa.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Backend dtype yang didukung (nama sama dengan argumen dtype_backend di pandas)
+NUMPY_BACKEND = "numpy"
+ARROW_BACKEND = "pyarrow"
+DTYPE_BACKENDS = (NUMPY_BACKEND, ARROW_BACKEND)
+
+
+def check_dtype_backend(dtype_backend: str) -> str:
+    """Memastikan nilai dtype_backend dikenal (melempar ValueError jika tidak)."""
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"dtype_backend harus salah satu dari {DTYPE_BACKENDS}, bukan {dtype_backend!r}")
+    return dtype_backend
+
+
+def is_arrow_string(dtype) -> bool:
+    """True jika dtype adalah kolom teks berbasis Arrow (string[pyarrow] / large_string)."""
+    return isinstance(dtype, pd.ArrowDtype) and (
+        pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    )
+
+
+def _chunks(s: pd.Series) -> pa.ChunkedArray:
+    # ChunkedArray di balik kolom ArrowDtype (tanpa salinan)
+    return s.array.__arrow_array__()
+
+
+# --- KONVERSI: TABLE ARROW -> DATAFRAME ---
+def _types_mapper(arrow_type):
+    # kolom dictionary dibiarkan menjadi Categorical pandas, tipe lain dibungkus ArrowDtype
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def arrow_table_to_pandas(table: pa.Table, max_category_ratio: float) -> pd.DataFrame:
+    """
+    Mengubah Table Arrow menjadi DataFrame ber-dtype Arrow.
+    Kolom ArrowDtype membungkus buffer Table yang sama (tanpa salinan); kolom teks dengan
+    sedikit nilai unik lalu diubah menjadi category (lihat arrow_strings_to_categorical).
+    """
+    return arrow_strings_to_categorical(table.to_pandas(types_mapper=_types_mapper), max_category_ratio)
+
+
+def _sorted_categories(s: pd.Series) -> pd.Series:
+    # urutan kategori disamakan dengan astype("category") (urut nilai), bukan urutan kemunculan
+    cats = s.cat.categories
+    if cats.is_monotonic_increasing:
+        return s
+    return s.cat.reorder_categories(cats.sort_values())
+
+
+def _dictionary_encode(s: pd.Series) -> pd.Series:
+    # category (urutan kemunculan) dari dictionary_encode Arrow, dengan index & nama kolom asal
+    encoded = pc.dictionary_encode(_chunks(s)).to_pandas()
+    encoded.index = s.index
+    encoded.name = s.name
+    return encoded
+
+
+def arrow_to_categorical(s: pd.Series) -> pd.Series:
+    """
+    Mengubah kolom string[pyarrow] menjadi category lewat dictionary_encode Arrow
+    (tanpa membuat objek str Python per baris). Kategori diurutkan seperti astype("category").
+    """
+    return _sorted_categories(_dictionary_encode(s))
+
+
+def arrow_strings_to_categorical(df: pd.DataFrame, max_category_ratio: float) -> pd.DataFrame:
+    """
+    Mengubah kolom string[pyarrow] dengan jumlah nilai unik <= max_category_ratio x jumlah baris
+    menjadi category (mis. hasil pd.read_csv(dtype_backend="pyarrow")); kolom lain tidak diubah.
+    """
+    limit = max(len(df), 1) * max_category_ratio
+    parts = {}
+    for col in df.columns:
+        if is_arrow_string(df[col].dtype):
+            # encode langsung lalu cek jumlah kategorinya (lebih murah daripada menghitung nilai unik dulu)
+            encoded = _dictionary_encode(df[col])
+            if len(encoded.cat.categories) <= limit:
+                parts[col] = _sorted_categories(encoded)
+    return df.assign(**parts) if parts else df
+
+
+# --- NILAI NUMPY UNTUK MODEL ---
+def arrow_numeric_values(s: pd.Series, mask=None) -> np.ndarray:
+    """
+    Nilai kolom numerik ArrowDtype sebagai array numpy (opsional hanya baris mask).
+    Tanpa null, buffer Arrow dipakai langsung (tanpa salinan untuk kolom satu chunk);
+    jika ada null, hasilnya float64 dengan NaN.
+    """
+    values = s.array if mask is None else s.array[mask]
+    if values.isna().any():
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return values.to_numpy(dtype=s.dtype.numpy_dtype)
@@ -0,0 +1,125 @@
+# core/cache.py
+"""
+Cache LRU dengan batas ukuran memori (byte) yang aman dipakai bersama
+oleh banyak session Streamlit (thread-safe).
+
+Objek yang disimpan di cache dipakai bersama antar session,
+jadi pemanggil TIDAK boleh memodifikasinya secara in-place.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# --- HELPER: ESTIMASI UKURAN OBJEK ---
+def estimate_nbytes(obj) -> int:
+    """
+    Mengestimasi ukuran memori sebuah objek dalam byte.
+    DataFrame/Series dihitung dengan memory_usage(deep=True),
+    tuple/list/dict dihitung rekursif, objek lain memakai sys.getsizeof.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(o) for o in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(v) for v in obj.values())
+    return sys.getsizeof(obj)
+
+
+# --- HELPER: FINGERPRINT BYTES ---
+def bytes_fingerprint(data) -> str:
+    """
+    Menghitung hash (BLAKE2b 128-bit) dari bytes / memoryview, dipakai sebagai kunci cache.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# --- HELPER: FINGERPRINT ISI DATAFRAME ---
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Menghitung hash isi DataFrame (nama kolom, dtype, dan buffer nilai tiap kolom).
+    Ditujukan untuk frame numerik hasil preprocessing; kolom object di-hash lewat repr nilainya.
+    Index tidak ikut di-hash.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            h.update(repr(values.tolist()).encode())
+        else:
+            h.update(np.ascontiguousarray(values).view(np.uint8))
+    return h.hexdigest()
+
+
+class SizedLRUCache:
+    """
+    Cache LRU yang dibatasi total ukuran byte isinya.
+    Saat total ukuran melebihi max_bytes, entri yang paling lama tidak dipakai dibuang.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._data = OrderedDict()  # key -> (value, nbytes)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Mengambil nilai dari cache dan menandainya sebagai paling baru dipakai."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def put(self, key, value, nbytes: int = None):
+        """
+        Menyimpan nilai ke cache. Nilai yang lebih besar dari max_bytes tidak disimpan.
+        nbytes bisa diberikan jika ukurannya sudah diketahui (supaya tidak dihitung ulang).
+        """
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._total -= self._data.pop(key)[1]
+            self._data[key] = (value, nbytes)
+            self._total += nbytes
+            # buang entri paling lama sampai total ukuran kembali di bawah batas
+            while self._total > self.max_bytes:
+                _, (_, old_nbytes) = self._data.popitem(last=False)
+                self._total -= old_nbytes
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def keys(self) -> list:
+        """Daftar kunci di cache saat ini (urutan: paling lama -> paling baru dipakai)."""
+        with self._lock:
+            return list(self._data)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total ukuran (byte) seluruh entri di cache."""
+        return self._total
+
+    def clear(self):
+        """Mengosongkan cache."""
+        with self._lock:
+            self._data.clear()
+            self._total = 0
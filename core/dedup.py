@@ -0,0 +1,136 @@
+# core/dedup.py
+"""
+Deteksi duplikat berbasis hash baris 64-bit.
+
+Hash tiap baris dihitung sekali per versi dataset (pd.util.hash_pandas_object) lalu
+disimpan di cache, sehingga hitung duplikat, hapus duplikat, dan cek "apakah baris
+baru sudah ada" cukup memakai array uint64, tanpa membandingkan ulang seluruh kolom.
+
+Catatan: dua baris berbeda secara teori bisa memiliki hash 64-bit yang sama
+(peluangnya sangat kecil untuk jutaan baris), baris seperti itu dianggap duplikat.
+"""
+import numpy as np
+import pandas as pd
+
+from core.arrow_dtypes import arrow_to_categorical, is_arrow_string
+from core.cache import SizedLRUCache
+
+# Hash baris = 8 byte per baris (1 juta baris ~ 8 MB), 256 MB cukup untuk banyak versi dataset
+HASH_CACHE = SizedLRUCache(256 * 1024 * 1024)
+
+
+# --- HASH: HITUNG ---
+def row_hashes(df: pd.DataFrame, columns=None) -> np.ndarray:
+    """
+    Menghitung hash 64-bit (uint64) tiap baris.
+    Kolom numerik dinormalisasi ke float64 dulu supaya nilai yang sama dengan dtype berbeda
+    (mis. int8 vs int64) menghasilkan hash yang sama; kolom category di-hash berdasarkan
+    nilainya sehingga sama dengan kolom object berisi nilai yang sama. Kolom string[pyarrow]
+    di-hash sebagai category (hash per nilai unik lalu diambil lewat kode dictionary Arrow).
+    Parameter:
+    - df      : DataFrame
+    - columns : (opsional) subset kolom yang dipakai untuk menentukan duplikat
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+
+    # hash dihitung per kolom lalu digabung dengan rumus yang sama seperti
+    # hash_pandas_object(DataFrame), tanpa membuat salinan DataFrame ternormalisasi
+    out = np.full(len(df), 0x345678, dtype="uint64")
+    mult = np.uint64(1000003)
+    for i, col in enumerate(columns):
+        out ^= value_hashes(df[col])
+        out *= mult
+        mult += np.uint64(82520 + 2 * (len(columns) - i))
+    out += np.uint64(97531)
+    return out
+
+
+def value_hashes(s: pd.Series) -> np.ndarray:
+    """
+    Hash 64-bit tiap nilai satu kolom dengan normalisasi yang sama seperti row_hashes
+    (numerik -> float64, category & string[pyarrow] di-hash berdasarkan nilainya).
+    """
+    if is_arrow_string(s.dtype):
+        s = arrow_to_categorical(s)
+    elif pd.api.types.is_numeric_dtype(s.dtype) and not isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype("float64")
+    return pd.util.hash_pandas_object(s, index=False).to_numpy()
+
+
+# --- HASH: DENGAN CACHE ---
+def get_row_hashes(df: pd.DataFrame, fingerprint: str = None, columns=None) -> np.ndarray:
+    """
+    Mengambil hash baris dari cache berdasarkan (fingerprint dataset, subset kolom).
+    Jika fingerprint None, hash dihitung langsung tanpa cache.
+    Array hasil cache dipakai bersama, jadi jangan dimodifikasi in-place.
+    """
+    if fingerprint is None:
+        return row_hashes(df, columns)
+
+    key = (fingerprint, tuple(columns) if columns is not None else None)
+    hashes = HASH_CACHE.get(key)
+    if hashes is None:
+        hashes = row_hashes(df, columns)
+        HASH_CACHE.put(key, hashes)
+    return hashes
+
+
+# --- QUERY DUPLIKAT ---
+def duplicated_mask(hashes: np.ndarray) -> np.ndarray:
+    """Mask bool baris duplikat (kemunculan pertama dianggap bukan duplikat), setara df.duplicated()."""
+    return pd.Series(hashes, copy=False).duplicated().to_numpy()
+
+
+def count_duplicates(hashes: np.ndarray) -> int:
+    """Jumlah baris duplikat."""
+    return int(len(hashes) - pd.unique(hashes).size)
+
+
+def drop_duplicates(df: pd.DataFrame, hashes: np.ndarray):
+    """
+    Menghapus baris duplikat berdasarkan hash.
+    Mengembalikan:
+    - df tanpa duplikat
+    - hash baris df tersebut
+    - jumlah baris yang dihapus
+    """
+    dup = duplicated_mask(hashes)
+    return df[~dup], hashes[~dup], int(dup.sum())
+
+
+class RowHashSet:
+    """
+    Kumpulan hash baris yang sudah ada (mis. data mentah sebelumnya), untuk cek inkremental
+    "apakah baris baru sudah ada" tanpa menghitung ulang hash data lama.
+    Hash disimpan di beberapa segmen Index (hash unik, hashtable tiap segmen dibangun sekali).
+    Hash baru menjadi segmen baru; segmen yang ukurannya berdekatan digabung seperti penjumlahan
+    biner, sehingga jumlah segmen O(log n) dan biaya add() amortized sebanding jumlah hash baru
+    (bukan jumlah seluruh hash di set).
+    """
+
+    def __init__(self, hashes=None):
+        hashes = np.asarray(hashes if hashes is not None else [], dtype="uint64")
+        self._segments = [pd.Index(pd.unique(hashes))] if len(hashes) else []
+
+    def __len__(self):
+        return sum(len(seg) for seg in self._segments)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Mask bool: True jika hash baris sudah ada di set."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for seg in self._segments:
+            found |= seg.get_indexer(hashes) >= 0
+        return found
+
+    def add(self, hashes: np.ndarray):
+        """
+        Menambahkan hash baru ke set dan mengembalikan mask baris yang benar-benar baru
+        (belum ada di set dan bukan duplikat di dalam hashes itu sendiri).
+        """
+        is_new = ~self.contains(hashes) & ~duplicated_mask(hashes)
+        if is_new.any():
+            self._segments.append(pd.Index(hashes[is_new]))
+            while len(self._segments) > 1 and len(self._segments[-2]) <= len(self._segments[-1]):
+                last = self._segments.pop()
+                self._segments[-1] = self._segments[-1].append(last)
+        return is_new
@@ -0,0 +1,191 @@
+# core/frame_buffer.py
+"""
+DataFrame yang bisa ditambah baris (append) tanpa menyalin ulang seluruh data lama.
+
+pd.concat([lama, batch]) selalu menyalin semua baris lama, sehingga append batch kecil ke
+dataset besar berbiaya O(total baris). Di sini tiap kolom disimpan di buffer dengan kapasitas
+cadangan (tumbuh ~1.5x saat penuh), jadi baris batch cukup ditulis ke bagian akhir buffer
+dan biaya append sebanding dengan ukuran batch (amortized). Frame yang dikembalikan adalah
+view ke buffer (tanpa salinan); baris yang sudah ada tidak pernah ditulis ulang, sehingga
+view lama tetap valid walaupun batch berikutnya ditambahkan.
+
+Penyimpanan per jenis kolom:
+- kolom numpy    : array dengan kapasitas cadangan (dtype dinaikkan seperti numpy jika perlu,
+                   mis. int8 + NaN -> float64)
+- kolom category : kode kategori di buffer + daftar kategori (kategori baru ditambahkan di akhir)
+- kolom Arrow    : daftar chunk Arrow (batch baru menjadi chunk baru, tanpa menyalin chunk lama)
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from core.transform import codes_dtype
+
+
+class GrowableArray:
+    """
+    Array numpy 1D yang bisa ditambah di akhir dengan biaya amortized sebanding panjang tambahan.
+    Array awal dipakai langsung (tanpa salinan) sampai append pertama; setelah itu data disalin
+    sekali ke buffer baru dengan kapasitas cadangan. Bagian yang sudah terisi tidak pernah ditimpa.
+    """
+
+    def __init__(self, values):
+        self._data = np.asarray(values)
+        self._size = len(self._data)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def values(self) -> np.ndarray:
+        """View ke bagian buffer yang sudah terisi (jangan dimodifikasi in-place)."""
+        return self._data[:self._size]
+
+    def append(self, values):
+        """Menambahkan nilai di akhir; dtype dinaikkan (np.result_type) jika nilai baru tidak muat."""
+        values = np.asarray(values)
+        need = self._size + len(values)
+        dtype = np.result_type(self._data.dtype, values.dtype)
+        if dtype != self._data.dtype or need > len(self._data):
+            capacity = len(self._data) if need <= len(self._data) else max(need, len(self._data) * 3 // 2 + 16)
+            data = np.empty(capacity, dtype=dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size:need] = values
+        self._size = need
+
+
+# --- PENYIMPANAN PER JENIS KOLOM ---
+class _NumpyColumn:
+    def __init__(self, values: np.ndarray):
+        self._values = GrowableArray(values)
+
+    def append(self, s: pd.Series):
+        if isinstance(s.dtype, pd.ArrowDtype) and pd.api.types.is_numeric_dtype(s.dtype):
+            values = s.to_numpy(dtype="float64", na_value=np.nan) if s.hasnans else s.to_numpy(s.dtype.numpy_dtype)
+        else:
+            values = s.to_numpy()
+        self._values.append(values)
+
+    def append_nulls(self, n: int):
+        # sama seperti pd.concat: kolom int/bool menjadi float64 (NaN), kolom object berisi NaN
+        kind = self._values.values.dtype.kind
+        if kind in "mM":
+            self._values.append(np.full(n, np.datetime64("NaT"), dtype=self._values.values.dtype))
+        elif kind == "O":
+            self._values.append(np.full(n, np.nan, dtype=object))
+        else:
+            self._values.append(np.full(n, np.nan))
+
+    def array(self):
+        return self._values.values
+
+
+class _CategoryColumn:
+    def __init__(self, s: pd.Series):
+        self._dtype = s.dtype
+        self._codes = GrowableArray(s.cat.codes.to_numpy())
+
+    def append(self, s: pd.Series):
+        # kategori baru ditambahkan di akhir daftar kategori, sehingga kode kategori lama tidak berubah
+        cats = self._dtype.categories
+        extra = pd.Index(s.dropna().unique()).difference(cats)
+        if len(extra):
+            cats = cats.append(extra)
+            self._dtype = pd.CategoricalDtype(cats, ordered=self._dtype.ordered)
+        self._codes.append(pd.Categorical(s.astype("object"), dtype=self._dtype).codes)
+
+    def append_nulls(self, n: int):
+        self._codes.append(np.full(n, -1, dtype=self._codes.values.dtype))
+
+    def array(self):
+        codes = self._codes.values
+        codes = codes.astype(codes_dtype(len(self._dtype.categories)), copy=False)
+        return pd.Categorical.from_codes(codes, dtype=self._dtype, validate=False)
+
+
+class _ArrowColumn:
+    def __init__(self, s: pd.Series):
+        self._dtype = s.dtype
+        self._chunks = list(s.array.__arrow_array__().chunks)
+
+    def append(self, s: pd.Series):
+        if s.dtype != self._dtype:
+            s = s.astype("object").astype(self._dtype)
+        self._chunks.extend(s.array.__arrow_array__().chunks)
+
+    def append_nulls(self, n: int):
+        self._chunks.append(pa.nulls(n, type=self._dtype.pyarrow_dtype))
+
+    def array(self):
+        return pd.arrays.ArrowExtensionArray(pa.chunked_array(self._chunks, type=self._dtype.pyarrow_dtype))
+
+
+def _column_store(s: pd.Series):
+    # kolom dtype ekstensi lain (mis. Int64) disimpan sebagai object, seperti hasil concat dtype campuran
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _CategoryColumn(s)
+    if isinstance(s.dtype, pd.ArrowDtype):
+        return _ArrowColumn(s)
+    if isinstance(s.dtype, np.dtype):
+        return _NumpyColumn(s.to_numpy())
+    return _NumpyColumn(s.to_numpy(dtype=object))
+
+
+class FrameBuffer:
+    """
+    DataFrame yang bisa ditambah baris dengan biaya amortized sebanding ukuran batch.
+    Parameter:
+    - df : frame awal (tidak diubah; buffer-nya dipakai tanpa salinan sampai append pertama)
+    Kolom batch yang tidak ada di frame diisi missing value untuk baris lama (dan sebaliknya),
+    dengan dtype yang sama seperti hasil pd.concat. Index RangeIndex 0..n-1 tetap RangeIndex;
+    index lain disimpan di buffer sendiri.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._size = len(df)
+        self._columns = {col: _column_store(df[col]) for col in df.columns}
+        self._index = None if df.index.equals(pd.RangeIndex(self._size)) else GrowableArray(df.index.to_numpy())
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    def append(self, batch: pd.DataFrame, index=None) -> pd.DataFrame:
+        """
+        Menambahkan baris batch di akhir.
+        index (opsional) adalah label index baris batch; jika None, nomor baris dilanjutkan (n, n+1, ...).
+        Mengembalikan view baris batch yang baru ditambahkan dengan dtype & urutan kolom frame gabungan.
+        """
+        start, n = self._size, len(batch)
+        for col in batch.columns:
+            if col not in self._columns:
+                # kolom baru: baris lama diisi missing value
+                store = _column_store(batch[col].iloc[:0])
+                store.append_nulls(start)
+                self._columns[col] = store
+        for col, store in self._columns.items():
+            if col in batch.columns:
+                store.append(batch[col])
+            else:
+                store.append_nulls(n)
+
+        positions = np.arange(start, start + n)
+        index = positions if index is None else np.asarray(index)
+        if self._index is None and not np.array_equal(index, positions):
+            self._index = GrowableArray(np.arange(start))
+        if self._index is not None:
+            self._index.append(index)
+        self._size += n
+        return self.frame.iloc[start:]
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Seluruh isi buffer sebagai DataFrame (view, jangan dimodifikasi in-place)."""
+        n = self._size
+        index = pd.RangeIndex(n) if self._index is None else pd.Index(self._index.values, copy=False)
+        data = {col: store.array() for col, store in self._columns.items()}
+        return pd.DataFrame(data, index=index, columns=list(self._columns), copy=False)
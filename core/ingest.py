@@ -0,0 +1,543 @@
+# core/ingest.py
+"""
+Fungsi-fungsi untuk membaca file dataset yang di-upload user menjadi DataFrame.
+
+Modul ini sengaja tidak meng-import Streamlit supaya bisa dipakai juga
+dari script benchmark atau proses lain di luar aplikasi.
+"""
+import os
+import zipfile
+from pathlib import PurePath
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from core.arrow_dtypes import (
+    ARROW_BACKEND,
+    NUMPY_BACKEND,
+    arrow_strings_to_categorical,
+    arrow_to_categorical,
+    arrow_table_to_pandas,
+    check_dtype_backend,
+    is_arrow_string,
+)
+from core.cache import SizedLRUCache, bytes_fingerprint, estimate_nbytes
+from core.frame_buffer import FrameBuffer
+
+# Ukuran satu chunk (blok) CSV yang diparse sekaligus oleh pyarrow
+CSV_BLOCK_SIZE = 16 * 1024 * 1024  # 16 MB
+
+# Daftar string yang dianggap missing value, disamakan dengan default pd.read_csv
+# supaya hasil mode chunked dan mode standar konsisten
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+# Ekstensi file yang didukung beserta format pembacanya
+FORMAT_BY_EXTENSION = {
+    "csv": "csv",
+    "parquet": "parquet",
+    "pq": "parquet",
+    "feather": "feather",
+    "arrow": "arrow",
+    "ipc": "arrow",
+    "arrows": "arrow",
+}
+
+# Ekstensi file terkompresi (isinya CSV) beserta codec dekompresinya
+COMPRESSION_BY_EXTENSION = {
+    "gz": "gzip",
+    "zst": "zstd",
+    "zip": "zip",
+}
+SUPPORTED_EXTENSIONS = list(FORMAT_BY_EXTENSION) + list(COMPRESSION_BY_EXTENSION)
+
+# Cache DataFrame hasil parsing, dipakai bersama oleh semua session di server.
+# Kunci = hash isi file + opsi pembacaan, dibatasi total ukuran memori (LRU).
+DATASET_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+DATASET_CACHE = SizedLRUCache(DATASET_CACHE_MAX_BYTES)
+
+# Kolom object dijadikan category jika jumlah nilai unik <= rasio ini dari jumlah baris
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+class LoadedDataset(NamedTuple):
+    """Hasil read_dataset_cached."""
+    df: pd.DataFrame       # DataFrame hasil parsing (dipakai bersama, jangan diubah in-place)
+    fingerprint: str       # id versi dataset (berubah jika isi file atau opsi pembacaan berubah)
+    nbytes: int            # ukuran memori df (byte, memory_usage deep)
+    nbytes_original: int   # ukuran memori sebelum downcast (sama dengan nbytes jika tanpa downcast)
+
+
+# --- INGEST: DETEKSI FORMAT ---
+def detect_compression(filename: str):
+    """
+    Menentukan codec kompresi dari ekstensi file ("gzip" / "zstd" / "zip"),
+    atau None jika file tidak terkompresi.
+    """
+    ext = PurePath(filename).suffix.lower().lstrip(".")
+    return COMPRESSION_BY_EXTENSION.get(ext)
+
+
+def detect_format(filename: str) -> str:
+    """
+    Menentukan format file dari ekstensinya (csv / parquet / feather / arrow).
+    File terkompresi (.csv.gz, .csv.zst, .zip) selalu dianggap berisi CSV.
+    """
+    path = PurePath(filename)
+    compression = detect_compression(filename)
+    if compression == "zip":
+        return "csv"
+    if compression is not None:
+        # .csv.gz / .csv.zst -> cek ekstensi di dalamnya
+        path = PurePath(path.stem)
+        if path.suffix.lower() != ".csv":
+            raise ValueError("File terkompresi .gz / .zst harus berisi CSV (mis. data.csv.gz)")
+
+    ext = path.suffix.lower().lstrip(".")
+    if ext not in FORMAT_BY_EXTENSION:
+        raise ValueError(f"Format file '.{ext}' tidak didukung")
+    return FORMAT_BY_EXTENSION[ext]
+
+
+# --- INGEST: STREAM DEKOMPRESI ---
+class _KeepOpen:
+    """
+    Pembungkus file-like yang mengabaikan close(), supaya menutup stream dekompresi
+    tidak ikut menutup file upload aslinya (file masih dipakai untuk hash/cache & fallback).
+    """
+
+    closed = False
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+    def close(self):
+        pass
+
+
+def open_decompressed(source, compression: str):
+    """
+    Membuka stream hasil dekompresi dari file upload, tanpa menulis isi
+    yang sudah didekompresi ke memori atau disk terlebih dahulu.
+    - gzip / zstd : didekompresi bertahap oleh pyarrow (CompressedInputStream)
+    - zip         : member CSV pertama di dalam arsip dibuka sebagai stream
+    source boleh berupa path (str / PathLike, mis. dari CLI) atau file-like object.
+    """
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    if compression == "zip":
+        archive = zipfile.ZipFile(source)
+        members = [n for n in archive.namelist() if n.lower().endswith(".csv")]
+        if not members:
+            raise ValueError("Arsip zip tidak berisi file CSV")
+        return archive.open(members[0])
+
+    if isinstance(source, (str, os.PathLike)):
+        # path dibuka langsung oleh pyarrow (file native + dekompresi bertahap)
+        return pa.input_stream(os.fspath(source), compression=compression)
+    return pa.CompressedInputStream(pa.PythonFile(_KeepOpen(source), mode="r"), compression)
+
+
+# --- INGEST: CSV STANDAR ---
+def read_csv_standard(source, dtype_backend: str = NUMPY_BACKEND) -> pd.DataFrame:
+    """
+    Membaca CSV sekaligus dengan engine default pandas (perilaku lama aplikasi).
+    Dengan dtype_backend="pyarrow", kolom memakai tipe Arrow (lihat core.arrow_dtypes).
+    """
+    if check_dtype_backend(dtype_backend) == ARROW_BACKEND:
+        df = pd.read_csv(source, dtype_backend=ARROW_BACKEND)
+        return arrow_strings_to_categorical(df, CATEGORY_MAX_UNIQUE_RATIO)
+    return pd.read_csv(source)
+
+
+def _table_to_pandas(table: pa.Table, dtype_backend: str) -> pd.DataFrame:
+    # konversi Table hasil parsing ke DataFrame sesuai backend dtype; buffer Arrow dilepas
+    # kolom demi kolom selama konversi (self_destruct) sehingga tidak ada salinan ganda penuh
+    if check_dtype_backend(dtype_backend) == ARROW_BACKEND:
+        return arrow_table_to_pandas(table, CATEGORY_MAX_UNIQUE_RATIO)
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+# --- INGEST: CSV CHUNKED (PYARROW) ---
+def read_csv_chunked(
+    source, block_size: int = CSV_BLOCK_SIZE, on_progress=None, dtype_backend: str = NUMPY_BACKEND
+) -> pd.DataFrame:
+    """
+    Membaca CSV per chunk menggunakan streaming reader pyarrow.
+    Parameter:
+    - source      : path atau file-like object (mis. UploadedFile Streamlit)
+    - block_size  : ukuran byte tiap chunk yang diparse
+    - on_progress : callback opsional on_progress(rows_read) yang dipanggil tiap chunk selesai
+    - dtype_backend : "numpy" (default) atau "pyarrow" (kolom tetap bertipe Arrow)
+    Mengembalikan:
+    - DataFrame hasil parsing. Batch Arrow dikonversi dengan self_destruct sehingga
+      memori Arrow dilepas kolom demi kolom selama konversi (tidak ada salinan ganda penuh).
+    """
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+
+    batches = []
+    rows_read = 0
+    for batch in reader:
+        batches.append(batch)
+        rows_read += batch.num_rows
+        if on_progress is not None:
+            on_progress(rows_read)
+
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    # lepas referensi ke batch agar self_destruct benar-benar bisa membebaskan buffer
+    del batches, reader
+
+    return _table_to_pandas(table, dtype_backend)
+
+
+# --- INGEST: PILIH MODE CSV ---
+def read_csv(
+    source, chunked: bool = True, on_progress=None, compression: str = None, dtype_backend: str = NUMPY_BACKEND
+) -> pd.DataFrame:
+    """
+    Membaca CSV dengan mode chunked (default) atau standar.
+    File terkompresi didekompresi sebagai stream langsung ke parser.
+    Streaming reader pyarrow menentukan tipe kolom dari chunk pertama; jika chunk
+    berikutnya tidak cocok (mis. kolom integer yang ternyata berisi desimal di bagian akhir),
+    pembacaan diulang dengan engine pandas supaya upload tetap berhasil.
+    dtype_backend "pyarrow" mempertahankan tipe Arrow pada kedua mode (lihat core.arrow_dtypes).
+    """
+    def open_source():
+        if compression is not None:
+            return open_decompressed(source, compression)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source
+
+    if not chunked:
+        return read_csv_standard(open_source(), dtype_backend=dtype_backend)
+
+    try:
+        return read_csv_chunked(open_source(), on_progress=on_progress, dtype_backend=dtype_backend)
+    except pa.ArrowInvalid:
+        return read_csv_standard(open_source(), dtype_backend=dtype_backend)
+
+
+# --- INGEST: FORMAT KOLOMNAR (PARQUET / FEATHER / ARROW IPC) ---
+def _project(names, columns):
+    # ambil hanya kolom yang diminta DAN ada di file; kolom yang tidak ada dibiarkan
+    # supaya tahap preprocessing tetap bisa melaporkan kolom yang hilang
+    if columns is None:
+        return None
+    return [c for c in names if c in set(columns)]
+
+
+def read_columnar(source, fmt: str, columns=None, dtype_backend: str = NUMPY_BACKEND) -> pd.DataFrame:
+    """
+    Membaca file Parquet, Feather, atau Arrow IPC dengan proyeksi kolom.
+    Parameter:
+    - source  : path atau file-like object
+    - fmt     : "parquet", "feather", atau "arrow"
+    - columns : daftar kolom yang perlu dibaca (None = semua kolom).
+                Kolom lain tidak di-decode sama sekali.
+    - dtype_backend : "numpy" (default) atau "pyarrow" (kolom tetap bertipe Arrow)
+    """
+    if fmt == "parquet":
+        names = pq.ParquetFile(source).schema_arrow.names
+        if hasattr(source, "seek"):
+            source.seek(0)
+        table = pq.read_table(source, columns=_project(names, columns))
+
+    elif fmt in ("feather", "arrow"):
+        try:
+            # Feather v2 = Arrow IPC *file* format, mendukung proyeksi kolom langsung
+            with pa.ipc.open_file(source) as reader:
+                names = reader.schema.names
+            if hasattr(source, "seek"):
+                source.seek(0)
+            table = feather.read_table(source, columns=_project(names, columns))
+        except pa.ArrowInvalid:
+            # Arrow IPC *stream* format: proyeksi dilakukan per record batch
+            if hasattr(source, "seek"):
+                source.seek(0)
+            with pa.ipc.open_stream(source) as reader:
+                keep = _project(reader.schema.names, columns)
+                batches = [b if keep is None else b.select(keep) for b in reader]
+                schema = reader.schema if keep is None else pa.schema([reader.schema.field(c) for c in keep])
+            table = pa.Table.from_batches(batches, schema=schema)
+            del batches
+
+    else:
+        raise ValueError(f"Format kolomnar '{fmt}' tidak dikenal")
+
+    return _table_to_pandas(table, dtype_backend)
+
+
+# --- INGEST: PINTU MASUK UTAMA ---
+def read_dataset(
+    source, filename: str, columns=None, chunked: bool = True, on_progress=None, dtype_backend: str = NUMPY_BACKEND
+) -> pd.DataFrame:
+    """
+    Membaca file upload sesuai formatnya.
+    - CSV (termasuk .csv.gz / .csv.zst / .zip) dibaca utuh (semua kolom) dengan mode chunked/standar
+    - Parquet/Feather/Arrow IPC hanya membaca kolom pada `columns`
+    - dtype_backend "pyarrow" mempertahankan tipe kolom Arrow (string, dictionary, integer nullable)
+    """
+    fmt = detect_format(filename)
+    if fmt == "csv":
+        return read_csv(
+            source,
+            chunked=chunked,
+            on_progress=on_progress,
+            compression=detect_compression(filename),
+            dtype_backend=dtype_backend,
+        )
+    return read_columnar(source, fmt, columns=columns, dtype_backend=dtype_backend)
+
+
+# --- INGEST: STREAM RECORD BATCH (TANPA MEMUAT SELURUH FILE) ---
+def _rewind(source, compression: str = None):
+    # buka ulang sumber dari awal (stream dekompresi dibuat baru jika perlu)
+    if compression is not None:
+        return open_decompressed(source, compression)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _check_columns(names, columns):
+    # kolom yang diminta wajib ada di file; columns None = semua kolom file
+    if columns is None:
+        return list(names)
+    missing = [c for c in columns if c not in set(names)]
+    if missing:
+        raise KeyError(f"Kolom berikut tidak ditemukan: {missing}")
+    return columns
+
+
+def _widen_dtype(current, dtype):
+    # tipe kolom gabungan dua chunk pandas: numerik dinaikkan (int + float -> float), selain itu object
+    if current is None or current == dtype:
+        return dtype
+    if current.kind in "iuf" and dtype.kind in "iuf":
+        return np.result_type(current, dtype)
+    return np.dtype(object)
+
+
+def _iter_csv_pandas(source, compression, columns, block_size):
+    # chunk pandas bisa berbeda tipe (mis. int di chunk awal, float di chunk akhir), sedangkan
+    # pembaca batch butuh schema tetap: pass pertama hanya mencari tipe tiap kolom di seluruh file,
+    # pass kedua membaca ulang dengan tipe tersebut. Memori tetap sebatas satu chunk.
+    columns = _check_columns(pd.read_csv(_rewind(source, compression), nrows=0).columns, columns)
+    chunksize = max(block_size // 128, 1)  # perkiraan jumlah baris per blok
+
+    dtypes = dict.fromkeys(columns)
+    for chunk in pd.read_csv(_rewind(source, compression), usecols=columns, chunksize=chunksize):
+        for col in columns:
+            dtypes[col] = _widen_dtype(dtypes[col], chunk[col].dtype)
+    schema = pa.schema([
+        (col, pa.string() if dtype.kind == "O" else pa.from_numpy_dtype(dtype)) for col, dtype in dtypes.items()
+    ])
+
+    for chunk in pd.read_csv(_rewind(source, compression), usecols=columns, dtype=dtypes, chunksize=chunksize):
+        yield pa.RecordBatch.from_pandas(chunk[columns], schema=schema, preserve_index=False)
+
+
+def iter_batches(source, filename: str, columns, block_size: int = CSV_BLOCK_SIZE, engine: str = "pyarrow"):
+    """
+    Membaca file per record batch Arrow tanpa pernah memuat seluruh isinya ke memori.
+    Hanya kolom pada `columns` yang di-decode (CSV: include_columns, Parquet: iter_batches,
+    Feather/Arrow IPC: select per batch); columns None berarti semua kolom file.
+    engine (khusus CSV) "pyarrow" (default) atau "pandas". Streaming reader pyarrow menentukan
+    tipe kolom dari blok pertama dan melempar pa.ArrowInvalid jika blok berikutnya tidak cocok;
+    karena batch sebelumnya sudah diproses pemanggil, pembacaan diulang dari awal oleh pemanggil
+    dengan engine="pandas" (dua pass: cari tipe kolom seluruh file, lalu baca dengan tipe tersebut).
+    Melempar KeyError jika ada kolom yang tidak ditemukan di file.
+    """
+    fmt = detect_format(filename)
+    columns = None if columns is None else list(columns)
+
+    if fmt == "csv" and engine == "pandas":
+        yield from _iter_csv_pandas(source, detect_compression(filename), columns, block_size)
+
+    elif fmt == "csv":
+        compression = detect_compression(filename)
+        convert = dict(null_values=NA_VALUES, strings_can_be_null=True)
+        # header dibaca dulu dengan blok kecil untuk mengecek kolom
+        # (include_columns dengan kolom yang tidak ada membuat reader gagal di tengah jalan)
+        header = pacsv.open_csv(
+            _rewind(source, compression),
+            read_options=pacsv.ReadOptions(block_size=64 * 1024),
+            convert_options=pacsv.ConvertOptions(**convert),
+        )
+        columns = _check_columns(header.schema.names, columns)
+        del header
+        reader = pacsv.open_csv(
+            _rewind(source, compression),
+            read_options=pacsv.ReadOptions(block_size=block_size),
+            convert_options=pacsv.ConvertOptions(include_columns=columns, **convert),
+        )
+        yield from reader
+
+    elif fmt == "parquet":
+        parquet = pq.ParquetFile(_rewind(source))
+        columns = _check_columns(parquet.schema_arrow.names, columns)
+        yield from parquet.iter_batches(columns=columns)
+
+    else:
+        source = _rewind(source)
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            reader = pa.ipc.open_stream(_rewind(source))
+            batches = iter(reader)
+        columns = _check_columns(reader.schema.names, columns)
+        for batch in batches:
+            yield batch.select(columns)
+
+
+# --- INGEST: FINGERPRINT FILE UPLOAD ---
+def content_fingerprint(source) -> str:
+    """
+    Menghitung hash isi file upload tanpa menyalin bytes-nya (memakai getbuffer jika ada).
+    """
+    if hasattr(source, "getbuffer"):
+        with source.getbuffer() as view:
+            return bytes_fingerprint(view)
+    data = source.read()
+    source.seek(0)
+    return bytes_fingerprint(data)
+
+
+# --- INGEST: DOWNCAST TIPE DATA ---
+def downcast_dtypes(df: pd.DataFrame, max_category_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> pd.DataFrame:
+    """
+    Mengecilkan representasi memori DataFrame berdasarkan rentang nilai yang ada:
+    - kolom integer -> int8/int16/int32 terkecil yang muat (mis. flag 0/1 -> int8)
+    - kolom float   -> float32
+    - kolom object dengan sedikit nilai unik (mis. smoking_status) -> category
+    Kolom bertipe Arrow tetap bertipe Arrow (mis. int64[pyarrow] -> int8[pyarrow]), kolom
+    string[pyarrow] dengan sedikit nilai unik di-encode lewat dictionary_encode Arrow.
+    Mengembalikan DataFrame baru; df asli tidak diubah.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s.dtype):
+            pass
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast="float")
+        elif s.dtype == "object" and s.nunique(dropna=True) <= max(len(s), 1) * max_category_ratio:
+            s = s.astype("category")
+        elif is_arrow_string(s.dtype) and s.nunique(dropna=True) <= max(len(s), 1) * max_category_ratio:
+            s = arrow_to_categorical(s)
+        out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+# --- INGEST: BACA DENGAN CACHE ---
+def read_dataset_cached(
+    source,
+    filename: str,
+    columns=None,
+    chunked: bool = True,
+    downcast: bool = False,
+    on_progress=None,
+    dtype_backend: str = NUMPY_BACKEND,
+) -> LoadedDataset:
+    """
+    Sama seperti read_dataset, tetapi hasil parsing disimpan di DATASET_CACHE
+    dengan kunci hash isi file + opsi pembacaan. File yang sama (dari session mana pun)
+    hanya diparse sekali selama masih ada di cache.
+    Jika downcast=True, tipe data dikecilkan dengan downcast_dtypes sebelum disimpan.
+    dtype_backend ("numpy" / "pyarrow") ikut menjadi bagian kunci cache.
+    """
+    options = (detect_format(filename), tuple(columns) if columns else None, chunked, downcast)
+    if dtype_backend != NUMPY_BACKEND:
+        # kunci mode numpy tidak berubah supaya fingerprint dataset lama tetap sama
+        options += (dtype_backend,)
+    fingerprint = bytes_fingerprint(f"{content_fingerprint(source)}|{options}".encode())
+
+    cached = DATASET_CACHE.get(fingerprint)
+    if cached is not None:
+        return cached
+
+    df = read_dataset(
+        source, filename, columns=columns, chunked=chunked, on_progress=on_progress, dtype_backend=dtype_backend
+    )
+    nbytes_original = estimate_nbytes(df)
+    nbytes = nbytes_original
+    if downcast:
+        df = downcast_dtypes(df)
+        nbytes = estimate_nbytes(df)
+
+    loaded = LoadedDataset(df, fingerprint, nbytes, nbytes_original)
+    DATASET_CACHE.put(fingerprint, loaded, nbytes=nbytes)
+    return loaded
+
+
+# --- INGEST: GABUNG BATCH BARU KE DATA MENTAH ---
+def append_frames(base: pd.DataFrame, batch: pd.DataFrame) -> pd.DataFrame:
+    """
+    Menggabungkan batch baru ke dataset mentah yang sudah ada (lihat core.frame_buffer.FrameBuffer).
+    Kolom category diseragamkan dulu daftar kategorinya (kategori baru ditambahkan di akhir)
+    supaya hasil gabungan tetap bertipe category dan tidak berubah menjadi object.
+    Kolom string[pyarrow] tetap string[pyarrow] walaupun kolom batch-nya bertipe category.
+    Untuk append berulang di session, pakai core.append.AppendState supaya data lama tidak disalin ulang.
+    """
+    buffer = FrameBuffer(base)
+    buffer.append(batch)
+    return buffer.frame
+
+
+# --- INGEST: FUNGSI JOB LATAR BELAKANG ---
+def ingest_job(
+    job,
+    source,
+    filename: str,
+    columns=None,
+    chunked: bool = True,
+    downcast: bool = False,
+    dtype_backend: str = NUMPY_BACKEND,
+) -> LoadedDataset:
+    """
+    Fungsi job (lihat core.jobs) untuk membaca file upload di thread latar belakang.
+    Progres dilaporkan sebagai jumlah baris & byte yang sudah dibaca; pembatalan dicek
+    setiap satu chunk CSV selesai diparse dan sekali lagi setelah pembacaan selesai
+    (mode standar, Parquet, dan Feather tidak punya titik pengecekan per chunk).
+    """
+    total_bytes = getattr(source, "size", None)
+    job.report(rows=0, bytes=0, total_bytes=total_bytes)
+
+    def on_progress(rows_read):
+        job.report(rows=rows_read, bytes=source.tell(), total_bytes=total_bytes)
+        job.check_cancelled()
+
+    loaded = read_dataset_cached(
+        source,
+        filename,
+        columns=columns,
+        chunked=chunked,
+        downcast=downcast,
+        on_progress=on_progress,
+        dtype_backend=dtype_backend,
+    )
+    job.check_cancelled()
+    return loaded
@@ -0,0 +1,102 @@
+# core/instrument.py
+"""
+Pencatat waktu & memori per tahap pipeline (wall time, CPU time, dan peak memori).
+
+Peak memori diukur dengan tracemalloc (alokasi Python & numpy) dan hanya jika diminta
+(StageTimer(trace_memory=True)), karena tracemalloc memperlambat setiap alokasi selama aktif.
+tracemalloc bersifat global per proses: start/stop dijaga lock + hitungan pemakai, sehingga
+tahap yang masih berjalan di thread lain (session / job lain) tidak ikut dihentikan, dan
+peak hanya di-reset oleh tahap yang sedang menjadi satu-satunya pemakai. Jika beberapa tahap
+diukur bersamaan, alokasi tahap lain ikut terhitung di peak.
+"""
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Kolom tabel metrik per tahap
+STAGE_COLUMNS = ["Tahap", "Wall (s)", "CPU (s)", "Peak Memori (MB)"]
+
+# Pemakai tracemalloc yang sedang aktif di proses ini (dijaga _TRACE_LOCK)
+_TRACE_LOCK = threading.Lock()
+_trace_users = 0
+_trace_owned = False  # True jika tracemalloc dinyalakan oleh StageTimer (bukan oleh pemanggil lain)
+
+
+def _start_tracing():
+    # menyalakan tracemalloc untuk pemakai pertama; peak di-reset hanya jika tidak ada tahap lain
+    global _trace_users, _trace_owned
+    with _TRACE_LOCK:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _trace_owned = True
+        _trace_users += 1
+        if _trace_users == 1:
+            tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _stop_tracing() -> int:
+    # mengambil peak lalu mematikan tracemalloc setelah pemakai terakhir selesai
+    global _trace_users, _trace_owned
+    with _TRACE_LOCK:
+        peak = tracemalloc.get_traced_memory()[1]
+        _trace_users -= 1
+        if _trace_users == 0 and _trace_owned:
+            tracemalloc.stop()
+            _trace_owned = False
+        return peak
+
+
+class StageTimer:
+    """
+    Mengumpulkan metrik per tahap:
+
+        timer = StageTimer()
+        with timer.stage("dedup"):
+            ...
+        timer.records  # list dict per tahap
+
+    trace_memory=True juga mengukur peak memori tiap tahap dengan tracemalloc
+    (default mati karena memperlambat alokasi selama tahap berjalan).
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.records = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mengukur satu tahap (wall time, CPU time proses, dan peak memori di atas memori awal tahap jika diukur)."""
+        mem_start = _start_tracing() if self.trace_memory else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            record = {"Tahap": name, "Wall (s)": round(wall, 4), "CPU (s)": round(cpu, 4)}
+            if self.trace_memory:
+                peak = _stop_tracing()
+                record["Peak Memori (MB)"] = round(max(peak - mem_start, 0) / (1024 * 1024), 2)
+            self.records.append(record)
+
+
+def stages_frame(records) -> pd.DataFrame:
+    """Mengubah list metrik tahap (mis. info["stage_timings"]) menjadi DataFrame + baris total."""
+    df = pd.DataFrame(records, columns=STAGE_COLUMNS)
+    if df["Peak Memori (MB)"].isna().all():
+        df = df.drop(columns="Peak Memori (MB)")  # memori tidak diukur (trace_memory=False)
+    if len(df):
+        total = {
+            "Tahap": "Total",
+            "Wall (s)": round(df["Wall (s)"].sum(), 4),
+            "CPU (s)": round(df["CPU (s)"].sum(), 4),
+        }
+        if "Peak Memori (MB)" in df.columns:
+            total["Peak Memori (MB)"] = df["Peak Memori (MB)"].max()
+        df = pd.concat([df, pd.DataFrame([total])], ignore_index=True)
+    return df
@@ -0,0 +1,132 @@
+# core/jobs.py
+"""
+Pekerjaan (job) yang dijalankan di thread latar belakang, dengan progres dan pembatalan.
+
+Job disimpan di registry global (per proses server) dan diakses lewat job id,
+sehingga session Streamlit cukup menyimpan id-nya dan melakukan polling progres.
+"""
+import threading
+import time
+import uuid
+
+# Status job
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Registry job: job_id -> Job
+_JOBS = {}
+_JOBS_LOCK = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Dilempar dari dalam fungsi job saat job dibatalkan user."""
+
+
+class Job:
+    """
+    Satu pekerjaan latar belakang.
+    Fungsi job dipanggil sebagai fn(job, *args, **kwargs) dan dapat:
+    - memanggil job.report(...) untuk memperbarui progres
+    - memanggil job.check_cancelled() secara berkala agar bisa dibatalkan
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = PENDING
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel_event = threading.Event()
+        self.on_cancel = None  # callback on_cancel(job) saat dibatalkan (mis. keluarkan dari antrean scheduler)
+
+    # --- dipanggil dari dalam fungsi job ---
+    def report(self, **progress):
+        """Memperbarui progres job (dict diganti utuh supaya pembaca tidak melihat data setengah jadi)."""
+        self.progress = {**self.progress, **progress}
+
+    def check_cancelled(self):
+        """Melempar JobCancelled jika user sudah meminta pembatalan."""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    # --- dipanggil dari UI ---
+    def cancel(self):
+        """Meminta job berhenti pada titik pengecekan berikutnya."""
+        self._cancel_event.set()
+        if self.on_cancel is not None:
+            self.on_cancel(self)
+
+    @property
+    def cancel_requested(self) -> bool:
+        """True jika pembatalan sudah diminta (walau job belum sampai titik pengecekan)."""
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def elapsed(self) -> float:
+        """Lama job berjalan (detik)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def run(self):
+        """Menjalankan fungsi job di thread saat ini dan mencatat hasil/statusnya."""
+        self.status = RUNNING
+        self.started_at = time.perf_counter()
+        try:
+            self.check_cancelled()
+            result = self._fn(self, *self._args, **self._kwargs)
+            # pembatalan yang diminta setelah titik pengecekan terakhir tetap dihormati
+            # (hasilnya dibuang, bukan dipublikasikan)
+            self.check_cancelled()
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as e:  # error disimpan untuk ditampilkan di UI
+            self.error = e
+            self.status = FAILED
+        else:
+            # hasil di-set sebelum status DONE, jadi pembaca yang melihat DONE pasti mendapat hasil lengkap
+            self.result = result
+            self.status = DONE
+        finally:
+            self.finished_at = time.perf_counter()
+
+
+# --- REGISTRY ---
+def register_job(job: Job) -> Job:
+    """Mendaftarkan job ke registry (tanpa menjalankannya), mis. untuk job yang diantrekan scheduler."""
+    with _JOBS_LOCK:
+        _JOBS[job.id] = job
+    return job
+
+
+def start_job(fn, *args, **kwargs) -> Job:
+    """
+    Membuat job baru, mendaftarkannya ke registry, lalu menjalankannya di thread daemon.
+    """
+    job = register_job(Job(fn, *args, **kwargs))
+    threading.Thread(target=job.run, name=f"job-{job.id}", daemon=True).start()
+    return job
+
+
+def get_job(job_id):
+    """Mengambil job dari registry (None jika tidak ada)."""
+    with _JOBS_LOCK:
+        return _JOBS.get(job_id)
+
+
+def forget_job(job_id):
+    """Menghapus job dari registry setelah hasilnya diambil."""
+    with _JOBS_LOCK:
+        _JOBS.pop(job_id, None)
@@ -0,0 +1,336 @@
+# core/outofcore.py
+"""
+Preprocessing out-of-core untuk dataset yang lebih besar dari RAM.
+
+File sumber dibaca per record batch (lihat core.ingest.iter_batches), sehingga
+pemakaian memori puncak dibatasi oleh ukuran satu chunk, bukan ukuran file:
+
+1. Pass 1 (stream) : proyeksi kolom fitur + target, hitung missing per kolom, hash tiap baris.
+                     Pasangan (hash, nomor baris) ditulis ke beberapa file bucket di disk
+                     (berdasarkan hash), baris lengkap (tanpa NA) ditulis ke file Arrow sementara,
+                     dan vocabulary kolom kategori dikumpulkan.
+2. Dedup per bucket: tiap bucket dibaca sendiri-sendiri, kemunculan pertama tiap hash ditandai
+                     di mask "keep" (memory-mapped di disk).
+3. Pass 2 (stream) : baris lengkap yang lolos dedup di-encode dengan Preprocessor lalu ditulis
+                     ke store Feather (Arrow IPC) yang bisa di-memory-map saat dimuat.
+
+Hasilnya sama dengan core.preprocess.preprocess_frame (baris, urutan, encoding, dan info ringkasan).
+
+score_out_of_core melakukan scoring file besar dengan cara yang sama: per record batch, hasilnya
+langsung ditulis ke CSV sehingga file scoring tidak pernah dimuat utuh ke memori.
+"""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from core.dedup import duplicated_mask, row_hashes
+from core.ingest import detect_format, iter_batches
+from core.pipeline import score_batch
+from core.schema import schema_for, validate_frame
+from core.transform import Preprocessor, codes_dtype
+
+# Ukuran blok CSV untuk mode out-of-core. Sengaja kecil: streaming reader pyarrow membaca
+# beberapa blok ke depan (readahead), sehingga memori puncak sebanding dengan ukuran blok
+OUT_OF_CORE_BLOCK_SIZE = 1024 * 1024  # 1 MB
+
+# Jumlah file bucket untuk hash yang di-spill ke disk; memori saat dedup ~ 16 byte x (baris / bucket)
+SPILL_BUCKETS = 64
+
+# Nama file di dalam direktori store
+CLEAN_STORE_FILE = "clean.arrow"
+_ROW_ID = "__row_id"
+_HASH_RECORD = np.dtype([("hash", "<u8"), ("row", "<i8")])
+
+
+def _is_categorical(arrow_type) -> bool:
+    # kolom teks / dictionary menjadi object / category di pandas -> di-encode sebagai kategori
+    return (
+        pa.types.is_string(arrow_type)
+        or pa.types.is_large_string(arrow_type)
+        or pa.types.is_dictionary(arrow_type)
+    )
+
+
+# --- PASS 1: STREAM, PROYEKSI, HASH, SPILL ---
+def _spill_pass(source, filename, columns, spill_dir, block_size, n_buckets, on_progress, engine="pyarrow"):
+    # mengembalikan (jumlah baris, null per kolom, vocabulary, schema, path baris lengkap)
+    complete_path = os.path.join(spill_dir, "complete.arrow")
+    buckets = [open(os.path.join(spill_dir, f"bucket_{i:03d}.bin"), "wb") for i in range(n_buckets)]
+    writer = None
+    schema = None
+    rows = 0
+    nulls = np.zeros(len(columns), dtype="int64")
+    vocab = {}
+    try:
+        for batch in iter_batches(source, filename, columns, block_size=block_size, engine=engine):
+            df = batch.to_pandas()
+            n = len(df)
+            nulls += df.isna().sum().to_numpy()
+
+            # (hash, nomor baris) dikelompokkan per bucket lalu ditulis ke file bucket masing-masing;
+            # argsort stabil menjaga nomor baris tetap naik di dalam tiap bucket
+            hashes = row_hashes(df)
+            bucket = (hashes % n_buckets).astype("int64")
+            order = np.argsort(bucket, kind="stable")
+            records = np.empty(n, dtype=_HASH_RECORD)
+            records["hash"] = hashes[order]
+            records["row"] = np.arange(rows, rows + n)[order]
+            bounds = np.cumsum(np.bincount(bucket, minlength=n_buckets))
+            for i, part in enumerate(np.split(records, bounds[:-1])):
+                if len(part):
+                    buckets[i].write(part.tobytes())
+
+            # baris lengkap (tanpa NA) disimpan apa adanya + nomor barisnya
+            complete = df.notna().all(axis=1).to_numpy()
+            table = pa.Table.from_batches([batch]).filter(pa.array(complete))
+            table = table.append_column(_ROW_ID, pa.array(np.arange(rows, rows + n)[complete]))
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(complete_path, schema)
+            writer.write_table(table)
+
+            # vocabulary kolom kategori dari baris lengkap
+            for col in columns:
+                if _is_categorical(table.schema.field(col).type):
+                    values = pc.unique(table[col].combine_chunks()).to_pylist()
+                    vocab.setdefault(col, set()).update(v for v in values if v is not None)
+
+            rows += n
+            del df, table, records
+            if on_progress is not None:
+                on_progress("baca", rows)
+    finally:
+        for f in buckets:
+            f.close()
+        if writer is not None:
+            writer.close()
+
+    return rows, nulls, vocab, schema, complete_path
+
+
+# --- DEDUP PER BUCKET ---
+def _dedup_buckets(spill_dir, n_rows, n_buckets):
+    # mask kemunculan pertama tiap baris (disimpan di disk sebagai memmap) + jumlah duplikat
+    keep = np.lib.format.open_memmap(os.path.join(spill_dir, "keep.npy"), mode="w+", dtype=bool, shape=(n_rows,))
+    dup_count = 0
+    for i in range(n_buckets):
+        records = np.fromfile(os.path.join(spill_dir, f"bucket_{i:03d}.bin"), dtype=_HASH_RECORD)
+        dup = duplicated_mask(records["hash"])
+        keep[records["row"][~dup]] = True
+        dup_count += int(dup.sum())
+        del records, dup
+    return keep, dup_count
+
+
+# --- PASS 2: ENCODE & TULIS STORE ---
+def _encode_pass(complete_path, keep, preprocessor, store_path, on_progress):
+    rows = 0
+    writer = None
+    # dibaca per batch lewat file biasa (bukan memory map) supaya halaman file yang sudah
+    # diproses tidak ikut terhitung sebagai memori proses
+    source = pa.OSFile(complete_path)
+    try:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            df = reader.get_batch(i).to_pandas()
+            df = df[keep[df[_ROW_ID].to_numpy()]]
+            table = pa.Table.from_pandas(
+                preprocessor.transform(df, include_target=True), preserve_index=False
+            )
+            if writer is None:
+                writer = pa.ipc.new_file(store_path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+            del df, table
+            if on_progress is not None:
+                on_progress("encode", rows)
+    finally:
+        if writer is not None:
+            writer.close()
+        source.close()
+    return rows
+
+
+# --- PINTU MASUK UTAMA ---
+def preprocess_out_of_core(
+    source,
+    filename: str,
+    features,
+    target: str,
+    store_dir: str,
+    block_size: int = OUT_OF_CORE_BLOCK_SIZE,
+    n_buckets: int = SPILL_BUCKETS,
+    on_progress=None,
+) -> dict:
+    """
+    Menjalankan preprocessing (proyeksi, hapus duplikat, hapus NA, encoding kategori) secara
+    streaming dengan memori puncak terbatas, lalu menulis hasilnya ke store Feather.
+    Parameter:
+    - source      : path atau file-like object file dataset
+    - filename    : nama file (untuk menentukan format)
+    - features    : daftar kolom fitur
+    - target      : nama kolom target
+    - store_dir   : direktori (sudah ada) untuk store hasil & file spill sementara
+    - block_size  : ukuran byte tiap chunk CSV
+    - n_buckets   : jumlah bucket hash yang di-spill ke disk
+    - on_progress : callback opsional on_progress(tahap, jumlah_baris); tahap "baca" / "encode"
+    Mengembalikan:
+    - info ringkasan (sama seperti preprocess_data) + "store_path" (path store Feather)
+    Melempar KeyError jika ada kolom fitur/target yang tidak ditemukan.
+    """
+    columns = list(features) + [target]
+    spill_dir = os.path.join(store_dir, "spill")
+    store_path = os.path.join(store_dir, CLEAN_STORE_FILE)
+    os.makedirs(spill_dir, exist_ok=True)
+
+    try:
+        try:
+            n_rows, nulls, vocab, schema, complete_path = _spill_pass(
+                source, filename, columns, spill_dir, block_size, n_buckets, on_progress
+            )
+        except pa.ArrowInvalid:
+            if detect_format(filename) != "csv":
+                raise
+            # tipe kolom CSV berubah setelah blok pertama (mis. integer yang ternyata berisi desimal):
+            # sama seperti read_csv, pass 1 diulang dari awal dengan engine pandas
+            shutil.rmtree(spill_dir, ignore_errors=True)
+            os.makedirs(spill_dir)
+            n_rows, nulls, vocab, schema, complete_path = _spill_pass(
+                source, filename, columns, spill_dir, block_size, n_buckets, on_progress, engine="pandas"
+            )
+        if schema is None:
+            raise ValueError("File tidak berisi data")
+        keep, dup_count = _dedup_buckets(spill_dir, n_rows, n_buckets)
+
+        # Preprocessor dibangun dari vocabulary hasil stream (tanpa perlu memuat data untuk fit)
+        categories = {col: sorted(values) for col, values in vocab.items()}
+        dtypes = {
+            col: str(codes_dtype(len(categories[col]))) if col in categories
+            else str(np.dtype(schema.field(col).type.to_pandas_dtype()))
+            for col in columns
+        }
+        preprocessor = Preprocessor.from_dict(
+            {"features": list(features), "target": target, "categories": categories, "dtypes": dtypes}
+        )
+
+        rows_after = _encode_pass(complete_path, keep, preprocessor, store_path, on_progress)
+        del keep
+    except BaseException:
+        if os.path.exists(store_path):
+            os.remove(store_path)
+        raise
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    return {
+        "rows_before": int(n_rows),
+        "rows_after": int(rows_after),
+        "cols": len(columns),
+        "duplicates_removed": int(dup_count),
+        "missing_values_before": {c: int(n) for c, n in zip(columns, nulls)},
+        "missing_total_after": 0,
+        "category_mappings": preprocessor.categories,
+        "preprocessor": preprocessor,
+        "store_path": store_path,
+    }
+
+
+# --- MUAT STORE ---
+def load_clean_store(store_path: str) -> pd.DataFrame:
+    """
+    Memuat store hasil preprocess_out_of_core sebagai DataFrame.
+    File di-memory-map, jadi buffer Arrow dibaca langsung dari page cache (tanpa salinan
+    tambahan di heap) dan hanya DataFrame akhir yang dimaterialisasi.
+    """
+    table = pa.ipc.open_file(pa.memory_map(store_path)).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+# --- SCORING PER BATCH ---
+# kolom hasil score_batch (+ valid_skema) dengan tipe tetap, supaya schema CSV sama di semua batch
+_SCORE_FIELDS = [
+    pa.field("proba", pa.float64()),
+    pa.field("prediksi", pa.int8()),
+    pa.field("kategori_dikenal", pa.bool_()),
+    pa.field("valid_skema", pa.bool_()),
+]
+
+
+def _score_pass(model, preprocessor, source, filename, out_path, block_size, engine):
+    features = preprocessor.features
+    schema_features = schema_for(features)
+    # seperti read_dataset: CSV dibaca dengan semua kolomnya (ikut ditulis ke output), format kolomnar
+    # hanya kolom fitur; kolom fitur yang tidak ada membuat score_batch melempar KeyError
+    columns = None if detect_format(filename) == "csv" else features
+    result = {"rows": 0, "scored_rows": 0, "unknown_category_rows": 0, "invalid_rows": 0}
+    violations = {}
+    missing_columns = None
+    writer = None
+    try:
+        for batch in iter_batches(source, filename, columns, block_size=block_size, engine=engine):
+            df = batch.to_pandas()
+            scored = score_batch(model, preprocessor, df)
+            report = validate_frame(df, schema_features)
+            scored["valid_skema"] = ~report["invalid"]
+
+            if writer is None:
+                schema = batch.schema
+                for field in _SCORE_FIELDS:
+                    schema = schema.append(field)
+                writer = pacsv.CSVWriter(out_path, schema)
+            writer.write_table(pa.Table.from_pandas(scored, schema=schema, preserve_index=False))
+
+            result["rows"] += len(df)
+            result["scored_rows"] += int(scored["prediksi"].notna().sum())
+            result["unknown_category_rows"] += int((~scored["kategori_dikenal"]).sum())
+            result["invalid_rows"] += report["invalid_rows"]
+            for col, n in zip(report["columns"]["Kolom"], report["columns"]["Pelanggaran"]):
+                violations[col] = violations.get(col, 0) + int(n)
+            missing_columns = report["missing_columns"]
+            del df, scored
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError("File scoring tidak berisi data")
+    result["unscored_rows"] = result["rows"] - result["scored_rows"]
+    result["violations"] = violations
+    result["missing_columns"] = missing_columns
+    return result
+
+
+def score_out_of_core(
+    model,
+    preprocessor,
+    source,
+    filename: str,
+    out_path: str,
+    block_size: int = OUT_OF_CORE_BLOCK_SIZE,
+) -> dict:
+    """
+    Scoring file per record batch (score_batch + validasi skema) dan menulis hasilnya ke CSV
+    batch demi batch, dengan memori puncak sebatas satu chunk.
+    Parameter:
+    - model, preprocessor : model hasil training & Preprocessor-nya
+    - source              : path atau file-like object file yang di-scoring
+    - filename            : nama file (untuk menentukan format)
+    - out_path            : path CSV output (kolom fitur + "proba", "prediksi", "kategori_dikenal", "valid_skema")
+    - block_size          : ukuran byte tiap chunk CSV
+    Mengembalikan dict jumlah baris: "rows", "scored_rows", "unscored_rows", "unknown_category_rows",
+    "invalid_rows", "violations" (kolom -> jumlah pelanggaran skema), dan "missing_columns".
+    Melempar KeyError jika ada kolom fitur yang tidak ditemukan.
+    """
+    try:
+        return _score_pass(model, preprocessor, source, filename, out_path, block_size, "pyarrow")
+    except pa.ArrowInvalid:
+        if detect_format(filename) != "csv":
+            raise
+        # sama seperti preprocess_out_of_core: tipe kolom CSV berubah setelah blok pertama,
+        # scoring diulang dari awal dengan engine pandas (file output ditulis ulang)
+        return _score_pass(model, preprocessor, source, filename, out_path, block_size, "pandas")
@@ -0,0 +1,332 @@
+# core/pipeline.py
+"""
+Pipeline lengkap (ingest -> preprocessing -> training -> evaluasi -> prediksi) tanpa Streamlit.
+
+Semua fungsi menerima argumen secara eksplisit (tanpa session_state) dan melaporkan
+kesalahan lewat exception (KeyError untuk kolom yang hilang, ValueError untuk data yang
+tidak bisa dipakai), sehingga bisa dipanggil dari halaman Streamlit, script benchmark,
+job latar belakang, maupun proses worker terpisah.
+"""
+import copy
+import warnings
+from typing import NamedTuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import train_test_split
+
+from core.arrow_dtypes import NUMPY_BACKEND
+from core.ingest import read_dataset
+from core.preprocess import append_frame, preprocess_frame  # noqa: F401 (bagian API pipeline)
+from core.transform import Preprocessor
+
+# Nama kolom target (label) di dataset untuk serangan jantung
+TARGET_COL = "heart_attack"
+
+# Daftar fitur default input model (dipakai session_state["features"], CLI, dan benchmark).
+# Urutan dan nama kolom di sini harus sesuai dengan kolom di dataset
+DEFAULT_FEATURES = [
+    "age",
+    "hypertension",
+    "blood_pressure_systolic",
+    "blood_pressure_diastolic",
+    "diabetes",
+    "cholesterol_level",
+    "cholesterol_hdl",
+    "cholesterol_ldl",
+    "triglycerides",
+    "fasting_blood_sugar",
+    "obesity",
+    "waist_circumference",
+    "previous_heart_disease",
+    "smoking_status",
+    "physical_activity",
+]
+
+# Hyperparameter default training (sama dengan nilai awal slider di halaman Analisis)
+DEFAULT_N_ESTIMATORS = 200
+DEFAULT_TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+# Jumlah maksimum langkah fit bertahap saat progres training dilaporkan (lihat _fit_trees)
+PROGRESS_STEPS = 50
+
+# Peringatan sklearn untuk class_weight "balanced"/"balanced_subsample" + warm_start hanya relevan jika
+# data fit berbeda antar langkah; _fit_trees selalu memakai data yang sama. Filter dipasang sekali di
+# level modul (catch_warnings per fit tidak thread-safe: filter global dipulihkan silang antar thread)
+warnings.filterwarnings(
+    "ignore", message="class_weight presets", category=UserWarning, module=r"sklearn\.ensemble\._forest"
+)
+
+
+class TrainResult(NamedTuple):
+    """Hasil train_model."""
+    model: RandomForestClassifier  # model hasil fit
+    features: list                 # urutan kolom fitur saat training
+    X_test: pd.DataFrame           # fitur data testing (untuk evaluasi)
+    y_test: pd.Series              # label data testing
+
+
+# --- INGEST ---
+def load_dataset(
+    source,
+    filename: str,
+    features,
+    target: str = TARGET_COL,
+    chunked: bool = True,
+    dtype_backend: str = NUMPY_BACKEND,
+) -> pd.DataFrame:
+    """
+    Membaca file dataset, hanya kolom fitur + target (untuk file kolomnar).
+    dtype_backend "pyarrow" mempertahankan tipe kolom Arrow sampai preprocessing.
+    """
+    return read_dataset(
+        source, filename, columns=list(features) + [target], chunked=chunked, dtype_backend=dtype_backend
+    )
+
+
+# --- TRAINING ---
+def split_data(df: pd.DataFrame, features, target: str, test_size: float, random_state: int):
+    """
+    Membagi data train/test secara stratified berdasarkan target.
+    Split yang sama (data, test_size, random_state sama) selalu menghasilkan baris yang sama,
+    sehingga model bisa ditambah tree-nya pada data training yang sama (resize_forest).
+    Mengembalikan X_train, X_test, y_train, y_test.
+    """
+    # X = fitur, y = label/target
+    X = df[list(features)]
+    y = df[target]
+    return train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y)
+
+
+def train_model(
+    df: pd.DataFrame,
+    features,
+    target: str = TARGET_COL,
+    n_estimators: int = DEFAULT_N_ESTIMATORS,
+    test_size: float = DEFAULT_TEST_SIZE,
+    random_state: int = RANDOM_STATE,
+    n_jobs: int = -1,
+    on_progress=None,
+    model_params: dict = None,
+) -> TrainResult:
+    """
+    Melatih Random Forest pada data bersih (hasil preprocess_frame).
+    Data dibagi train/test secara stratified berdasarkan target.
+    Parameter:
+    - df           : data bersih (fitur sudah numerik, tanpa missing)
+    - features     : daftar kolom fitur
+    - target       : nama kolom target
+    - n_estimators : jumlah tree
+    - test_size    : proporsi data testing
+    - random_state : seed split & model
+    - n_jobs       : jumlah core untuk fit (-1 = semua core)
+    - on_progress  : (opsional) callback on_progress(tree_selesai, n_estimators); jika diberikan,
+                     tree di-fit bertahap (warm_start) dengan hasil yang sama seperti fit sekaligus
+    - model_params : (opsional) hyperparameter RandomForestClassifier lain (mis. max_depth,
+                     min_samples_leaf, max_features, class_weight) hasil pencarian core.search
+    Mengembalikan:
+    - TrainResult (model, fitur, X_test, y_test)
+    Melempar KeyError jika kolom tidak ada, ValueError jika data terlalu sedikit untuk dibagi.
+    """
+    features = list(features)
+    missing = [c for c in features + [target] if c not in df.columns]
+    if missing:
+        raise KeyError(f"Kolom berikut tidak ditemukan di data bersih: {missing}")
+    if df[target].nunique() < 2:
+        raise ValueError("Data training harus berisi minimal dua kelas target")
+
+    X_train, X_test, y_train, y_test = split_data(df, features, target, test_size, random_state)
+
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,
+        random_state=random_state,
+        n_jobs=n_jobs,
+        **{"class_weight": "balanced", **(model_params or {})},
+    )
+    _fit_trees(model, X_train, y_train, n_estimators, on_progress)
+    return TrainResult(model, features, X_test, y_test)
+
+
+def resize_forest(
+    model: RandomForestClassifier,
+    df: pd.DataFrame,
+    features,
+    target: str = TARGET_COL,
+    n_estimators: int = DEFAULT_N_ESTIMATORS,
+    test_size: float = DEFAULT_TEST_SIZE,
+    random_state: int = RANDOM_STATE,
+    n_jobs: int = -1,
+    on_progress=None,
+) -> TrainResult:
+    """
+    Mengubah jumlah tree model hasil train_model (data, fitur, test_size, random_state sama)
+    tanpa melatih ulang tree yang sudah ada:
+    - lebih sedikit tree : estimators_ cukup dipotong (tanpa fit)
+    - lebih banyak tree  : hanya tree tambahan yang di-fit (warm_start) pada split yang sama
+    Seed tiap tree diturunkan berurutan dari random_state, jadi hasilnya sama dengan
+    train_model(n_estimators=...) dari awal. Model asal tidak diubah (bisa berasal dari cache).
+    on_progress sama seperti di train_model. Mengembalikan TrainResult seperti train_model.
+    """
+    features = list(features)
+    X_train, X_test, y_train, y_test = split_data(df, features, target, test_size, random_state)
+
+    # salinan dangkal + list estimators_ baru: tree lama dipakai bersama, model asal tetap utuh
+    resized = copy.copy(model)
+    resized.estimators_ = list(model.estimators_[:n_estimators])
+    resized.n_estimators = n_estimators
+    resized.set_params(n_jobs=n_jobs)
+    _fit_trees(resized, X_train, y_train, n_estimators, on_progress)
+    return TrainResult(resized, features, X_test, y_test)
+
+
+def _fit_trees(model: RandomForestClassifier, X_train, y_train, n_estimators: int, on_progress=None):
+    # fit tree yang belum ada sampai jumlahnya n_estimators. Dengan on_progress, tree di-fit per
+    # langkah (maks. PROGRESS_STEPS langkah, minimal sebanyak core yang dipakai) lewat warm_start
+    done = len(getattr(model, "estimators_", []))
+    if done >= n_estimators:
+        if on_progress is not None:
+            on_progress(n_estimators, n_estimators)
+        return
+    if on_progress is None and done == 0:
+        model.set_params(n_estimators=n_estimators)
+        model.fit(X_train, y_train)
+        return
+
+    step = n_estimators - done
+    if on_progress is not None:
+        step = max(joblib.effective_n_jobs(model.n_jobs), -(-n_estimators // PROGRESS_STEPS))
+    model.set_params(warm_start=True)
+    try:
+        while done < n_estimators:
+            done = min(done + step, n_estimators)
+            model.set_params(n_estimators=done)
+            model.fit(X_train, y_train)
+            if on_progress is not None:
+                on_progress(done, n_estimators)
+    finally:
+        model.set_params(warm_start=False)
+
+
+# --- EVALUASI ---
+def evaluate_model(model, X_test: pd.DataFrame, y_test: pd.Series) -> dict:
+    """
+    Menghitung metrik evaluasi model pada data testing.
+    Mengembalikan dict:
+    - accuracy         : akurasi (0-1)
+    - confusion_matrix : array confusion matrix
+    - report           : classification report (dict, output_dict=True)
+    """
+    y_pred = model.predict(X_test)
+    return {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "confusion_matrix": confusion_matrix(y_test, y_pred),
+        "report": classification_report(y_test, y_pred, output_dict=True),
+    }
+
+
+# --- JOB TRAINING LATAR BELAKANG ---
+def train_job(
+    job,
+    df: pd.DataFrame,
+    features,
+    target: str = TARGET_COL,
+    n_estimators: int = DEFAULT_N_ESTIMATORS,
+    test_size: float = DEFAULT_TEST_SIZE,
+    random_state: int = RANDOM_STATE,
+    source_model=None,
+    n_jobs: int = -1,
+    model_params: dict = None,
+) -> dict:
+    """
+    Fungsi job (lihat core.jobs) untuk training + evaluasi di thread latar belakang.
+    Progres dilaporkan sebagai jumlah tree yang sudah di-fit (trees / n_estimators);
+    pembatalan dicek setiap satu langkah fit selesai.
+    Jika source_model diberikan (forest dengan data & split yang sama), forest tsb di-resize
+    (resize_forest) sehingga hanya tree tambahan yang dilatih; model_params diteruskan ke train_model.
+    Mengembalikan dict {"model", "features", "accuracy", "confusion_matrix", "report"}.
+    """
+    job.report(stage="training", trees=0, n_estimators=n_estimators)
+
+    def on_progress(done, total):
+        job.report(trees=done)
+        job.check_cancelled()
+
+    params = dict(n_estimators=n_estimators, test_size=test_size, random_state=random_state, n_jobs=n_jobs)
+    if source_model is not None:
+        result = resize_forest(source_model, df, features, target, on_progress=on_progress, **params)
+    else:
+        result = train_model(df, features, target, on_progress=on_progress, model_params=model_params, **params)
+
+    job.report(stage="evaluasi")
+    job.check_cancelled()
+    out = {"model": result.model, "features": result.features}
+    out.update(evaluate_model(result.model, result.X_test, result.y_test))
+    return out
+
+
+# --- UKURAN MODEL ---
+def model_nbytes(model) -> int:
+    """
+    Estimasi ukuran memori Random Forest (array node + nilai daun tiap tree) dalam byte,
+    dipakai sebagai ukuran entri cache model (sys.getsizeof tidak menghitung isi tree).
+    """
+    total = 0
+    for estimator in getattr(model, "estimators_", []):
+        tree = estimator.tree_
+        # satu node = struct 64 byte (anak, fitur, threshold, impurity, sampel, ...) + nilai per kelas
+        total += tree.node_count * (64 + tree.n_outputs * tree.max_n_classes * 8)
+    return total
+
+
+# --- PREDIKSI ---
+def score_batch(model, preprocessor: Preprocessor, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Menghitung probabilitas & prediksi untuk banyak pasien sekaligus.
+    Data di-encode dengan Preprocessor yang sama seperti saat training (tanpa fit ulang).
+    Baris yang fiturnya tidak lengkap, atau berisi nilai kategori yang tidak ada saat training
+    (mis. smoking_status baru), tidak diprediksi (hasilnya kosong).
+    Mengembalikan:
+    - df asli + kolom "proba", "prediksi", dan "kategori_dikenal"
+      (False = ada nilai kategori yang tidak dikenal model)
+    """
+    X = preprocessor.transform(df, unknown_as_nan=True)
+    complete = X.notna().all(axis=1).to_numpy()
+    # kategori tak dikenal = kode kosong padahal nilai aslinya terisi
+    category_cols = [c for c in preprocessor.features if c in preprocessor.categories]
+    unknown = (X[category_cols].isna() & df[category_cols].notna()).any(axis=1).to_numpy()
+
+    out = df.copy()
+    out["proba"] = np.nan
+    out["prediksi"] = pd.array([pd.NA] * len(df), dtype="Int8")
+    if complete.any():
+        proba = model.predict_proba(X[complete])
+        out.loc[complete, "proba"] = proba[:, 1]
+        out.loc[complete, "prediksi"] = model.classes_[proba.argmax(axis=1)]  # sama dengan model.predict
+    out["kategori_dikenal"] = ~unknown
+    return out
+
+
+# --- SIMPAN / MUAT MODEL ---
+def save_model(path, model, preprocessor: Preprocessor, features) -> None:
+    """
+    Menyimpan model beserta encoding (Preprocessor.to_dict) dan urutan fitur ke satu file joblib,
+    sehingga file yang sama bisa dipakai untuk scoring di proses lain.
+    """
+    joblib.dump(
+        {"model": model, "preprocessor": preprocessor.to_dict(), "features": list(features)},
+        path,
+    )
+
+
+def load_model(path):
+    """
+    Memuat file hasil save_model.
+    Mengembalikan:
+    - model, Preprocessor, daftar fitur
+    """
+    bundle = joblib.load(path)
+    return bundle["model"], Preprocessor.from_dict(bundle["preprocessor"]), bundle["features"]
@@ -0,0 +1,151 @@
+# core/preprocess.py
+"""
+Preprocessing in-memory tanpa salinan DataFrame perantara.
+
+Alur lama (copy -> subset kolom -> drop_duplicates -> dropna -> encoding per kolom)
+membuat hingga lima salinan penuh dataset. Di sini duplikat & missing value hanya
+menghasilkan satu mask bool "keep", lalu filter + encoding dilakukan sekaligus per kolom
+(Preprocessor.transform dengan mask), sehingga hanya frame hasil akhir yang dibuat.
+"""
+import numpy as np
+import pandas as pd
+
+from core.dedup import duplicated_mask, get_row_hashes
+from core.frame_buffer import FrameBuffer
+from core.instrument import StageTimer
+from core.transform import Preprocessor
+
+
+def preprocess_frame(
+    df: pd.DataFrame,
+    features,
+    target: str,
+    missing_before: dict = None,
+    hashes=None,
+    fingerprint: str = None,
+    trace_memory: bool = False,
+):
+    """
+    Melakukan preprocessing data:
+    - Memastikan semua kolom fitur + target tersedia
+    - Menghapus baris duplikat (berdasarkan kolom fitur + target)
+    - Menghapus baris dengan nilai missing
+    - Mengonversi kolom bertipe object/category menjadi kode kategori (numerik)
+    Parameter:
+    - df             : dataset mentah (tidak diubah)
+    - features       : daftar kolom fitur
+    - target         : nama kolom target
+    - missing_before : (opsional) jumlah missing per kolom yang sudah diketahui (mis. dari profil)
+    - hashes         : (opsional) hash baris kolom fitur + target (core.dedup) yang sudah dihitung
+    - fingerprint    : (opsional) fingerprint dataset; hash baris diambil dari HASH_CACHE jika ada
+    - trace_memory   : ukur juga peak memori tiap tahap (tracemalloc, memperlambat preprocessing)
+    Mengembalikan:
+    - df yang sudah bersih
+    - info ringkasan proses preprocessing (dict)
+    Metrik tiap tahap (cek kolom, proyeksi, dedup, dropna, encoding) dicatat di info["stage_timings"].
+    Melempar KeyError jika ada kolom yang tidak ditemukan.
+    """
+    all_cols = list(features) + [target]
+    timer = StageTimer(trace_memory=trace_memory)
+
+    # cek apakah ada kolom yang hilang
+    with timer.stage("cek kolom"):
+        missing = [c for c in all_cols if c not in df.columns]
+        if missing:
+            raise KeyError(f"Kolom berikut tidak ditemukan di dataset: {missing}")
+        rows_before = len(df)
+
+    # proyeksi kolom fitur + target (referensi Series, tanpa menyalin data)
+    with timer.stage("proyeksi"):
+        columns = {col: df[col] for col in all_cols}
+
+    # mask duplikat dari hash baris (kemunculan pertama dipertahankan)
+    with timer.stage("dedup"):
+        if hashes is None:
+            hashes = get_row_hashes(df, fingerprint, all_cols)
+        dup_mask = duplicated_mask(hashes)
+
+    # mask baris yang mengandung missing value (+ jumlah missing per kolom) dalam satu pemindaian
+    with timer.stage("dropna"):
+        na_mask = np.zeros(rows_before, dtype=bool)
+        counts = {}
+        for col, s in columns.items():
+            col_na = s.isna().to_numpy()
+            na_mask |= col_na
+            counts[col] = int(col_na.sum())
+        if missing_before is None:
+            missing_before = counts
+
+    # satu mask untuk semua aturan pembersihan; filter & encoding dijalankan sekaligus per kolom
+    with timer.stage("encoding"):
+        keep = ~dup_mask & ~na_mask
+        preprocessor = Preprocessor(features, target).fit(df, mask=keep)
+        clean = preprocessor.transform(df, include_target=True, mask=keep)
+
+    info = {
+        "rows_before": int(rows_before),                 # baris sebelum preprocessing
+        "rows_after": int(clean.shape[0]),               # baris setelah preprocessing
+        "cols": int(clean.shape[1]),                     # jumlah kolom aktif
+        "duplicates_removed": int(dup_mask.sum()),       # jumlah duplikat yang dihapus
+        "missing_values_before": missing_before,          # missing value per kolom (sebelum)
+        "missing_total_after": 0,                        # baris dengan missing tidak diambil
+        "category_mappings": preprocessor.categories,    # kategori per kolom (urutan = kode numerik)
+        "preprocessor": preprocessor,                    # encoder hasil fit (untuk batch baru & scoring)
+        "stage_timings": timer.records,                  # wall/CPU time (& peak memori) per tahap
+    }
+    return clean, info
+
+
+def append_frame(clean: FrameBuffer, info: dict, batch: pd.DataFrame, features, target: str, dup_mask: np.ndarray):
+    """
+    Memproses batch data baru secara inkremental lalu menambahkannya ke data bersih.
+    Hanya baris di batch yang diproses (dropna, encoding) dan data bersih ditambah lewat
+    FrameBuffer, sehingga biaya update sebanding dengan ukuran batch, bukan dengan total data historis.
+    Aturannya sama dengan preprocess_frame pada dataset mentah gabungan: baris duplikat (kolom
+    fitur + target, dibandingkan dengan seluruh baris mentah sebelumnya termasuk yang punya
+    missing value) dan baris dengan missing value dibuang, termasuk hitungan di info.
+    Parameter:
+    - clean    : FrameBuffer berisi data bersih sebelumnya (baris batch ditambahkan in-place)
+    - info     : info preprocessing sebelumnya (berisi preprocessor)
+    - batch    : baris mentah batch baru, sudah diselaraskan dengan dataset mentah gabungan
+                 (index = nomor baris di dataset mentah, seperti index hasil preprocess_frame)
+    - features : daftar kolom fitur
+    - target   : nama kolom target
+    - dup_mask : mask bool baris batch yang duplikat, mis. dari RowHashSet.add(hash baris mentah)
+    Mengembalikan:
+    - clean_df baru (view FrameBuffer), info baru
+    Melempar KeyError jika ada kolom yang tidak ditemukan di batch.
+    """
+    all_cols = list(features) + [target]
+
+    missing = [c for c in all_cols if c not in batch.columns]
+    if missing:
+        raise KeyError(f"Kolom berikut tidak ditemukan di batch: {missing}")
+
+    na_mask = np.zeros(len(batch), dtype=bool)
+    missing_batch = {}
+    for col in all_cols:
+        col_na = batch[col].isna().to_numpy()
+        na_mask |= col_na
+        missing_batch[col] = int(col_na.sum())
+    keep = ~dup_mask & ~na_mask
+
+    # encoding memakai Preprocessor hasil fit; kategori baru ditambahkan di akhir vocabulary
+    # supaya kode kategori yang sudah ada tidak berubah
+    preprocessor = info["preprocessor"].extend(batch[keep])
+    encoded = preprocessor.transform(batch, include_target=True, mask=keep)
+    clean.append(encoded, index=encoded.index)
+
+    new_info = dict(info)
+    new_info.update({
+        "rows_before": info["rows_before"] + int(len(batch)),
+        "rows_after": info["rows_after"] + int(keep.sum()),
+        "duplicates_removed": info["duplicates_removed"] + int(dup_mask.sum()),
+        "missing_values_before": {
+            c: info["missing_values_before"].get(c, 0) + missing_batch[c] for c in all_cols
+        },
+        "category_mappings": preprocessor.categories,
+        "preprocessor": preprocessor,
+    })
+    new_info.pop("stage_timings", None)  # metrik per tahap hanya berlaku untuk preprocessing awal
+    return clean.frame, new_info
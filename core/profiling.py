@@ -0,0 +1,146 @@
+# core/profiling.py
+"""
+Profil kolom dataset (tipe data, null, min/max, nilai unik, duplikat) yang dihitung
+sekali per versi dataset lalu dipakai ulang oleh halaman upload, preprocessing,
+dan fungsi preprocess_data. Saat batch baru di-append, profil diperbarui dari baris batch
+saja lewat ProfileAccumulator (tanpa memindai ulang data lama).
+"""
+import numpy as np
+import pandas as pd
+
+from core.cache import SizedLRUCache
+from core.dedup import RowHashSet, count_duplicates, get_row_hashes, row_hashes, value_hashes
+
+# Profil berukuran kecil (satu baris per kolom), cukup dibatasi 64 MB
+PROFILE_CACHE = SizedLRUCache(64 * 1024 * 1024)
+
+
+# --- PROFIL: HITUNG ---
+def profile_dataframe(df: pd.DataFrame, hashes=None) -> dict:
+    """
+    Menghitung profil dataset dalam satu kali pemindaian per jenis statistik.
+    hashes (opsional) adalah hash baris seluruh kolom (core.dedup) untuk menghitung duplikat.
+    Mengembalikan dict:
+    - "columns"       : DataFrame per kolom (Tipe Data, Non-Null Count, Null Count, Min, Max, Distinct)
+    - "rows"          : jumlah baris
+    - "missing_total" : total nilai kosong di seluruh kolom
+    - "duplicates"    : jumlah baris duplikat (seluruh kolom)
+    """
+    n_rows = len(df)
+    null_counts = df.isna().sum()
+
+    # min/max hanya untuk kolom numerik (kolom teks/category tidak punya urutan yang bermakna)
+    numeric = df.select_dtypes(include="number")
+    mins = numeric.min().reindex(df.columns)
+    maxs = numeric.max().reindex(df.columns)
+
+    columns = pd.DataFrame({
+        "Kolom": df.columns,
+        "Tipe Data": df.dtypes.astype(str).values,
+        "Non-Null Count": (n_rows - null_counts).values,
+        "Null Count": null_counts.values,
+        "Min": mins.values,
+        "Max": maxs.values,
+        "Distinct": df.nunique(dropna=True).values,
+    })
+
+    return {
+        "columns": columns,
+        "rows": int(n_rows),
+        "missing_total": int(null_counts.sum()),
+        "duplicates": count_duplicates(hashes if hashes is not None else row_hashes(df)),
+    }
+
+
+# --- PROFIL: DENGAN CACHE ---
+def get_profile(df: pd.DataFrame, fingerprint: str = None) -> dict:
+    """
+    Mengambil profil dataset dari cache berdasarkan fingerprint versi dataset.
+    Jika belum ada (atau fingerprint None), profil dihitung lalu disimpan.
+    """
+    if fingerprint is None:
+        return profile_dataframe(df)
+
+    profile = PROFILE_CACHE.get(fingerprint)
+    if profile is None:
+        profile = profile_dataframe(df, get_row_hashes(df, fingerprint))
+        PROFILE_CACHE.put(fingerprint, profile)
+    return profile
+
+
+# --- PROFIL: INKREMENTAL (APPEND) ---
+class ProfileAccumulator:
+    """
+    Profil dataset yang bisa diperbarui per batch append dengan biaya sebanding ukuran batch.
+    Null count dijumlahkan, min/max digabung, nilai unik (Distinct) & duplikat baris dihitung
+    lewat RowHashSet hash nilai per kolom dan hash baris seluruh kolom.
+    Parameter:
+    - df      : dataset awal
+    - profile : (opsional) profil df yang sudah ada (mis. dari get_profile), supaya null & min/max
+                tidak dihitung ulang
+    - hashes  : (opsional) hash baris seluruh kolom df (core.dedup)
+    Set hash nilai unik per kolom dibangun sekali dari df (satu pemindaian), batch berikutnya
+    cukup menambahkan hash barunya.
+    """
+
+    def __init__(self, df: pd.DataFrame, profile: dict = None, hashes=None):
+        if profile is None:
+            profile = profile_dataframe(df, hashes)
+        stats = profile["columns"].set_index("Kolom")
+        self.columns = list(df.columns)
+        self._rows = profile["rows"]
+        self._nulls = stats["Null Count"].to_numpy()
+        self._mins = _as_float(stats["Min"])
+        self._maxs = _as_float(stats["Max"])
+        self._distinct = [RowHashSet(value_hashes(df[col].dropna())) for col in self.columns]
+        self._row_set = RowHashSet(hashes if hashes is not None else row_hashes(df))
+
+    def add(self, batch: pd.DataFrame):
+        """Menambahkan statistik baris batch (kolom & dtype harus sama dengan dataset gabungan)."""
+        self._rows += len(batch)
+        self._nulls = self._nulls + batch.isna().sum().to_numpy()
+        numeric = pd.DataFrame({col: batch[col] for col in self.columns if _is_number(batch[col].dtype)})
+        self._mins = np.fmin(self._mins, _as_float(numeric.min().reindex(self.columns)))
+        self._maxs = np.fmax(self._maxs, _as_float(numeric.max().reindex(self.columns)))
+        for col, seen in zip(self.columns, self._distinct):
+            seen.add(value_hashes(batch[col].dropna()))
+        self._row_set.add(row_hashes(batch))
+
+    def profile(self, df: pd.DataFrame) -> dict:
+        """Profil (format sama dengan profile_dataframe) untuk dataset gabungan df."""
+        # select_dtypes menyalin seluruh kolom numerik, cukup cek dtype per kolom
+        is_numeric = np.array([_is_number(t) for t in df.dtypes], dtype=bool)
+        columns = pd.DataFrame({
+            "Kolom": self.columns,
+            "Tipe Data": df.dtypes.astype(str).values,
+            "Non-Null Count": self._rows - self._nulls,
+            "Null Count": self._nulls,
+            "Min": np.where(is_numeric, self._mins, np.nan),
+            "Max": np.where(is_numeric, self._maxs, np.nan),
+            "Distinct": [len(seen) for seen in self._distinct],
+        })
+        return {
+            "columns": columns,
+            "rows": int(self._rows),
+            "missing_total": int(self._nulls.sum()),
+            "duplicates": int(self._rows - len(self._row_set)),
+        }
+
+
+def _is_number(dtype) -> bool:
+    # sama dengan select_dtypes(include="number"): bool & category tidak termasuk
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _as_float(values: pd.Series) -> np.ndarray:
+    # min/max per kolom sebagai float64 (NaN / pd.NA -> NaN)
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+# --- PROFIL: NULL PER KOLOM ---
+def null_counts(profile: dict, columns) -> dict:
+    """
+    Mengambil jumlah null per kolom (untuk kolom-kolom tertentu) dari profil.
+    """
+    counts = profile["columns"].set_index("Kolom")["Null Count"]
+    return {c: int(counts[c]) for c in columns}
@@ -0,0 +1,201 @@
+# core/query_engine.py
+"""
+Engine query opsional berbasis DuckDB (embedded, in-process).
+
+File upload didaftarkan sebagai view di DuckDB tanpa dimuat ke pandas.
+Filter, proyeksi kolom, dan agregat untuk visualisasi dijalankan di DuckDB,
+dan hanya hasil query yang dimaterialisasi menjadi DataFrame.
+
+DuckDB adalah dependency opsional: jika belum terpasang, DUCKDB_AVAILABLE = False.
+"""
+import os
+import shutil
+import tempfile
+import weakref
+
+import pyarrow.dataset as ds
+
+from core.cache import bytes_fingerprint, estimate_nbytes
+from core.ingest import (
+    NA_VALUES,
+    LoadedDataset,
+    content_fingerprint,
+    detect_compression,
+    detect_format,
+    downcast_dtypes,
+)
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - dependency opsional
+    duckdb = None
+
+DUCKDB_AVAILABLE = duckdb is not None
+
+# Operator filter yang diizinkan (nilai filter selalu dikirim sebagai parameter query)
+FILTER_OPERATORS = ("=", "!=", ">", ">=", "<", "<=")
+
+
+def _quote(name: str) -> str:
+    # quote identifier kolom untuk SQL
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(text: str) -> str:
+    # quote string literal untuk SQL (dipakai untuk path file sementara)
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _release(con, path: str):
+    # tutup koneksi DuckDB lalu hapus file sementara (dipanggil sekali lewat weakref.finalize)
+    try:
+        con.close()
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class DuckDBSource:
+    """
+    Satu file upload yang terdaftar di database DuckDB in-memory sebagai view `src`.
+    Parameter:
+    - source   : file-like object hasil upload
+    - filename : nama file (untuk menentukan format)
+    Koneksi & file sementara dilepas oleh close(), atau otomatis saat objek dibuang
+    (weakref.finalize, mis. session Streamlit berakhir).
+    """
+
+    def __init__(self, source, filename: str):
+        if not DUCKDB_AVAILABLE:
+            raise ImportError("DuckDB belum terpasang. Jalankan: pip install duckdb")
+        if detect_compression(filename) == "zip":
+            raise ValueError("Engine DuckDB belum mendukung file .zip, gunakan .csv.gz / .csv.zst")
+
+        self.fmt = detect_format(filename)
+        self.content_fingerprint = content_fingerprint(source)
+
+        # DuckDB membaca langsung dari path, jadi bytes upload ditulis sekali ke file sementara
+        # (disalin bertahap, isi file tidak di-decode ke pandas)
+        suffix = "".join(os.path.basename(filename).partition(".")[1:]) or ".csv"
+        self.con = duckdb.connect()
+        fd, self.path = tempfile.mkstemp(suffix=suffix)
+        self._finalizer = weakref.finalize(self, _release, self.con, self.path)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                source.seek(0)
+                shutil.copyfileobj(source, out, length=16 * 1024 * 1024)
+            source.seek(0)
+
+            if self.fmt == "csv":
+                # string missing value disamakan dengan jalur pandas/pyarrow
+                nullstr = "[" + ", ".join(_literal(v) for v in NA_VALUES) + "]"
+                self.con.execute(
+                    f"CREATE VIEW src AS SELECT * FROM read_csv_auto({_literal(self.path)}, nullstr = {nullstr})"
+                )
+            elif self.fmt == "parquet":
+                self.con.execute(f"CREATE VIEW src AS SELECT * FROM read_parquet({_literal(self.path)})")
+            else:
+                # Feather / Arrow IPC: didaftarkan sebagai dataset Arrow (proyeksi & filter tetap di-push down)
+                self.con.register("src", ds.dataset(self.path, format="ipc"))
+        except Exception:
+            self.close()  # file gagal didaftarkan -> jangan tinggalkan file sementara
+            raise
+
+        self._min_max = {}       # cache min/max per kolom (file tidak berubah)
+        self.columns = None      # kolom hasil load terakhir
+        self.filters = []        # filter hasil load terakhir
+        self.fingerprint = None  # fingerprint dataset hasil load terakhir
+
+    # --- SKEMA & STATISTIK ---
+    def column_names(self):
+        """Daftar kolom yang ada di file."""
+        return [row[0] for row in self.con.execute("DESCRIBE src").fetchall()]
+
+    def min_max(self, column: str):
+        """Nilai minimum & maksimum sebuah kolom (dihitung di DuckDB, sekali per kolom)."""
+        if column not in self._min_max:
+            col = _quote(column)
+            self._min_max[column] = self.con.execute(f"SELECT min({col}), max({col}) FROM src").fetchone()
+        return self._min_max[column]
+
+    # --- QUERY ---
+    def _where(self, filters, not_null_columns=None):
+        # bangun klausa WHERE dari daftar filter (kolom, operator, nilai)
+        clauses, params = [], []
+        for column, op, value in filters:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Operator filter '{op}' tidak didukung")
+            clauses.append(f"{_quote(column)} {op} ?")
+            params.append(value)
+        for column in not_null_columns or []:
+            clauses.append(f"{_quote(column)} IS NOT NULL")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def load(self, columns, filters=(), downcast: bool = False) -> LoadedDataset:
+        """
+        Menjalankan query proyeksi + filter di DuckDB dan memuat HANYA hasilnya ke pandas.
+        Parameter:
+        - columns  : kolom yang diambil (mis. fitur + target); kolom yang tidak ada di file dilewati
+        - filters  : list tuple (kolom, operator, nilai), mis. [("age", ">=", 60), ("hypertension", "=", 1)]
+        - downcast : kecilkan tipe data hasil query (lihat core.ingest.downcast_dtypes)
+        """
+        available = set(self.column_names())
+        self.columns = [c for c in columns if c in available]
+        self.filters = list(filters)
+
+        where, params = self._where(self.filters)
+        select = ", ".join(_quote(c) for c in self.columns)
+        df = self.con.execute(f"SELECT {select} FROM src{where}", params).df()
+
+        nbytes_original = estimate_nbytes(df)
+        nbytes = nbytes_original
+        if downcast:
+            df = downcast_dtypes(df)
+            nbytes = estimate_nbytes(df)
+
+        self.fingerprint = bytes_fingerprint(
+            f"{self.content_fingerprint}|duckdb|{self.columns}|{self.filters}|{downcast}".encode()
+        )
+        return LoadedDataset(df, self.fingerprint, nbytes, nbytes_original)
+
+    # --- AGREGAT UNTUK VISUALISASI ---
+    def _clean_relation(self):
+        # baris unik tanpa missing value pada kolom hasil load terakhir
+        # (setara dengan drop_duplicates + dropna di preprocess_data)
+        where, params = self._where(self.filters, not_null_columns=self.columns)
+        select = ", ".join(_quote(c) for c in self.columns)
+        return f"(SELECT DISTINCT {select} FROM src{where})", params
+
+    def value_counts(self, column: str):
+        """Jumlah baris per nilai kolom pada data bersih (mis. distribusi target)."""
+        rel, params = self._clean_relation()
+        col = _quote(column)
+        df = self.con.execute(
+            f"SELECT {col} AS value, count(*) AS n FROM {rel} GROUP BY 1 ORDER BY 1", params
+        ).df()
+        return df.set_index("value")["n"]
+
+    def histogram(self, column: str, bins: int = 20):
+        """
+        Histogram kolom numerik pada data bersih, dihitung di DuckDB.
+        Mengembalikan DataFrame dengan kolom left (batas kiri bin), width, dan n (jumlah baris),
+        atau None jika data bersih kosong (mis. filter tidak menyisakan baris).
+        """
+        rel, params = self._clean_relation()
+        col = _quote(column)
+        lo, hi = self.con.execute(f"SELECT min({col}), max({col}) FROM {rel}", params).fetchone()
+        if lo is None:
+            return None
+        width = (hi - lo) / bins if hi > lo else 1
+        df = self.con.execute(
+            f"SELECT least(floor(({col} - ?) / ?), ? - 1) AS b, count(*) AS n FROM {rel} GROUP BY 1 ORDER BY 1",
+            [lo, width, bins] + params,
+        ).df()
+        df["left"] = lo + df["b"] * width
+        df["width"] = width
+        return df[["left", "width", "n"]]
+
+    def close(self):
+        """Menutup koneksi DuckDB dan menghapus file sementara (aman dipanggil lebih dari sekali)."""
+        self._finalizer()
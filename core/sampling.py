@@ -0,0 +1,29 @@
+# core/sampling.py
+"""
+Sampling dataset untuk eksplorasi interaktif pada file berukuran sangat besar.
+"""
+import pandas as pd
+
+# Seed default agar sampel selalu sama untuk dataset & fraksi yang sama
+SAMPLE_SEED = 42
+
+
+# --- SAMPLING: STRATIFIED ---
+def stratified_sample(df: pd.DataFrame, target: str, frac: float, seed: int = SAMPLE_SEED) -> pd.DataFrame:
+    """
+    Mengambil sampel acak berstrata berdasarkan kolom target,
+    sehingga proporsi tiap kelas di sampel sama dengan di data penuh.
+    Parameter:
+    - df     : dataset (target tidak boleh mengandung missing value)
+    - target : nama kolom strata (mis. heart_attack)
+    - frac   : fraksi baris yang diambil dari tiap kelas (0 < frac <= 1)
+    - seed   : random seed agar sampel bisa direproduksi
+    Mengembalikan sampel dengan urutan baris yang sama seperti di df.
+    """
+    if frac >= 1:
+        return df
+    return (
+        df.groupby(target, group_keys=False, observed=True)
+        .sample(frac=frac, random_state=seed)
+        .sort_index()
+    )
@@ -0,0 +1,146 @@
+# core/scheduler.py
+"""
+Scheduler training bersama untuk seluruh session di satu proses server.
+
+Tanpa scheduler, setiap session melatih Random Forest dengan n_jobs=-1 sehingga beberapa
+training bersamaan masing-masing memakai semua core (oversubscription). Scheduler ini:
+- membatasi jumlah training yang berjalan bersamaan (pool worker berukuran tetap)
+- membatasi paralelisme tiap job: n_jobs model + thread pool native (BLAS/OpenMP) lewat threadpoolctl
+- mengantrekan job per pemilik (session) dan mengambilnya bergiliran (round-robin), sehingga satu
+  session yang mengirim banyak job tidak membuat session lain menunggu semua job tsb selesai
+- memberi posisi antrean tiap job untuk ditampilkan di UI
+
+Konfigurasi lewat environment variable:
+- TRAIN_WORKERS        : jumlah training bersamaan (default 1 jika core < 4, selain itu 2)
+- TRAIN_THREADS_PER_JOB: thread per training (default jumlah core / TRAIN_WORKERS)
+"""
+import os
+import threading
+from collections import OrderedDict, deque
+
+from threadpoolctl import threadpool_limits
+
+from core.jobs import Job, register_job
+
+
+class TrainingScheduler:
+    """
+    Pool worker berukuran tetap dengan antrean adil (round-robin per pemilik).
+    Parameter:
+    - max_workers     : jumlah job yang boleh berjalan bersamaan
+    - threads_per_job : batas thread per job (n_jobs model & thread pool native)
+    """
+
+    def __init__(self, max_workers: int, threads_per_job: int):
+        self.max_workers = max(1, int(max_workers))
+        self.threads_per_job = max(1, int(threads_per_job))
+        self._queues = OrderedDict()  # pemilik -> deque job (urutan pemilik = giliran berikutnya)
+        self._running = set()         # id job yang sedang berjalan
+        self._cond = threading.Condition()
+        self._workers = []
+        # batas thread pool native bersifat global per proses: dipasang saat job pertama mulai
+        # dan dilepas saat job terakhir selesai (semua job memakai batas yang sama)
+        self._limits = None
+
+    # --- SUBMIT & BATAL ---
+    def submit(self, owner, fn, *args, **kwargs) -> Job:
+        """
+        Membuat job fn(job, *args, **kwargs), mendaftarkannya ke registry core.jobs, lalu
+        mengantrekannya untuk pemilik owner (mis. id session). Mengembalikan Job (status PENDING).
+        """
+        job = register_job(Job(fn, *args, **kwargs))
+        job.on_cancel = self._discard
+        with self._cond:
+            self._queues.setdefault(owner, deque()).append(job)
+            self._ensure_workers()
+            self._cond.notify()
+        return job
+
+    def _discard(self, job: Job):
+        # job yang dibatalkan saat masih antre langsung dikeluarkan dan ditandai CANCELLED
+        with self._cond:
+            for owner, queue in list(self._queues.items()):
+                if job in queue:
+                    queue.remove(job)
+                    if not queue:
+                        del self._queues[owner]
+                    break
+            else:
+                return
+        job.run()  # pembatalan sudah diminta, jadi run() langsung berakhir dengan status CANCELLED
+
+    # --- STATUS ANTREAN ---
+    def _order(self) -> list:
+        # urutan eksekusi job yang masih antre sesuai giliran round-robin (dipanggil dengan lock)
+        order, queues = [], [list(q) for q in self._queues.values()]
+        for i in range(max((len(q) for q in queues), default=0)):
+            order.extend(q[i] for q in queues if i < len(q))
+        return order
+
+    def position(self, job_id):
+        """Posisi job di antrean (1 = berikutnya dijalankan), atau None jika tidak sedang antre."""
+        with self._cond:
+            for i, job in enumerate(self._order(), start=1):
+                if job.id == job_id:
+                    return i
+        return None
+
+    def stats(self) -> dict:
+        """Ringkasan scheduler: jumlah job berjalan & antre, kapasitas, dan batas thread per job."""
+        with self._cond:
+            return {
+                "running": len(self._running),
+                "queued": sum(len(q) for q in self._queues.values()),
+                "max_workers": self.max_workers,
+                "threads_per_job": self.threads_per_job,
+            }
+
+    # --- WORKER ---
+    def _ensure_workers(self):
+        # worker dibuat saat job pertama masuk (dipanggil dengan lock)
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._work, name=f"train-worker-{len(self._workers)}", daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Job:
+        # ambil job terdepan dari pemilik yang gilirannya tiba, lalu pemilik tsb pindah ke belakang
+        owner, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(owner)
+        else:
+            del self._queues[owner]
+        return job
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queues:
+                    self._cond.wait()
+                job = self._next_job()
+                self._running.add(job.id)
+                if self._limits is None:
+                    self._limits = threadpool_limits(limits=self.threads_per_job)
+            try:
+                job.run()
+            finally:
+                with self._cond:
+                    self._running.discard(job.id)
+                    if not self._running and self._limits is not None:
+                        self._limits.restore_original_limits()
+                        self._limits = None
+
+
+def _default_workers() -> int:
+    return 1 if (os.cpu_count() or 1) < 4 else 2
+
+
+# Scheduler training bersama untuk semua session di proses server ini
+TRAIN_WORKERS = int(os.environ.get("TRAIN_WORKERS", _default_workers()))
+TRAIN_THREADS_PER_JOB = int(
+    os.environ.get("TRAIN_THREADS_PER_JOB", max(1, (os.cpu_count() or 1) // max(1, TRAIN_WORKERS)))
+)
+TRAIN_SCHEDULER = TrainingScheduler(TRAIN_WORKERS, TRAIN_THREADS_PER_JOB)
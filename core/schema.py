@@ -0,0 +1,262 @@
+# core/schema.py
+"""
+Skema deklaratif kolom fitur + target dataset Heart Attack Prediction in Indonesia:
+rentang nilai valid untuk kolom angka dan nilai yang diizinkan untuk kolom pilihan.
+
+Skema yang sama dipakai untuk:
+- validasi vektor seluruh frame (upload dataset, file scoring batch, CLI)
+- membangun form prediksi individu (label, batas min/max, nilai awal, pilihan)
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core.arrow_dtypes import arrow_numeric_values, arrow_to_categorical, is_arrow_string
+from core.cache import SizedLRUCache
+from core.frame_buffer import GrowableArray
+
+
+class FieldSpec(NamedTuple):
+    """Aturan satu kolom. Kolom pilihan punya choices, kolom angka punya min/max."""
+    label: str                 # label di form & laporan validasi
+    section: str = None        # kelompok input di form prediksi (None = tidak ditampilkan di form)
+    min: float = None          # batas bawah nilai valid (kolom angka)
+    max: float = None          # batas atas nilai valid (kolom angka)
+    default: float = None      # nilai awal di form
+    choices: tuple = ()        # label tiap kode pilihan (kode = posisi: 0, 1, 2, ...)
+    values: tuple = ()         # nilai teks di dataset untuk tiap kode (kosong = kolom berisi kode angka)
+    help: str = None           # teks bantuan di form
+
+    @property
+    def allowed(self) -> list:
+        """Nilai yang diizinkan untuk kolom pilihan: kode angka + nilai teksnya."""
+        return list(range(len(self.choices))) + list(self.values)
+
+    @property
+    def rule(self) -> str:
+        """Deskripsi singkat aturan (untuk tabel laporan validasi)."""
+        if self.choices:
+            return "salah satu dari " + ", ".join(str(v) for v in self.allowed)
+        return f"{self.min:g} – {self.max:g}"
+
+
+# Kelompok input di form prediksi
+SECTION_DEMOGRAPHIC = "👤 Data Demografis & Tekanan Darah"
+SECTION_LIPID = "💉 Data Kolesterol & Gula Darah"
+SECTION_CONDITION = "🏥 Kondisi Kesehatan"
+SECTION_LIFESTYLE = "🚭 Gaya Hidup"
+
+_YES_NO = ("Tidak", "Ya")
+
+# Skema kolom fitur + target (urutan = urutan input di form dalam tiap kelompok)
+HEART_SCHEMA = {
+    "age": FieldSpec(
+        "Usia (tahun)", SECTION_DEMOGRAPHIC, 18, 100, 40, help="Masukkan usia dalam tahun"
+    ),
+    "blood_pressure_systolic": FieldSpec(
+        "Tekanan Darah Sistolik (mmHg)", SECTION_DEMOGRAPHIC, 80, 250, 120,
+        help="Tekanan darah saat jantung memompa",
+    ),
+    "blood_pressure_diastolic": FieldSpec(
+        "Tekanan Darah Diastolik (mmHg)", SECTION_DEMOGRAPHIC, 50, 150, 80,
+        help="Tekanan darah saat jantung rileks",
+    ),
+    "cholesterol_level": FieldSpec("Kolesterol Total (mg/dL)", SECTION_LIPID, 80, 400, 200),
+    "cholesterol_hdl": FieldSpec("Kolesterol HDL (mg/dL)", SECTION_LIPID, 10, 120, 40, help="Kolesterol baik"),
+    "cholesterol_ldl": FieldSpec("Kolesterol LDL (mg/dL)", SECTION_LIPID, 10, 300, 120, help="Kolesterol jahat"),
+    "triglycerides": FieldSpec("Trigliserida (mg/dL)", SECTION_LIPID, 30, 600, 150),
+    "fasting_blood_sugar": FieldSpec("Gula Darah Puasa (mg/dL)", SECTION_LIPID, 50, 400, 100),
+    "hypertension": FieldSpec(
+        "Hipertensi", SECTION_CONDITION, choices=_YES_NO, help="Apakah memiliki riwayat hipertensi?"
+    ),
+    "diabetes": FieldSpec("Diabetes", SECTION_CONDITION, choices=_YES_NO, help="Apakah memiliki riwayat diabetes?"),
+    "obesity": FieldSpec(
+        "Obesitas", SECTION_CONDITION, choices=_YES_NO, help="Apakah termasuk kategori obesitas?"
+    ),
+    "previous_heart_disease": FieldSpec(
+        "Riwayat Penyakit Jantung", SECTION_CONDITION, choices=_YES_NO,
+        help="Apakah pernah mengalami penyakit jantung sebelumnya?",
+    ),
+    "waist_circumference": FieldSpec(
+        "Lingkar Pinggang (cm)", SECTION_CONDITION, 50, 200, 85, help="Ukuran lingkar pinggang dalam cm"
+    ),
+    "smoking_status": FieldSpec(
+        "Status Merokok", SECTION_LIFESTYLE,
+        choices=("Tidak Pernah", "Mantan Perokok", "Aktif Merokok"),
+        values=("Never", "Past", "Current"),
+    ),
+    "physical_activity": FieldSpec(
+        "Aktivitas Fisik", SECTION_LIFESTYLE,
+        choices=("Rendah", "Sedang", "Tinggi"),
+        values=("Low", "Moderate", "High"),
+        help="Tingkat aktivitas fisik sehari-hari",
+    ),
+    "heart_attack": FieldSpec("Serangan Jantung (target)", choices=_YES_NO),
+}
+
+# Hasil validasi per versi dataset (mask 1 byte per baris per kolom), dibatasi 256 MB
+VALIDATION_CACHE = SizedLRUCache(256 * 1024 * 1024)
+
+VALIDATION_COLUMNS = ["Kolom", "Aturan", "Pelanggaran", "Pelanggaran (%)"]
+
+
+def fields_in_section(section: str, schema: dict = HEART_SCHEMA) -> dict:
+    """Kolom-kolom (nama -> FieldSpec) pada satu kelompok form, sesuai urutan skema."""
+    return {name: spec for name, spec in schema.items() if spec.section == section}
+
+
+def schema_for(columns, schema: dict = HEART_SCHEMA) -> dict:
+    """Bagian skema untuk kolom-kolom tertentu saja (mis. fitur model pada file scoring tanpa target)."""
+    return {c: schema[c] for c in columns if c in schema}
+
+
+# --- VALIDASI: MASK PER KOLOM ---
+def _choice_violations(s: pd.Series, spec: FieldSpec) -> np.ndarray:
+    # nilai (bukan null) yang tidak termasuk pilihan skema
+    allowed = spec.allowed
+    s = arrow_to_categorical(s) if is_arrow_string(s.dtype) else s
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # cukup cek daftar kategori, lalu petakan lewat kode (tanpa membandingkan tiap baris)
+        bad = ~s.cat.categories.isin(allowed)
+        if not bad.any():
+            return np.zeros(len(s), dtype=bool)
+        codes = s.cat.codes.to_numpy()
+        return (codes >= 0) & bad[codes]
+    if isinstance(s.dtype, pd.ArrowDtype):
+        values = arrow_numeric_values(s)
+    else:
+        values = s.to_numpy()
+    if values.dtype.kind in "biuf":
+        return ~np.isin(values, allowed[: len(spec.choices)]) & ~np.isnan(values.astype("float64", copy=False))
+    return ~pd.isna(values) & ~pd.Series(values).isin(allowed).to_numpy()
+
+
+def _range_violations(s: pd.Series, spec: FieldSpec) -> np.ndarray:
+    # nilai di luar [min, max]; teks yang bukan angka juga dihitung sebagai pelanggaran
+    if isinstance(s.dtype, pd.ArrowDtype) and not is_arrow_string(s.dtype):
+        values = arrow_numeric_values(s)
+        bad = np.zeros(len(s), dtype=bool)
+    elif pd.api.types.is_numeric_dtype(s.dtype):
+        values = s.to_numpy()
+        bad = np.zeros(len(s), dtype=bool)
+    else:
+        values = pd.to_numeric(s.astype("object"), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        bad = s.notna().to_numpy() & np.isnan(values)
+    # NaN selalu False pada perbandingan, jadi missing value tidak dihitung sebagai pelanggaran
+    return bad | (values < spec.min) | (values > spec.max)
+
+
+# --- VALIDASI: SELURUH FRAME ---
+def validate_frame(df: pd.DataFrame, schema: dict = HEART_SCHEMA) -> dict:
+    """
+    Memvalidasi seluruh frame terhadap skema dalam satu pemindaian vektor per kolom.
+    Missing value tidak dihitung sebagai pelanggaran (ditangani preprocessing);
+    kolom skema yang tidak ada di df dilewati, kolom di luar skema diabaikan.
+    Mengembalikan dict:
+    - "columns"         : DataFrame per kolom (Kolom, Aturan, Pelanggaran, Pelanggaran (%))
+    - "masks"           : kolom -> array bool baris yang melanggar aturan kolom tsb
+    - "invalid"         : array bool baris yang melanggar minimal satu aturan
+    - "rows"            : jumlah baris
+    - "invalid_rows"    : jumlah baris yang melanggar
+    - "missing_columns" : kolom skema yang tidak ada di df
+    """
+    n_rows = len(df)
+    masks = {}
+    for col, spec in schema.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        masks[col] = _choice_violations(s, spec) if spec.choices else _range_violations(s, spec)
+
+    invalid = np.zeros(n_rows, dtype=bool)
+    for mask in masks.values():
+        invalid |= mask
+    counts = [int(m.sum()) for m in masks.values()]
+
+    columns = pd.DataFrame({
+        "Kolom": list(masks),
+        "Aturan": [schema[c].rule for c in masks],
+        "Pelanggaran": counts,
+        "Pelanggaran (%)": [round(c / max(n_rows, 1) * 100, 2) for c in counts],
+    }, columns=VALIDATION_COLUMNS)
+
+    return {
+        "columns": columns,
+        "masks": masks,
+        "invalid": invalid,
+        "rows": int(n_rows),
+        "invalid_rows": int(invalid.sum()),
+        "missing_columns": [c for c in schema if c not in df.columns],
+    }
+
+
+# --- VALIDASI: DENGAN CACHE ---
+def get_validation(df: pd.DataFrame, fingerprint: str = None) -> dict:
+    """
+    Mengambil hasil validasi dataset dari cache berdasarkan fingerprint versi dataset.
+    Jika belum ada (atau fingerprint None), validasi dijalankan lalu disimpan.
+    """
+    if fingerprint is None:
+        return validate_frame(df)
+
+    report = VALIDATION_CACHE.get(fingerprint)
+    if report is None:
+        report = validate_frame(df)
+        VALIDATION_CACHE.put(fingerprint, report)
+    return report
+
+
+# --- VALIDASI: INKREMENTAL (APPEND) ---
+class ValidationAccumulator:
+    """
+    Hasil validasi dataset yang bisa diperbarui per batch append: hanya baris batch yang
+    divalidasi, mask pelanggaran ditambahkan di akhir buffer (GrowableArray) dan jumlah
+    pelanggaran dijumlahkan, tanpa memvalidasi ulang data lama.
+    Parameter:
+    - report : hasil validate_frame / get_validation untuk dataset awal
+    - schema : skema yang sama dengan yang dipakai untuk report
+    """
+
+    def __init__(self, report: dict, schema: dict = HEART_SCHEMA):
+        self.schema = schema
+        self._rows = report["rows"]
+        self._masks = {col: GrowableArray(mask) for col, mask in report["masks"].items()}
+        self._counts = dict(zip(report["columns"]["Kolom"], report["columns"]["Pelanggaran"]))
+        self._invalid = GrowableArray(report["invalid"])
+        self._invalid_rows = report["invalid_rows"]
+
+    def add(self, batch: pd.DataFrame):
+        """Memvalidasi baris batch (kolom & dtype sama dengan dataset gabungan) lalu menggabungkannya."""
+        part = validate_frame(batch, self.schema)
+        for col in part["masks"]:
+            if col not in self._masks:
+                # kolom skema yang baru muncul di batch: baris lama berisi missing value (bukan pelanggaran)
+                self._masks[col] = GrowableArray(np.zeros(self._rows, dtype=bool))
+                self._counts[col] = 0
+        for col, mask in self._masks.items():
+            batch_mask = part["masks"].get(col, np.zeros(len(batch), dtype=bool))
+            mask.append(batch_mask)
+            self._counts[col] += int(batch_mask.sum())
+        self._invalid.append(part["invalid"])
+        self._invalid_rows += part["invalid_rows"]
+        self._rows += len(batch)
+
+    def report(self) -> dict:
+        """Hasil validasi (format sama dengan validate_frame) untuk dataset gabungan."""
+        cols = [c for c in self.schema if c in self._masks]
+        counts = [int(self._counts[c]) for c in cols]
+        columns = pd.DataFrame({
+            "Kolom": cols,
+            "Aturan": [self.schema[c].rule for c in cols],
+            "Pelanggaran": counts,
+            "Pelanggaran (%)": [round(c / max(self._rows, 1) * 100, 2) for c in counts],
+        }, columns=VALIDATION_COLUMNS)
+        return {
+            "columns": columns,
+            "masks": {c: self._masks[c].values for c in cols},
+            "invalid": self._invalid.values,
+            "rows": int(self._rows),
+            "invalid_rows": int(self._invalid_rows),
+            "missing_columns": [c for c in self.schema if c not in self._masks],
+        }
@@ -0,0 +1,237 @@
+# core/search.py
+"""
+Pencarian hyperparameter Random Forest (randomized search / successive halving) tanpa Streamlit.
+
+- Kandidat konfigurasi diambil acak dari SEARCH_SPACE (n_estimators, max_depth,
+  min_samples_leaf, max_features, class_weight).
+- Skor = akurasi pada data validasi yang dipisahkan dari bagian training split_data,
+  jadi data testing tetap tidak tersentuh untuk evaluasi akhir model terbaik.
+- Beberapa konfigurasi di-fit bersamaan di thread pool (satu core per fit; fit tree
+  melepas GIL), data diubah sekali ke array float32 yang dipakai bersama semua fit.
+- Successive halving: semua kandidat dimulai dengan sebagian kecil data training, hanya
+  1/factor kandidat terbaik yang lanjut ke ronde berikutnya dengan data factor kali lebih
+  banyak, sampai ronde terakhir memakai seluruh data training.
+- Batas waktu: fit yang belum mulai dilewati dan fit yang sedang berjalan dihentikan
+  (dicek per langkah warm_start) begitu batas waktu habis; hasil yang sudah ada tetap dipakai.
+"""
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterSampler, train_test_split
+
+from core.pipeline import DEFAULT_TEST_SIZE, RANDOM_STATE, TARGET_COL, _fit_trees, split_data
+
+# Ruang pencarian hyperparameter (kandidat diambil acak dari kombinasi nilai-nilai ini)
+SEARCH_SPACE = {
+    "n_estimators": [50, 100, 200, 300, 500],
+    "max_depth": [None, 5, 10, 20, 30],
+    "min_samples_leaf": [1, 2, 5, 10, 20],
+    "max_features": ["sqrt", "log2", 0.5, None],
+    "class_weight": ["balanced", "balanced_subsample", None],
+}
+
+# Strategi pencarian
+HALVING_SEARCH = "halving"  # successive halving: kandidat lemah dihentikan di ronde awal (data kecil)
+RANDOM_SEARCH = "random"    # randomized search: semua kandidat di-fit dengan seluruh data training
+SEARCH_STRATEGIES = (HALVING_SEARCH, RANDOM_SEARCH)
+
+DEFAULT_N_CANDIDATES = 27
+DEFAULT_TIME_BUDGET = 120  # detik
+DEFAULT_FACTOR = 3
+VALIDATION_SIZE = 0.2      # proporsi data training yang dipakai sebagai data validasi
+MIN_RESOURCE = 500         # jumlah sampel minimum per fit di ronde pertama successive halving
+
+LEADERBOARD_COLUMNS = [
+    "Kandidat", "Ronde", "Sampel", *SEARCH_SPACE, "Akurasi Validasi", "Fit Time (s)",
+]
+
+
+class _Stopped(Exception):
+    """Dilempar dari callback progres fit saat batas waktu habis atau job dibatalkan."""
+
+
+def sample_configs(n_candidates: int, random_state: int = RANDOM_STATE, space: dict = SEARCH_SPACE) -> list:
+    """Mengambil n_candidates konfigurasi acak (tanpa duplikat) dari ruang pencarian."""
+    n_candidates = min(n_candidates, math.prod(len(v) for v in space.values()))
+    # urutan kunci disamakan dengan space (ParameterSampler mengurutkannya per abjad)
+    return [{k: c[k] for k in space} for c in ParameterSampler(space, n_candidates, random_state=random_state)]
+
+
+def halving_schedule(n_candidates: int, n_samples: int, factor: int = DEFAULT_FACTOR,
+                     min_resource: int = MIN_RESOURCE) -> list:
+    """
+    Jadwal successive halving: list (jumlah kandidat, jumlah sampel) per ronde.
+    Ronde terakhir selalu memakai seluruh n_samples; jumlah ronde dibatasi supaya
+    ronde pertama tetap memakai minimal min_resource sampel (atau seluruh data jika lebih kecil).
+    """
+    n_rounds = 1 + int(math.log(max(n_candidates, 1), factor) + 1e-9)
+    while n_rounds > 1 and n_samples // factor ** (n_rounds - 1) < min_resource:
+        n_rounds -= 1
+    schedule = []
+    for i in range(n_rounds):
+        schedule.append((max(1, math.ceil(n_candidates / factor ** i)), n_samples // factor ** (n_rounds - 1 - i)))
+    return schedule
+
+
+# --- FIT & SKOR SATU KONFIGURASI ---
+def _fit_and_score(params, X_train, y_train, X_val, y_val, n_samples, random_state, stop):
+    # model dilatih pada n_samples baris pertama data training (urutan sudah acak dari split)
+    model = RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+
+    def on_progress(done, total):
+        if stop():
+            raise _Stopped()
+
+    start = time.perf_counter()
+    _fit_trees(model, X_train[:n_samples], y_train[:n_samples], params["n_estimators"], on_progress)
+    fit_time = time.perf_counter() - start
+    return accuracy_score(y_val, model.predict(X_val)), fit_time
+
+
+def _leaderboard(rows: list) -> pd.DataFrame:
+    # baris per (kandidat, ronde); nilai None ditampilkan sebagai teks supaya kolom bisa diurutkan
+    board = pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS)
+    board["max_depth"] = pd.array(board["max_depth"], dtype="Int64")
+    for col in ("max_features", "class_weight"):
+        board[col] = board[col].map(str)
+    return board.sort_values(["Sampel", "Akurasi Validasi", "Fit Time (s)"], ascending=[False, False, True],
+                             ignore_index=True)
+
+
+# --- PENCARIAN ---
+def search_hyperparameters(
+    df: pd.DataFrame,
+    features,
+    target: str = TARGET_COL,
+    strategy: str = HALVING_SEARCH,
+    n_candidates: int = DEFAULT_N_CANDIDATES,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    test_size: float = DEFAULT_TEST_SIZE,
+    random_state: int = RANDOM_STATE,
+    n_jobs: int = -1,
+    factor: int = DEFAULT_FACTOR,
+    should_stop=None,
+    on_progress=None,
+) -> dict:
+    """
+    Mencari hyperparameter Random Forest terbaik pada bagian training split_data(df, ...).
+    Parameter:
+    - strategy     : HALVING_SEARCH atau RANDOM_SEARCH
+    - n_candidates : jumlah konfigurasi acak dari SEARCH_SPACE
+    - time_budget  : batas waktu pencarian (detik); fit setelah batas waktu dihentikan
+    - test_size    : sama dengan training biasa, supaya data testing tidak ikut dipakai mencari
+    - n_jobs       : jumlah fit bersamaan (-1 = semua core)
+    - factor       : pengali data & pembagi jumlah kandidat tiap ronde successive halving
+    - should_stop  : (opsional) callback tanpa argumen, True jika pencarian harus berhenti (mis. dibatalkan)
+    - on_progress  : (opsional) callback on_progress(fits_selesai, total_fit, ronde, rows) setelah tiap fit
+    Mengembalikan dict:
+    - "leaderboard"  : DataFrame per (kandidat, ronde) dengan akurasi validasi & fit time
+    - "best_params"  : hyperparameter kandidat terbaik di ronde dengan data terbanyak
+    - "best_score"   : akurasi validasi kandidat terbaik
+    - "strategy", "rounds" (jumlah ronde dijalankan), "fits", "skipped" (fit yang dilewati karena
+      batas waktu), "elapsed" (detik), "budget_exhausted"
+    Melempar ValueError jika strategy tidak dikenal atau tidak ada fit yang selesai dalam batas waktu.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"strategy harus salah satu dari {SEARCH_STRATEGIES}, bukan {strategy!r}")
+    start = time.perf_counter()
+    deadline = start + time_budget
+
+    def stop():
+        return time.perf_counter() > deadline or (should_stop is not None and should_stop())
+
+    # data training split_data dibagi lagi menjadi training & validasi, lalu diubah sekali ke float32
+    # (tipe yang dipakai tree sklearn), sehingga fit tidak mengonversi ulang data yang sama
+    X_train, _, y_train, _ = split_data(df, features, target, test_size, random_state)
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=VALIDATION_SIZE, random_state=random_state, stratify=y_train
+    )
+    X_fit = np.ascontiguousarray(X_fit.to_numpy(dtype=np.float32))
+    X_val = np.ascontiguousarray(X_val.to_numpy(dtype=np.float32))
+    y_fit, y_val = y_fit.to_numpy(), y_val.to_numpy()
+
+    configs = sample_configs(n_candidates, random_state)
+    if strategy == HALVING_SEARCH:
+        schedule = halving_schedule(len(configs), len(X_fit), factor)
+    else:
+        schedule = [(len(configs), len(X_fit))]
+    total = sum(n for n, _ in schedule)
+
+    rows, done, skipped, rounds = [], 0, 0, 0
+    alive = list(range(len(configs)))
+    with ThreadPoolExecutor(max_workers=joblib.effective_n_jobs(n_jobs)) as pool:
+        for rnd, (n_keep, n_samples) in enumerate(schedule, start=1):
+            if stop():
+                break
+            alive = alive[:n_keep]
+            rounds = rnd
+
+            def run(i, n_samples=n_samples):
+                # fit yang belum mulai saat batas waktu habis langsung dilewati
+                if stop():
+                    return i, None
+                try:
+                    return i, _fit_and_score(configs[i], X_fit, y_fit, X_val, y_val, n_samples, random_state, stop)
+                except _Stopped:
+                    return i, None
+
+            if on_progress is not None:
+                on_progress(done, total, rnd, rows)
+            scores = {}
+            for future in as_completed([pool.submit(run, i) for i in alive]):
+                i, result = future.result()
+                done += 1
+                if result is None:
+                    skipped += 1
+                else:
+                    scores[i] = result[0]
+                    rows.append((i + 1, rnd, n_samples, *configs[i].values(), *result))
+                if on_progress is not None:
+                    on_progress(done, total, rnd, rows)
+            # kandidat yang lanjut diurutkan dari skor terbaik (yang tidak selesai tidak lanjut)
+            alive = sorted(scores, key=lambda i: -scores[i])
+            if len(alive) < n_keep:
+                break
+
+    if not rows:
+        raise ValueError("Tidak ada konfigurasi yang selesai di-fit dalam batas waktu pencarian")
+    board = _leaderboard(rows)
+    best = int(board.loc[0, "Kandidat"]) - 1
+    return {
+        "leaderboard": board,
+        "best_params": configs[best],
+        "best_score": float(board.loc[0, "Akurasi Validasi"]),
+        "strategy": strategy,
+        "rounds": rounds,
+        "fits": done - skipped,
+        "skipped": skipped + (total - done),
+        "elapsed": time.perf_counter() - start,
+        "budget_exhausted": time.perf_counter() > deadline,
+    }
+
+
+# --- JOB PENCARIAN LATAR BELAKANG ---
+def search_job(job, df: pd.DataFrame, features, target: str = TARGET_COL, **params) -> dict:
+    """
+    Fungsi job (lihat core.jobs) untuk search_hyperparameters di thread latar belakang.
+    Progres dilaporkan sebagai jumlah fit selesai (fits / total), ronde, dan akurasi terbaik sejauh ini;
+    pembatalan menghentikan fit yang sedang berjalan pada langkah warm_start berikutnya.
+    """
+    job.report(stage="search", fits=0, total=0, round=1, best_score=None)
+
+    def on_progress(done, total, rnd, rows):
+        best = max((row[-2] for row in rows if row[1] == rnd), default=None)
+        job.report(fits=done, total=total, round=rnd, best_score=best)
+        job.check_cancelled()
+
+    result = search_hyperparameters(
+        df, features, target, should_stop=lambda: job.cancel_requested, on_progress=on_progress, **params
+    )
+    job.check_cancelled()
+    return result
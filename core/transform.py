@@ -0,0 +1,192 @@
+# core/transform.py
+"""
+Transformer preprocessing yang di-fit sekali pada data training lalu dipakai ulang
+untuk data baru (batch tambahan, file scoring, atau input form prediksi).
+
+Yang disimpan saat fit:
+- urutan kolom fitur (dan nama kolom target)
+- vocabulary kategori untuk kolom teks/category (urutan = kode numerik)
+- dtype hasil encoding tiap kolom
+"""
+import numpy as np
+import pandas as pd
+
+from core.arrow_dtypes import arrow_numeric_values, arrow_to_categorical, is_arrow_string
+
+
+class Preprocessor:
+    """
+    Encoder kategori + penyelaras dtype yang bisa dipakai ulang.
+    Parameter:
+    - features : daftar kolom fitur (urutan ini dipakai sebagai urutan kolom input model)
+    - target   : nama kolom target
+    """
+
+    def __init__(self, features, target: str):
+        self.features = list(features)
+        self.target = target
+        self.categories = {}  # kolom -> list kategori
+        self.dtypes = {}      # kolom -> dtype hasil encoding (string, mis. "int8")
+
+    @property
+    def columns(self):
+        """Kolom fitur + target sesuai urutan fit."""
+        return self.features + [self.target]
+
+    # --- FIT ---
+    def fit(self, df: pd.DataFrame, mask=None):
+        """
+        Mempelajari vocabulary kategori & dtype dari data training yang sudah bersih
+        (tanpa duplikat & missing value). Kategori diurutkan seperti astype("category").
+        mask (opsional) adalah array bool baris yang dipakai, sehingga pemanggil tidak perlu
+        membuat DataFrame hasil filter terlebih dahulu.
+        """
+        self.categories = {}
+        for col in self.columns:
+            s = _as_categorical_if_arrow_string(df[col])
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                # hanya kategori yang benar-benar muncul (setara remove_unused_categories)
+                codes = _take(s.cat.codes.to_numpy(), mask)
+                used = np.unique(codes[codes >= 0])
+                self.categories[col] = s.cat.categories[used].tolist()
+            elif s.dtype == "object":
+                # missing value tidak termasuk kategori (NaN tidak bisa diurutkan bersama string)
+                values = _take(s.to_numpy(), mask)
+                self.categories[col] = sorted(pd.unique(values[pd.notna(values)]).tolist())
+
+        self.dtypes = {}
+        for col in self.columns:
+            if col in self.categories:
+                self.dtypes[col] = str(codes_dtype(len(self.categories[col])))
+            else:
+                self.dtypes[col] = str(_numpy_dtype(df[col].dtype))
+        return self
+
+    def extend(self, df: pd.DataFrame):
+        """
+        Mengembalikan Preprocessor baru dengan kategori yang belum dikenal dari df
+        ditambahkan di akhir vocabulary, sehingga kode kategori lama tidak berubah.
+        """
+        new = Preprocessor(self.features, self.target)
+        new.categories = {}
+        for col, cats in self.categories.items():
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col].dtype):
+                unseen = set(df[col].dropna().astype("object").unique()) - set(cats)
+                cats = cats + sorted(unseen)
+            new.categories[col] = list(cats)
+        new.dtypes = dict(self.dtypes)
+        for col, cats in new.categories.items():
+            new.dtypes[col] = str(codes_dtype(len(cats)))
+        return new
+
+    # --- TRANSFORM ---
+    def transform(
+        self, df: pd.DataFrame, include_target: bool = False, mask=None, unknown_as_nan: bool = False
+    ) -> pd.DataFrame:
+        """
+        Menerapkan encoding hasil fit ke frame baru dalam satu langkah vektor per kolom.
+        - kolom kategori di-encode dengan vocabulary hasil fit (kategori tak dikenal / kosong -> -1,
+          atau NaN jika unknown_as_nan=True supaya baris tsb terlihat tidak lengkap saat scoring);
+          jika kolom kategori sudah berupa angka, nilainya dianggap sudah berupa kode
+        - kolom numerik disamakan dtype-nya dengan data training jika nilainya muat
+        - mask (opsional): array bool baris yang diambil; filter & encoding dilakukan sekaligus
+          per kolom sehingga hanya frame hasil akhir yang dibuat
+        Mengembalikan DataFrame dengan urutan kolom = features (+ target jika include_target).
+        """
+        columns = self.columns if include_target else self.features
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise KeyError(f"Kolom berikut tidak ditemukan: {missing}")
+
+        out = {}
+        for col in columns:
+            s = df[col]
+            if col in self.categories:
+                s = _as_categorical_if_arrow_string(s)
+            if col in self.categories and isinstance(s.dtype, pd.CategoricalDtype):
+                # kode category input dipetakan langsung ke kode vocabulary (tanpa konversi ke object)
+                cats = self.categories[col]
+                # -1 ditambahkan di akhir mapping, sehingga kode -1 (kosong) terpetakan ke -1 juga
+                # (tetap aman jika kolom seluruhnya kosong dan tidak punya kategori sama sekali)
+                mapping = np.append(pd.Index(cats).get_indexer(s.cat.categories), -1)
+                codes = _take(s.cat.codes.to_numpy(), mask)
+                out[col] = _unknown_codes(mapping[codes].astype(codes_dtype(len(cats))), unknown_as_nan)
+            elif col in self.categories and not pd.api.types.is_numeric_dtype(s.dtype):
+                values = _take(s.to_numpy(), mask)
+                out[col] = _unknown_codes(pd.Categorical(values, categories=self.categories[col]).codes, unknown_as_nan)
+            else:
+                out[col] = _safe_cast(_values(s, mask), self.dtypes.get(col))
+        index = df.index if mask is None else df.index[mask]
+        return pd.DataFrame(out, index=index, copy=False)
+
+    def fit_transform(self, df: pd.DataFrame, include_target: bool = True) -> pd.DataFrame:
+        """fit lalu transform pada data yang sama."""
+        return self.fit(df).transform(df, include_target=include_target)
+
+    # --- PERSISTENSI ---
+    def to_dict(self) -> dict:
+        """Representasi dict (bisa disimpan sebagai JSON)."""
+        return {
+            "features": self.features,
+            "target": self.target,
+            "categories": self.categories,
+            "dtypes": self.dtypes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Membuat Preprocessor dari hasil to_dict()."""
+        pre = cls(data["features"], data["target"])
+        pre.categories = {k: list(v) for k, v in data["categories"].items()}
+        pre.dtypes = dict(data["dtypes"])
+        return pre
+
+
+def codes_dtype(n_categories: int):
+    """dtype kode kategori untuk n kategori, sama seperti yang dipakai pandas (.cat.codes)."""
+    return pd.Categorical([], categories=range(n_categories)).codes.dtype
+
+
+def _as_categorical_if_arrow_string(s: pd.Series) -> pd.Series:
+    # kolom string[pyarrow] diperlakukan seperti category (dictionary_encode Arrow, tanpa objek str)
+    return arrow_to_categorical(s) if is_arrow_string(s.dtype) else s
+
+
+def _unknown_codes(codes: np.ndarray, as_nan: bool) -> np.ndarray:
+    # kode -1 (kategori tak dikenal / kosong) menjadi NaN jika diminta; tanpa -1 dtype kode tetap
+    if as_nan and (codes < 0).any():
+        return np.where(codes >= 0, codes, np.nan)
+    return codes
+
+
+def _numpy_dtype(dtype):
+    # dtype numpy hasil encoding; kolom numerik Arrow (mis. int64[pyarrow]) menjadi dtype numpy-nya
+    return dtype.numpy_dtype if isinstance(dtype, pd.ArrowDtype) else dtype
+
+
+def _values(s: pd.Series, mask) -> np.ndarray:
+    # nilai kolom numerik sebagai numpy; kolom Arrow diambil langsung dari buffer Arrow-nya
+    if isinstance(s.dtype, pd.ArrowDtype):
+        return arrow_numeric_values(s, mask)
+    return _take(s.to_numpy(), mask)
+
+
+def _take(values: np.ndarray, mask):
+    # ambil baris sesuai mask (tanpa salinan jika mask None)
+    return values if mask is None else values[mask]
+
+
+def _safe_cast(values: np.ndarray, dtype):
+    # samakan dtype dengan data training hanya jika aman (tanpa overflow / kehilangan NaN)
+    if dtype is None or str(values.dtype) == dtype:
+        return values
+    target = np.dtype(dtype)
+    if not np.issubdtype(values.dtype, np.number):
+        return values
+    if np.issubdtype(target, np.integer) and len(values):
+        if np.issubdtype(values.dtype, np.floating) and np.isnan(values).any():
+            return values
+        info = np.iinfo(target)
+        if values.min() < info.min or values.max() > info.max or not (values == np.round(values)).all():
+            return values
+    return values.astype(target)
@@ -1,4 +1,7 @@
 # helpers.py
+import os
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -9,9 +12,59 @@ from matplotlib.backends.backend_pdf import PdfPages
 
 from sklearn.metrics import confusion_matrix  # (opsional) untuk tipe/utility confusion matrix jika dibutuhkan
 
-# --- KONSTANTA TARGET ---
-# Nama kolom target (label) di dataset untuk serangan jantung
-TARGET_COL = "heart_attack"
+from core.append import AppendState
+from core.cache import SizedLRUCache, frame_fingerprint
+from core.jobs import DONE, PENDING, forget_job, get_job
+# TARGET_COL (nama kolom target) & score_batch di-re-export untuk halaman-halaman aplikasi
+from core.pipeline import TARGET_COL, preprocess_frame, score_batch  # noqa: F401
+from core.pipeline import RANDOM_STATE, model_nbytes, train_job
+from core.profiling import get_profile, null_counts
+from core.sampling import stratified_sample
+from core.scheduler import TRAIN_SCHEDULER
+from core.schema import get_validation
+from core.search import search_job
+from state import cancel_search_job, cancel_train_job, publish_raw_dataset
+
+# --- CACHE HASIL PREPROCESSING ---
+# Hasil preprocess_data (clean_df + info) dipakai bersama oleh semua session di server.
+# Kunci = (fingerprint dataset mentah, daftar fitur, kolom target), dibatasi total ukuran memori (LRU).
+# Batas bisa diatur lewat environment variable PREPROCESS_CACHE_MB (default 512 MB, 0 = nonaktif).
+PREPROCESS_CACHE_MAX_BYTES = int(os.environ.get("PREPROCESS_CACHE_MB", 512)) * 1024 * 1024
+PREPROCESS_CACHE = SizedLRUCache(PREPROCESS_CACHE_MAX_BYTES)
+
+# Peak memori per tahap preprocessing (tracemalloc) hanya diukur jika PREPROCESS_TRACE_MEMORY=1,
+# karena tracemalloc memperlambat preprocessing selama aktif.
+PREPROCESS_TRACE_MEMORY = os.environ.get("PREPROCESS_TRACE_MEMORY", "0") == "1"
+
+# --- CACHE MODEL HASIL TRAINING ---
+# Model + metrik evaluasi dipakai bersama oleh semua session di server.
+# Kunci = ((fingerprint isi data training, daftar fitur, target, test_size, random_state,
+#           hyperparameter lain), n_estimators),
+# dibatasi total ukuran tree (LRU). Batas diatur lewat MODEL_CACHE_MB (default 512 MB, 0 = nonaktif).
+MODEL_CACHE_MAX_BYTES = int(os.environ.get("MODEL_CACHE_MB", 512)) * 1024 * 1024
+MODEL_CACHE = SizedLRUCache(MODEL_CACHE_MAX_BYTES)
+
+
+# --- HELPER: JOB INGEST LATAR BELAKANG ---
+def collect_ingest_job():
+    """
+    Mengecek job pembacaan dataset (ingest) latar belakang milik session ini.
+    Jika job sudah selesai, hasilnya langsung disimpan ke session_state sebagai raw_df.
+    Mengembalikan job yang masih berjalan / gagal / dibatalkan, atau None.
+    """
+    job_info = st.session_state.get("ingest_job")
+    if job_info is None:
+        return None
+
+    job_id, upload_key = job_info
+    job = get_job(job_id)
+    if job is not None and job.status == DONE:
+        publish_raw_dataset(job.result, upload_key)
+        forget_job(job_id)
+        job = None
+    if job is None:
+        st.session_state["ingest_job"] = None
+    return job
 
 
 # --- HELPER: CEK DATA RAW ---
@@ -20,6 +73,10 @@ def require_raw_data():
     Mengecek apakah dataset mentah (raw_df) sudah ada di session_state.
     Jika belum ada, tampilkan peringatan dan hentikan eksekusi halaman.
     """
+    job = collect_ingest_job()  # ambil hasil upload latar belakang jika sudah selesai
+    if st.session_state.get("raw_df") is None and job is not None and not job.finished:
+        st.info("⏳ Dataset sedang dibaca di latar belakang. Pantau progresnya di menu **Upload Dataset**.")
+        st.stop()
     if st.session_state.get("raw_df") is None:
         st.warning("⚠️ Silakan upload dataset terlebih dahulu di menu **Upload Dataset**.")
         st.info("📌 Gunakan menu sidebar di kiri untuk mengakses fitur aplikasi secara berurutan.")
@@ -44,28 +101,127 @@ def require_model():
     Mengecek apakah model Random Forest sudah dilatih dan disimpan di session_state.
     Jika belum, user diarahkan untuk melakukan training di menu Analisis Data.
     """
+    job_info = st.session_state.get("train_job")
+    job = get_job(job_info[0]) if job_info is not None else None
+    if st.session_state.get("rf_model") is None and job is not None and not job.finished:
+        st.info("⏳ Model sedang dilatih di latar belakang. Pantau progresnya di menu **Analisis Data**.")
+        st.stop()
     if st.session_state.get("rf_model") is None:
         st.warning("⚠️ Model belum dilatih. Silakan lakukan training di menu **Analisis Data**.")
         st.info("📌 Gunakan menu sidebar di kiri untuk mengakses fitur aplikasi secara berurutan.")
         st.stop()
 
 
+# --- HELPER: PROFIL DATA RAW ---
+def get_raw_profile():
+    """
+    Mengambil profil kolom dataset mentah (raw_df) untuk versi dataset saat ini.
+    Profil dihitung sekali per fingerprint dataset lalu diambil dari cache pada rerun berikutnya.
+    """
+    return get_profile(st.session_state["raw_df"], st.session_state.get("raw_fingerprint"))
+
+
+# --- HELPER: VALIDASI SKEMA DATA RAW ---
+def get_raw_validation():
+    """
+    Mengambil hasil validasi skema (rentang & pilihan nilai) dataset mentah untuk versi dataset saat ini.
+    Validasi dijalankan sekali per fingerprint dataset lalu diambil dari cache pada rerun berikutnya.
+    """
+    return get_validation(st.session_state["raw_df"], st.session_state.get("raw_fingerprint"))
+
+
+# --- HELPER: TAMPILKAN HASIL VALIDASI SKEMA ---
+def show_validation(report: dict, df: pd.DataFrame):
+    """
+    Menampilkan ringkasan validasi skema: jumlah baris yang melanggar, tabel pelanggaran
+    per kolom, dan contoh baris yang melanggar (maks. 100 baris).
+    """
+    if report["missing_columns"]:
+        st.caption(f"ℹ️ Kolom skema yang tidak ada di data (tidak divalidasi): {report['missing_columns']}")
+    if not report["invalid_rows"]:
+        st.success(f"✅ Semua {report['rows']:,} baris sesuai skema (rentang & pilihan nilai).")
+        return
+
+    st.warning(
+        f"⚠️ {report['invalid_rows']:,} dari {report['rows']:,} baris memiliki nilai di luar "
+        "rentang / pilihan yang valid."
+    )
+    columns = report["columns"]
+    st.dataframe(columns[columns["Pelanggaran"] > 0], use_container_width=True, hide_index=True)
+    st.markdown("**Contoh baris yang melanggar (maks. 100 baris):**")
+    st.dataframe(df.iloc[np.flatnonzero(report["invalid"])[:100]], use_container_width=True)
+
+
+# --- HELPER: SUMBER DUCKDB AKTIF ---
+def get_active_duckdb_source():
+    """
+    Mengembalikan sumber DuckDB jika raw_df saat ini adalah hasil query DuckDB
+    (dipakai halaman visualisasi untuk menghitung agregat langsung di DuckDB), selain itu None.
+    """
+    cached = st.session_state.get("duckdb_source")
+    if cached is None:
+        return None
+    source = cached[1]
+    if source.fingerprint is None or source.fingerprint != st.session_state.get("raw_fingerprint"):
+        return None
+    return source
+
+
+# --- HELPER: DATA UNTUK EKSPLORASI (MODE SAMPEL) ---
+def get_explore_df():
+    """
+    Mengembalikan data bersih untuk halaman interaktif (visualisasi & analisis).
+    Jika mode sampel aktif (sample_frac di-set saat upload), yang dikembalikan adalah
+    sampel berstrata berdasarkan TARGET_COL; sampel dihitung sekali per versi data.
+    """
+    clean_df = st.session_state["clean_df"]
+    frac = st.session_state.get("sample_frac")
+    if not frac:
+        return clean_df
+
+    key = (st.session_state.get("raw_fingerprint"), len(clean_df), frac)
+    cached = st.session_state.get("clean_sample")
+    if cached is None or cached[0] != key:
+        cached = (key, stratified_sample(clean_df, TARGET_COL, frac))
+        st.session_state["clean_sample"] = cached
+    return cached[1]
+
+
+# --- HELPER: BADGE MODE DATA ---
+def show_data_mode(explore_df: pd.DataFrame):
+    """
+    Menampilkan info mode data yang sedang aktif (sampel atau data penuh).
+    """
+    frac = st.session_state.get("sample_frac")
+    if frac:
+        st.info(
+            f"🎲 **Mode sampel aktif** — {frac*100:.0f}% data "
+            f"({explore_df.shape[0]:,} dari {st.session_state['clean_df'].shape[0]:,} baris, "
+            f"stratified berdasarkan `{TARGET_COL}`)."
+        )
+    else:
+        st.caption(f"📦 Mode data penuh — {explore_df.shape[0]:,} baris.")
+
+
 # --- HELPER: PREPROCESSING DATA ---
-def preprocess_data(df: pd.DataFrame):
+def preprocess_data(df: pd.DataFrame, profile: dict = None, fingerprint: str = None):
     """
     Melakukan preprocessing data:
     - Memastikan semua kolom fitur + target tersedia
     - Mengambil hanya kolom yang dibutuhkan
     - Menghapus baris duplikat
     - Menghapus baris dengan nilai missing
-    - Mengonversi kolom bertipe object menjadi kode kategori (numerik)
+    - Mengonversi kolom bertipe object/category menjadi kode kategori (numerik)
+    Parameter:
+    - df      : dataset mentah
+    - profile : (opsional) profil dari get_raw_profile(); jika ada, jumlah baris dan
+                missing per kolom diambil dari profil tanpa memindai ulang dataset
+    - fingerprint : (opsional) fingerprint dataset; jika ada, hash baris untuk deteksi
+                    duplikat diambil dari cache (dihitung sekali per versi dataset)
     Mengembalikan:
     - df yang sudah bersih
     - info ringkasan proses preprocessing (dict)
     """
-    df = df.copy()  # buat salinan agar tidak mengubah dataframe asli
-
-    # daftar kolom yang wajib ada (fitur + target)
     all_cols = st.session_state["features"] + [TARGET_COL]
 
     # cek apakah ada kolom yang hilang
@@ -74,35 +230,331 @@ def preprocess_data(df: pd.DataFrame):
         st.error(f"❌ Kolom berikut tidak ditemukan di dataset: {missing}")
         st.stop()
 
-    # ambil hanya kolom yang dibutuhkan
-    df = df[all_cols]
-
-    # simpan informasi awal sebelum dibersihkan
-    rows_before = df.shape[0]          # jumlah baris sebelum preprocessing
-    dup_count = df.duplicated().sum()  # jumlah baris duplikat
-    missing_before = df.isna().sum()   # jumlah missing per kolom
-
-    # hapus baris duplikat
-    df = df.drop_duplicates()
-    # hapus baris yang mengandung missing values
-    df = df.dropna()
-
-    # konversi kolom bertipe object -> kode kategori (numerik)
-    for col in df.columns:
-        if df[col].dtype == "object":
-            df[col] = df[col].astype("category").cat.codes
-
-    # ringkasan info preprocessing untuk ditampilkan di UI
-    info = {
-        "rows_before": int(rows_before),                 # baris sebelum preprocessing
-        "rows_after": int(df.shape[0]),                  # baris setelah preprocessing
-        "cols": int(df.shape[1]),                        # jumlah kolom aktif
-        "duplicates_removed": int(dup_count),            # jumlah duplikat yang dihapus
-        "missing_values_before": missing_before.to_dict(),  # missing value per kolom (sebelum)
-        "missing_total_after": int(df.isna().sum().sum()),  # total missing setelah preprocessing (harusnya 0)
-    }
-
-    return df, info
+    # jumlah missing per kolom diambil dari profil jika ada; hash baris dari cache (per fingerprint)
+    missing_before = null_counts(profile, all_cols) if profile is not None else None
+    # satu mask keep (duplikat + missing) lalu filter & encoding sekaligus, tanpa salinan perantara
+    return preprocess_frame(
+        df,
+        st.session_state["features"],
+        TARGET_COL,
+        missing_before=missing_before,
+        fingerprint=fingerprint,
+        trace_memory=PREPROCESS_TRACE_MEMORY,
+    )
+
+
+# --- HELPER: PREPROCESSING DENGAN CACHE ---
+def preprocess_data_cached(df: pd.DataFrame, fingerprint: str = None, profile: dict = None):
+    """
+    Sama seperti preprocess_data, tetapi hasilnya diambil dari PREPROCESS_CACHE jika dataset
+    (fingerprint) dan daftar fitur yang sama sudah pernah diproses, di session mana pun.
+    Hasil dari cache dipakai bersama, jadi clean_df & info TIDAK boleh dimodifikasi in-place.
+    Pada cache hit, info["stage_timings"] adalah hasil pengukuran run awal (mungkin di session lain):
+    info yang dikembalikan berupa salinan dangkal dengan "timings_cached" = True dan
+    "cache_lookup_s" (waktu mengambil hasil dari cache pada run ini).
+    Jika fingerprint None, preprocessing selalu dijalankan tanpa cache.
+    """
+    if fingerprint is None:
+        return preprocess_data(df, profile=profile)
+
+    key = (fingerprint, tuple(st.session_state["features"]), TARGET_COL)
+    start = time.perf_counter()
+    cached = PREPROCESS_CACHE.get(key)
+    if cached is None:
+        cached = preprocess_data(df, profile=profile, fingerprint=fingerprint)
+        PREPROCESS_CACHE.put(key, cached)
+        return cached
+    clean_df, info = cached
+    return clean_df, {**info, "timings_cached": True, "cache_lookup_s": time.perf_counter() - start}
+
+
+# --- HELPER: FINGERPRINT DATA TRAINING ---
+def get_train_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint isi data training (clean_df atau sampelnya). Dihitung sekali per objek DataFrame
+    di session ini, sehingga klik training berikutnya pada data yang sama tidak meng-hash ulang.
+    """
+    cached = st.session_state.get("train_fingerprint")
+    if cached is None or cached[0] is not df:
+        cached = (df, frame_fingerprint(df))
+        st.session_state["train_fingerprint"] = cached
+    return cached[1]
+
+
+# --- HELPER: TRAINING DENGAN CACHE (JOB LATAR BELAKANG) ---
+# Asal model hasil training
+TRAIN_FROM_CACHE = "cache"  # model yang sama persis diambil dari MODEL_CACHE
+TRAIN_SLICED = "slice"      # tree dari forest yang lebih besar dipotong (tanpa fit)
+TRAIN_GROWN = "grow"        # hanya tree tambahan yang di-fit (warm_start)
+TRAIN_FULL = "train"        # training dari awal
+
+# Notifikasi saat model dipublikasikan ke session
+TRAIN_MESSAGES = {
+    TRAIN_FROM_CACHE: "⚡ Model dengan data & pengaturan yang sama diambil dari cache (tanpa training ulang)",
+    TRAIN_SLICED: "✂️ Jumlah tree dikurangi dari forest yang sudah ada (tanpa training ulang)",
+    TRAIN_GROWN: "🌱 Hanya tree tambahan yang dilatih, tree sebelumnya dipakai ulang",
+    TRAIN_FULL: "✅ Training model selesai!",
+}
+
+
+def _nearest_forest(base_key, n_estimators):
+    # forest lain dengan data, fitur, dan split yang sama (di MODEL_CACHE atau model session ini):
+    # utamakan forest terkecil yang >= n_estimators (cukup dipotong), jika tidak ada yang terbesar
+    candidates = {key[1]: key for key in MODEL_CACHE.keys() if key[0] == base_key}
+    session_key = st.session_state.get("rf_train_key")
+    session_model = st.session_state.get("rf_model")
+    if session_model is not None and session_key is not None and session_key[0] == base_key:
+        candidates.setdefault(session_key[1], session_key)
+    if not candidates:
+        return None
+
+    larger = [n for n in candidates if n >= n_estimators]
+    n = min(larger) if larger else max(candidates)
+    if candidates[n] == session_key:
+        return session_model
+    entry = MODEL_CACHE.get(candidates[n])
+    return entry["model"] if entry is not None else None
+
+
+def _publish_model(entry: dict, preprocessor, key):
+    # simpan model + metrik ke session_state supaya dipakai halaman evaluasi, visualisasi & prediksi
+    st.session_state["rf_model"] = entry["model"]
+    st.session_state["acc"] = entry["accuracy"]
+    st.session_state["cm"] = entry["confusion_matrix"]
+    st.session_state["report"] = entry["report"]
+    st.session_state["X_cols"] = entry["features"]
+    st.session_state["rf_train_key"] = key
+    # encoder yang dipakai untuk data training model ini (dipakai ulang saat scoring)
+    st.session_state["rf_preprocessor"] = preprocessor
+
+
+def submit_training(
+    df: pd.DataFrame,
+    n_estimators: int,
+    test_size: float,
+    random_state: int = RANDOM_STATE,
+    model_params: dict = None,
+):
+    """
+    Meminta model Random Forest untuk data training df dengan hyperparameter tertentu
+    (model_params = hyperparameter selain n_estimators, mis. hasil pencarian hyperparameter).
+    - Jika data (isi yang sama), fitur, dan hyperparameter yang sama sudah ada di MODEL_CACHE
+      (dari session mana pun), model langsung dipublikasikan ke session_state.
+    - Jika belum, training + evaluasi diantrekan sebagai job latar belakang (core.pipeline.train_job)
+      di TRAIN_SCHEDULER yang dipakai bersama semua session;
+      forest yang hanya berbeda n_estimators dipakai ulang (dipotong / ditambah tree-nya saja).
+      Hasilnya dipublikasikan oleh collect_train_job setelah job selesai.
+    Job training lama milik session ini dibatalkan. Mengembalikan asal model (TRAIN_*).
+    """
+    cancel_train_job()
+    features = st.session_state["features"]
+    preprocessor = st.session_state["preprocess_info"]["preprocessor"]
+    # kunci = (data + fitur + split + hyperparameter lain, jumlah tree); model dengan base_key sama bisa di-resize
+    params_key = tuple(sorted((model_params or {}).items()))
+    base_key = (get_train_fingerprint(df), tuple(features), TARGET_COL, test_size, random_state, params_key)
+    key = (base_key, n_estimators)
+    cached = MODEL_CACHE.get(key)
+    if cached is not None:
+        _publish_model(cached, preprocessor, key)
+        st.toast(TRAIN_MESSAGES[TRAIN_FROM_CACHE])
+        return TRAIN_FROM_CACHE
+
+    source = _nearest_forest(base_key, n_estimators)
+    if source is None:
+        how = TRAIN_FULL
+    else:
+        how = TRAIN_SLICED if len(source.estimators_) >= n_estimators else TRAIN_GROWN
+    # diantrekan di scheduler bersama (jumlah training bersamaan & thread per training dibatasi)
+    job = TRAIN_SCHEDULER.submit(
+        st.session_state["session_id"],
+        train_job,
+        df,
+        features,
+        TARGET_COL,
+        n_estimators=n_estimators,
+        test_size=test_size,
+        random_state=random_state,
+        source_model=source,
+        n_jobs=TRAIN_SCHEDULER.threads_per_job,
+        model_params=model_params,
+    )
+    st.session_state["train_job"] = (job.id, key, how, preprocessor)
+    return how
+
+
+def collect_train_job():
+    """
+    Mengecek job training latar belakang milik session ini.
+    Jika job sudah selesai, model + metrik disimpan ke MODEL_CACHE dan dipublikasikan ke session_state.
+    Mengembalikan job yang masih berjalan / gagal / dibatalkan, atau None.
+    """
+    job_info = st.session_state.get("train_job")
+    if job_info is None:
+        return None
+
+    job_id, key, how, preprocessor = job_info
+    job = get_job(job_id)
+    if job is not None and job.status == DONE:
+        entry = job.result
+        MODEL_CACHE.put(key, entry, nbytes=model_nbytes(entry["model"]))
+        _publish_model(entry, preprocessor, key)
+        st.toast(TRAIN_MESSAGES[how])
+        forget_job(job_id)
+        job = None
+    if job is None:
+        st.session_state["train_job"] = None
+    return job
+
+
+def _show_queue_status(job, what: str):
+    # job masih antre di scheduler: tampilkan posisi antrean & jumlah training yang sedang berjalan
+    position = TRAIN_SCHEDULER.position(job.id)
+    stats = TRAIN_SCHEDULER.stats()
+    st.progress(0.0, text=f"⏳ Menunggu giliran {what}... antrean ke-{position or 1}")
+    st.caption(
+        f"🧮 {stats['running']} / {stats['max_workers']} training sedang berjalan di server, "
+        f"{stats['queued']} antre • {stats['threads_per_job']} thread per training"
+    )
+
+
+# Panel progres job training latar belakang, diperbarui sendiri tiap 1 detik
+# (hanya fragment ini yang di-rerun, halaman lain tetap bisa dipakai selama training)
+@st.fragment(run_every=1)
+def show_training_progress(job_id, with_cancel: bool = True):
+    """
+    Menampilkan posisi antrean (jika job masih menunggu di scheduler) atau progres job training
+    (jumlah tree selesai dari n_estimators), beserta tombol batal.
+    Setelah job selesai, seluruh app di-rerun supaya hasilnya dipublikasikan (collect_train_job).
+    """
+    job = get_job(job_id)
+    if job is None or job.finished:
+        st.rerun()
+
+    if job.status == PENDING:
+        _show_queue_status(job, "training")
+        if with_cancel and st.button("⏹️ Batalkan Training", key="cancel_training"):
+            job.cancel()
+        return
+
+    progress = job.progress
+    trees = progress.get("trees", 0)
+    n_estimators = progress.get("n_estimators") or 1
+    if progress.get("stage") == "evaluasi":
+        text = f"📊 Evaluasi model ({n_estimators:,} tree)..."
+    else:
+        text = f"🌳 Melatih model di latar belakang... {trees:,} / {n_estimators:,} tree"
+    st.progress(min(trees / n_estimators, 1.0), text=text)
+    st.caption(f"⏱️ {job.elapsed:.1f} detik")
+    if with_cancel and st.button("⏹️ Batalkan Training", key="cancel_training"):
+        job.cancel()
+
+
+# --- HELPER: PENCARIAN HYPERPARAMETER (JOB LATAR BELAKANG) ---
+def submit_search(df: pd.DataFrame, test_size: float, random_state: int = RANDOM_STATE, **params):
+    """
+    Mengantrekan pencarian hyperparameter (core.search.search_job) untuk data training df di
+    TRAIN_SCHEDULER, dengan split yang sama seperti training biasa (test_size, random_state).
+    params diteruskan ke search_hyperparameters (strategy, n_candidates, time_budget).
+    Job pencarian lama milik session ini dibatalkan; hasilnya dipublikasikan oleh collect_search_job.
+    """
+    cancel_search_job()
+    features = st.session_state["features"]
+    job = TRAIN_SCHEDULER.submit(
+        st.session_state["session_id"],
+        search_job,
+        df,
+        features,
+        TARGET_COL,
+        test_size=test_size,
+        random_state=random_state,
+        n_jobs=TRAIN_SCHEDULER.threads_per_job,
+        **params,
+    )
+    # df & split disimpan supaya konfigurasi terbaik dilatih pada data yang sama (submit_training)
+    st.session_state["search_job"] = (job.id, df, test_size, random_state, params.get("time_budget"))
+    return job
+
+
+def collect_search_job():
+    """
+    Mengecek job pencarian hyperparameter milik session ini.
+    Jika sudah selesai, hasilnya (leaderboard + konfigurasi terbaik + data & split yang dipakai)
+    disimpan ke session_state["search_result"].
+    Mengembalikan job yang masih berjalan / gagal / dibatalkan, atau None.
+    """
+    job_info = st.session_state.get("search_job")
+    if job_info is None:
+        return None
+
+    job_id, df, test_size, random_state, _ = job_info
+    job = get_job(job_id)
+    if job is not None and job.status == DONE:
+        st.session_state["search_result"] = {
+            **job.result, "df": df, "test_size": test_size, "random_state": random_state,
+        }
+        st.toast(f"🔬 Pencarian selesai: {job.result['fits']} fit dalam {job.result['elapsed']:.0f} detik")
+        forget_job(job_id)
+        job = None
+    if job is None:
+        st.session_state["search_job"] = None
+    return job
+
+
+# Panel progres pencarian hyperparameter, diperbarui sendiri tiap 1 detik
+@st.fragment(run_every=1)
+def show_search_progress(job_id, time_budget: float = None):
+    """
+    Menampilkan posisi antrean atau progres pencarian (fit selesai dari total rencana, ronde,
+    akurasi validasi terbaik sejauh ini, sisa waktu), beserta tombol batal.
+    Setelah job selesai, seluruh app di-rerun supaya hasilnya dipublikasikan (collect_search_job).
+    """
+    job = get_job(job_id)
+    if job is None or job.finished:
+        st.rerun()
+
+    if job.status == PENDING:
+        _show_queue_status(job, "pencarian")
+    else:
+        progress = job.progress
+        fits, total = progress.get("fits", 0), progress.get("total") or 1
+        best = progress.get("best_score")
+        text = f"🔬 Mencari hyperparameter... ronde {progress.get('round', 1)} • {fits} / {total} fit"
+        if best is not None:
+            text += f" • akurasi validasi terbaik {best * 100:.2f}%"
+        st.progress(min(fits / total, 1.0), text=text)
+        caption = f"⏱️ {job.elapsed:.1f} detik"
+        if time_budget:
+            caption += f" dari batas {time_budget:.0f} detik"
+        st.caption(caption)
+    if st.button("⏹️ Batalkan Pencarian", key="cancel_search"):
+        job.cancel()
+
+
+# --- HELPER: APPEND BATCH DATA BARU ---
+def append_batch(batch: pd.DataFrame, batch_fingerprint: str):
+    """
+    Menambahkan batch data baru ke dataset mentah session (dan ke data bersih jika preprocessing
+    sudah dijalankan) lewat core.append.AppendState yang disimpan di session_state.
+    Hanya baris batch yang diproses: profil & hasil validasi versi dataset baru disimpan ke cache
+    oleh AppendState, hasil preprocessing-nya ke PREPROCESS_CACHE, sehingga rerun halaman tidak
+    memproses ulang seluruh data.
+    Parameter:
+    - batch             : data mentah batch baru
+    - batch_fingerprint : fingerprint isi batch (untuk fingerprint versi dataset baru)
+    Mengembalikan core.append.AppendResult (raw_df, fingerprint, clean_df, info).
+    """
+    features = st.session_state["features"]
+    state = st.session_state.get("append_state")
+    if state is None or not state.matches(st.session_state["raw_fingerprint"], features):
+        state = AppendState(st.session_state["raw_df"], st.session_state["raw_fingerprint"], features, TARGET_COL)
+        st.session_state["append_state"] = state
+
+    result = state.append(
+        batch, batch_fingerprint, st.session_state.get("clean_df"), st.session_state.get("preprocess_info")
+    )
+    if result.clean_df is not None:
+        PREPROCESS_CACHE.put((result.fingerprint, tuple(features), TARGET_COL), (result.clean_df, result.info))
+    return result
 
 
 # --- HELPER: CONFUSION MATRIX PLOT ---
@@ -1,18 +1,108 @@
 # pages/analysis.py
 import streamlit as st
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from core.jobs import CANCELLED, FAILED
+from core.search import DEFAULT_N_CANDIDATES, DEFAULT_TIME_BUDGET, HALVING_SEARCH, RANDOM_SEARCH
 from helpers import (
+    cancel_search_job,
+    cancel_train_job,
+    collect_search_job,
+    collect_train_job,
+    show_search_progress,
+    show_training_progress,
+    submit_search,  # pencarian hyperparameter (successive halving / randomized search) di latar belakang
+    submit_training,  # training & evaluasi Random Forest di latar belakang, hasil di-cache per data + hyperparameter
     require_clean_data,
+    get_explore_df,
+    show_data_mode,
     plot_confusion_matrix,
     plot_feature_importance,
-    TARGET_COL,
 )
 
 
+# Status job training: progres jika masih berjalan, pesan + tombol tutup jika gagal/dibatalkan
+def _show_training_status(job):
+    if job.status in (FAILED, CANCELLED):
+        if job.status == FAILED:
+            error = job.error
+            st.error(f"❌ Training gagal: {error.args[0] if isinstance(error, KeyError) and error.args else error}")
+        else:
+            st.warning("⏹️ Training dibatalkan.")
+        if st.button("Tutup", key="dismiss_training"):
+            cancel_train_job()
+            st.rerun()
+    else:
+        show_training_progress(job.id)
+
+
+# Mode halaman: training dengan hyperparameter manual atau pencarian hyperparameter otomatis
+MODE_MANUAL = "🎛️ Training Manual"
+MODE_SEARCH = "🔬 Pencarian Hyperparameter"
+
+STRATEGY_LABELS = {
+    HALVING_SEARCH: "Successive Halving (kandidat lemah dihentikan lebih awal)",
+    RANDOM_SEARCH: "Randomized Search (semua kandidat dengan seluruh data)",
+}
+
+
+# Status job pencarian: progres jika masih berjalan, pesan + tombol tutup jika gagal/dibatalkan
+def _show_search_status(job):
+    if job.status in (FAILED, CANCELLED):
+        if job.status == FAILED:
+            st.error(f"❌ Pencarian gagal: {job.error}")
+        else:
+            st.warning("⏹️ Pencarian dibatalkan.")
+        if st.button("Tutup", key="dismiss_search"):
+            cancel_search_job()
+            st.rerun()
+    else:
+        show_search_progress(job.id, st.session_state["search_job"][4])
+
+
+# Leaderboard hasil pencarian + tombol untuk melatih model dengan konfigurasi terbaik
+def _show_search_result(result):
+    st.markdown("### 🏆 Leaderboard Hyperparameter")
+    board = result["leaderboard"]
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        st.metric("🎯 Akurasi Validasi Terbaik", f"{result['best_score']*100:.2f}%")
+    with c2:
+        st.metric("🔁 Ronde", f"{result['rounds']}")
+    with c3:
+        st.metric("🌲 Fit Selesai", f"{result['fits']}", help=f"{result['skipped']} fit dilewati/dihentikan")
+    with c4:
+        st.metric("⏱️ Waktu", f"{result['elapsed']:.1f} s")
+    if result["budget_exhausted"]:
+        st.info("⏳ Batas waktu habis: kandidat yang belum selesai tidak ikut dibandingkan.")
+
+    # Klik judul kolom untuk mengurutkan (mis. berdasarkan akurasi atau fit time)
+    st.caption("Klik judul kolom untuk mengurutkan. max_depth kosong = tanpa batas (None).")
+    st.dataframe(board, hide_index=True, use_container_width=True)
+
+    # Akurasi validasi vs fit time per ronde (ronde terakhir memakai data training terbanyak)
+    st.scatter_chart(
+        board.assign(Ronde=board["Ronde"].map(lambda r: f"Ronde {r}")),
+        x="Fit Time (s)",
+        y="Akurasi Validasi",
+        color="Ronde",
+    )
+
+    best = dict(result["best_params"])
+    st.markdown("**Konfigurasi terbaik:** " + ", ".join(f"`{k}={v!r}`" for k, v in best.items()))
+    if st.button("🏋️ Latih Model dengan Konfigurasi Terbaik", key="train_best_config"):
+        # dilatih & dievaluasi pada data testing dengan data dan split yang sama seperti pencarian
+        n_estimators = best.pop("n_estimators")
+        submit_training(
+            result["df"],
+            n_estimators=n_estimators,
+            test_size=result["test_size"],
+            random_state=result["random_state"],
+            model_params=best,
+        )
+        st.rerun()
+
+
 def show_analysis():
     # Judul halaman Analisis / Training model
     st.title("Training Model & Evaluasi")
@@ -20,7 +110,8 @@ def show_analysis():
     # Pastikan data hasil preprocessing sudah tersedia,
     # kalau belum, fungsi require_clean_data() akan menampilkan warning dan menghentikan eksekusi
     require_clean_data()
-    df_clean = st.session_state["clean_df"]
+    df_explore = get_explore_df()  # sampel berstrata jika mode sampel aktif, selain itu data penuh
+    show_data_mode(df_explore)
 
     # Card penjelasan singkat tentang apa yang dilakukan di halaman ini
     st.markdown(
@@ -35,23 +126,36 @@ def show_analysis():
         unsafe_allow_html=True,
     )
 
+    # Pilih training dengan hyperparameter manual atau pencarian hyperparameter otomatis
+    mode = st.radio("Mode", [MODE_MANUAL, MODE_SEARCH], horizontal=True, key="analysis_mode")
+
     # -----------------------------------------
     # Pengaturan Model
     # -----------------------------------------
     # Bagian ini dibungkus dalam expander agar tampilan lebih rapi.
     # User bisa mengatur hyperparameter Random Forest dan proporsi data testing.
-    with st.expander("⚙️ Pengaturan Model (Opsional)"):
+    with st.expander("⚙️ Pengaturan Model (Opsional)", expanded=mode == MODE_SEARCH):
         col1, col2 = st.columns(2)
         with col1:
-            # Slider untuk mengatur jumlah tree dalam Random Forest
-            n_estimators = st.slider(
-                "🌳 Jumlah Trees (n_estimators)",
-                50,
-                500,
-                200,
-                step=50,
-                help="Jumlah pohon keputusan dalam Random Forest",
-            )
+            if mode == MODE_MANUAL:
+                # Slider untuk mengatur jumlah tree dalam Random Forest
+                n_estimators = st.slider(
+                    "🌳 Jumlah Trees (n_estimators)",
+                    50,
+                    500,
+                    200,
+                    step=50,
+                    help="Jumlah pohon keputusan dalam Random Forest",
+                )
+            else:
+                # Strategi pencarian (n_estimators ikut dicari bersama hyperparameter lain)
+                strategy = st.selectbox(
+                    "🔬 Strategi Pencarian",
+                    list(STRATEGY_LABELS),
+                    format_func=STRATEGY_LABELS.get,
+                    help="Successive halving melatih semua kandidat dengan sebagian kecil data, "
+                         "lalu hanya kandidat terbaik yang lanjut dengan data lebih banyak",
+                )
         with col2:
             # Slider untuk mengatur proporsi data testing (sisa otomatis jadi data training)
             test_size = st.slider(
@@ -63,51 +167,70 @@ def show_analysis():
                 help="Persentase data yang digunakan untuk testing",
             )
 
+        if mode == MODE_SEARCH:
+            col3, col4 = st.columns(2)
+            with col3:
+                n_candidates = st.slider(
+                    "🎲 Jumlah Kandidat Konfigurasi",
+                    9,
+                    81,
+                    DEFAULT_N_CANDIDATES,
+                    step=9,
+                    help="Jumlah kombinasi acak dari n_estimators, max_depth, min_samples_leaf, "
+                         "max_features, dan class_weight",
+                )
+            with col4:
+                time_budget = st.slider(
+                    "⏳ Batas Waktu (detik)",
+                    30,
+                    600,
+                    DEFAULT_TIME_BUDGET,
+                    step=30,
+                    help="Pencarian berhenti saat batas waktu habis; hasil yang sudah selesai tetap ditampilkan",
+                )
+
+        # Jika mode sampel aktif, training default memakai sampel; centang untuk training penuh
+        full_training = False
+        if st.session_state.get("sample_frac"):
+            full_training = st.checkbox(
+                "🏋️ Full training (gunakan seluruh data, bukan sampel)",
+                value=False,
+                help="Training penuh memakai semua baris hasil preprocessing dan bisa memakan waktu lama",
+            )
+
     # -----------------------------------------
     # Tombol Training
     # -----------------------------------------
-    # Saat tombol ini diklik, proses training model akan dijalankan
-    if st.button("Mulai Training Model", key="run_training"):
-        # Tampilkan spinner selama proses training berlangsung
-        with st.spinner("⏳ Sedang melatih model Random Forest..."):
-            # X = fitur, y = label/target
-            X = df_clean[st.session_state["features"]]
-            y = df_clean[TARGET_COL]
-
-            # Bagi data menjadi train dan test sesuai test_size
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=42, stratify=y
-            )
-
-            # Inisialisasi model Random Forest dengan parameter yang dipilih user
-            model = RandomForestClassifier(
-                n_estimators=n_estimators,
-                random_state=42,
-                class_weight="balanced",
-                n_jobs=-1,
+    # Saat tombol ini diklik, training dijalankan sebagai job latar belakang (halaman lain tetap
+    # bisa dipakai). Kombinasi data + fitur + hyperparameter yang sama diambil langsung dari cache
+    # model; jika hanya jumlah tree yang berubah, forest sebelumnya dipotong / ditambah tree-nya saja
+    df_clean = st.session_state["clean_df"] if full_training else df_explore
+    if mode == MODE_MANUAL:
+        if st.button("Mulai Training Model", key="run_training"):
+            submit_training(df_clean, n_estimators=n_estimators, test_size=test_size)
+            # Rerun halaman supaya progres training / hasil evaluasi langsung tampil
+            st.rerun()
+    else:
+        # Pencarian dijalankan sebagai job latar belakang di scheduler training bersama; kandidat
+        # di-fit paralel (sebanyak thread per training) dan leaderboard tampil setelah selesai
+        if st.button("🔬 Mulai Pencarian", key="run_search"):
+            submit_search(
+                df_clean, test_size=test_size, strategy=strategy, n_candidates=n_candidates,
+                time_budget=time_budget,
             )
+            st.rerun()
 
-            # Latih model dengan data training
-            model.fit(X_train, y_train)
-            # Prediksi label untuk data testing
-            y_pred = model.predict(X_test)
-
-            # Hitung metrik evaluasi
-            acc = accuracy_score(y_test, y_pred)
-            cm = confusion_matrix(y_test, y_pred)
-            report = classification_report(y_test, y_pred, output_dict=True)
-
-            # Simpan semua hasil ke session_state supaya bisa dipakai kembali
-            st.session_state["rf_model"] = model
-            st.session_state["acc"] = acc
-            st.session_state["cm"] = cm
-            st.session_state["report"] = report
-            st.session_state["X_cols"] = X.columns.tolist()
+        # Job pencarian milik session ini (hasilnya disimpan ke session_state jika sudah selesai)
+        search = collect_search_job()
+        if search is not None:
+            _show_search_status(search)
+        if st.session_state.get("search_result") is not None:
+            _show_search_result(st.session_state["search_result"])
 
-        # Notifikasi bahwa training selesai
-        st.success("✅ Training model selesai!")
-        # Rerun halaman supaya blok di bawah (hasil evaluasi) langsung muncul dengan data terbaru
-        st.rerun()  # agar hasil tampil di blok bawah
+    # Job training milik session ini (hasilnya dipublikasikan ke session_state jika sudah selesai)
+    job = collect_train_job()
+    if job is not None:
+        _show_training_status(job)
 
     # -------------------------------------------------
     # BLOK INI SELALU TAMPIL jika model sudah tersedia
@@ -130,8 +253,8 @@ def show_analysis():
             # Akurasi dalam persen
             st.metric("🎯 Akurasi", f"{acc*100:.2f}%")
         with c2:
-            # Jumlah tree yang digunakan (diambil dari slider terakhir yang diset)
-            st.metric("🌳 Trees", f"{n_estimators}")
+            # Jumlah tree pada model yang sedang dipakai
+            st.metric("🌳 Trees", f"{len(model.estimators_)}")
         with c3:
             # Info singkat bahwa pembagian train ditentukan otomatis dari test_size
             st.metric("📊 Training", f"(otomatis)")
@@ -2,7 +2,53 @@
 import streamlit as st
 import pandas as pd
 
-from helpers import require_model  # fungsi helper untuk memastikan model sudah tersedia di session_state
+from core.ingest import SUPPORTED_EXTENSIONS, read_dataset
+from core.schema import (
+    HEART_SCHEMA,
+    SECTION_CONDITION,
+    SECTION_DEMOGRAPHIC,
+    SECTION_LIFESTYLE,
+    SECTION_LIPID,
+    FieldSpec,
+    fields_in_section,
+    schema_for,
+    validate_frame,
+)
+from helpers import require_model, score_batch, show_validation  # helper cek model, scoring & validasi skema
+
+# Kelompok input di tiap kolom form: kiri (usia, tekanan darah, lipid), kanan (kondisi & gaya hidup)
+FORM_LAYOUT = [
+    [SECTION_DEMOGRAPHIC, SECTION_LIPID],
+    [SECTION_CONDITION, SECTION_LIFESTYLE],
+]
+
+
+# Widget input satu kolom skema: selectbox untuk kolom pilihan, number_input untuk kolom angka
+def _field_input(spec: FieldSpec):
+    if spec.choices:
+        return st.selectbox(
+            spec.label,
+            range(len(spec.choices)),
+            format_func=lambda code: f"{spec.choices[code]} ({code})",
+            help=spec.help,
+        )
+    return st.number_input(
+        spec.label,
+        min_value=spec.min,
+        max_value=spec.max,
+        value=spec.default,
+        help=spec.help,
+    )
+
+
+# Nilai input untuk model: kode pilihan diganti nilai teks dataset (mis. "Never") jika kolom
+# tersebut berupa teks saat training, sehingga di-encode dengan vocabulary yang sama
+def _model_value(name, value, preprocessor):
+    spec = HEART_SCHEMA[name]
+    categories = preprocessor.categories.get(name)
+    if spec.values and categories and isinstance(categories[0], str):
+        return spec.values[value]
+    return value
 
 
 def show_prediction():
@@ -28,119 +74,19 @@ def show_prediction():
     # -----------------------------------------
     # FORM INPUT DATA PASIEN
     # -----------------------------------------
-    # Form memastikan input dikirim sekaligus saat tombol submit ditekan
+    # Form memastikan input dikirim sekaligus saat tombol submit ditekan.
+    # Label, batas min/max, nilai awal, dan pilihan tiap input diambil dari skema (core.schema)
     with st.form("form_prediksi"):
         st.markdown("### 📋 Data Kesehatan Pasien")
 
         # Dua kolom: kiri (data numerik utama), kanan (status kesehatan & gaya hidup)
-        col1, col2 = st.columns(2)
-
-        # -----------------------------
-        # KOLOM KIRI: Usia & Tekanan Darah + Profil Lipid
-        # -----------------------------
-        with col1:
-            st.markdown("#### 👤 Data Demografis & Tekanan Darah")
-            # Input usia pasien
-            age = st.number_input(
-                "Usia (tahun)",
-                min_value=18,
-                max_value=100,
-                value=40,
-                help="Masukkan usia dalam tahun",
-            )
-            # Tekanan darah sistolik
-            systolic = st.number_input(
-                "Tekanan Darah Sistolik (mmHg)",
-                min_value=80,
-                max_value=250,
-                value=120,
-                help="Tekanan darah saat jantung memompa",
-            )
-            # Tekanan darah diastolik
-            diastolic = st.number_input(
-                "Tekanan Darah Diastolik (mmHg)",
-                min_value=50,
-                max_value=150,
-                value=80,
-                help="Tekanan darah saat jantung rileks",
-            )
-
-            st.markdown("#### 💉 Data Kolesterol & Gula Darah")
-            # Kolesterol total
-            cholesterol_level = st.number_input(
-                "Kolesterol Total (mg/dL)", min_value=80, max_value=400, value=200
-            )
-            # HDL (kolesterol baik)
-            hdl = st.number_input(
-                "Kolesterol HDL (mg/dL)",
-                min_value=10,
-                max_value=120,
-                value=40,
-                help="Kolesterol baik",
-            )
-            # LDL (kolesterol jahat)
-            ldl = st.number_input(
-                "Kolesterol LDL (mg/dL)",
-                min_value=10,
-                max_value=300,
-                value=120,
-                help="Kolesterol jahat",
-            )
-            # Trigliserida
-            triglycerides = st.number_input(
-                "Trigliserida (mg/dL)", min_value=30, max_value=600, value=150
-            )
-            # Gula darah puasa
-            fasting_blood_sugar = st.number_input(
-                "Gula Darah Puasa (mg/dL)", min_value=50, max_value=400, value=100
-            )
-
-        # -----------------------------
-        # KOLOM KANAN: Kondisi Kesehatan & Gaya Hidup
-        # -----------------------------
-        with col2:
-            st.markdown("#### 🏥 Kondisi Kesehatan")
-            # Status hipertensi (0 / 1)
-            hypertension = st.selectbox(
-                "Hipertensi",
-                ["Tidak (0)", "Ya (1)"],
-                help="Apakah memiliki riwayat hipertensi?",
-            )
-            # Status diabetes (0 / 1)
-            diabetes = st.selectbox(
-                "Diabetes", ["Tidak (0)", "Ya (1)"], help="Apakah memiliki riwayat diabetes?"
-            )
-            # Status obesitas (0 / 1)
-            obesity = st.selectbox(
-                "Obesitas", ["Tidak (0)", "Ya (1)"], help="Apakah termasuk kategori obesitas?"
-            )
-            # Riwayat penyakit jantung sebelumnya (0 / 1)
-            prev_hd = st.selectbox(
-                "Riwayat Penyakit Jantung",
-                ["Tidak (0)", "Ya (1)"],
-                help="Apakah pernah mengalami penyakit jantung sebelumnya?",
-            )
-            # Lingkar pinggang sebagai indikator risiko
-            waist = st.number_input(
-                "Lingkar Pinggang (cm)",
-                min_value=50,
-                max_value=200,
-                value=85,
-                help="Ukuran lingkar pinggang dalam cm",
-            )
-
-            st.markdown("#### 🚭 Gaya Hidup")
-            # Status merokok (dikodekan 0/1/2)
-            smoking = st.selectbox(
-                "Status Merokok",
-                ["Tidak Pernah (0)", "Mantan Perokok (1)", "Aktif Merokok (2)"],
-            )
-            # Tingkat aktivitas fisik (dikodekan 0/1/2)
-            physical_activity = st.selectbox(
-                "Aktivitas Fisik",
-                ["Rendah (0)", "Sedang (1)", "Tinggi (2)"],
-                help="Tingkat aktivitas fisik sehari-hari",
-            )
+        form_values = {}
+        for column, sections in zip(st.columns(2), FORM_LAYOUT):
+            with column:
+                for section in sections:
+                    st.markdown(f"#### {section}")
+                    for name, spec in fields_in_section(section).items():
+                        form_values[name] = _field_input(spec)
 
         # Garis pemisah dan tombol submit form
         st.markdown("---")
@@ -150,58 +96,23 @@ def show_prediction():
     # LOGIKA PREDIKSI (dijalankan setelah tombol submit)
     # -----------------------------------------
     if submitted:
-        # Konversi pilihan selectbox (teks) menjadi nilai numerik sesuai encoding dataset/model
-        hypertension_val = 1 if "Ya" in hypertension else 0
-        diabetes_val = 1 if "Ya" in diabetes else 0
-        obesity_val = 1 if "Ya" in obesity else 0
-        prev_hd_val = 1 if "Ya" in prev_hd else 0
-
-        # Pemetaan status merokok ke angka (0,1,2)
-        smoking_map = {
-            "Tidak Pernah (0)": 0,
-            "Mantan Perokok (1)": 1,
-            "Aktif Merokok (2)": 2,
-        }
-        # Pemetaan level aktivitas fisik ke angka (0,1,2)
-        physical_map = {
-            "Rendah (0)": 0,
-            "Sedang (1)": 1,
-            "Tinggi (2)": 2,
-        }
-
-        smoking_val = smoking_map[smoking]
-        physical_val = physical_map[physical_activity]
-
-        # Menyusun data input ke dalam DataFrame 1 baris
-        # Kolom-kolomnya harus sama persis dengan fitur yang digunakan pada saat training model
+        # Menyusun data input ke dalam DataFrame 1 baris.
+        # Pilihan (kode 0/1/2) dikirim sebagai nilai teks dataset jika kolom tsb berupa teks saat training
+        preprocessor = st.session_state["rf_preprocessor"]
         input_data = pd.DataFrame(
-            [
-                {
-                    "age": age,
-                    "hypertension": hypertension_val,
-                    "blood_pressure_systolic": systolic,
-                    "blood_pressure_diastolic": diastolic,
-                    "diabetes": diabetes_val,
-                    "cholesterol_level": cholesterol_level,
-                    "cholesterol_hdl": hdl,
-                    "cholesterol_ldl": ldl,
-                    "triglycerides": triglycerides,
-                    "fasting_blood_sugar": fasting_blood_sugar,
-                    "obesity": obesity_val,
-                    "waist_circumference": waist,
-                    "previous_heart_disease": prev_hd_val,
-                    "smoking_status": smoking_val,
-                    "physical_activity": physical_val,
-                }
-            ]
+            [{name: _model_value(name, code, preprocessor) for name, code in form_values.items()}]
         )
 
-        # Mengambil model yang sudah disimpan di session_state saat training
-        model = st.session_state["rf_model"]
-        # Menghitung probabilitas kelas "1" (berisiko serangan jantung)
-        proba = model.predict_proba(input_data)[0, 1]
-        # Mengambil prediksi kelas akhir (0 = tidak berisiko, 1 = berisiko)
-        pred = model.predict(input_data)[0]
+        # Prediksi memakai model & Preprocessor (encoding hasil fit, tanpa fit ulang) dari training
+        scored = score_batch(st.session_state["rf_model"], preprocessor, input_data)
+        # Probabilitas kelas "1" (berisiko serangan jantung)
+        proba = scored["proba"].iloc[0]
+        # Prediksi kelas akhir (0 = tidak berisiko, 1 = berisiko)
+        pred = scored["prediksi"].iloc[0]
+        if pd.isna(pred):
+            # nilai pilihan yang tidak ada di data training tidak bisa di-encode oleh model
+            st.error("❌ Ada nilai pilihan yang tidak ditemukan di data training model, prediksi tidak dapat dihitung.")
+            st.stop()
 
         # -----------------------------------------
         # TAMPILKAN HASIL PREDIKSI
@@ -298,3 +209,55 @@ def show_prediction():
             "⚕️ **Disclaimer:** Hasil prediksi ini bersifat informatif dan tidak menggantikan diagnosis medis profesional. "
             "Selalu konsultasikan kondisi kesehatan Anda dengan dokter."
         )
+
+    # -----------------------------------------
+    # SCORING BATCH (BANYAK PASIEN SEKALIGUS)
+    # -----------------------------------------
+    st.markdown("---")
+    with st.expander("📁 Prediksi Batch dari File"):
+        st.caption(
+            "Upload file berisi data banyak pasien dengan kolom fitur yang sama seperti dataset training. "
+            "Kolom kategori di-encode dengan mapping yang sama seperti saat model dilatih."
+        )
+        score_file = st.file_uploader(
+            "Pilih file pasien",
+            type=SUPPORTED_EXTENSIONS,
+            key="score_uploader",
+        )
+        if score_file is not None and st.button("🔮 Prediksi Batch", key="run_scoring"):
+            preprocessor = st.session_state["rf_preprocessor"]
+            with st.spinner("⏳ Sedang menghitung prediksi..."):
+                try:
+                    df_score = read_dataset(score_file, score_file.name, columns=preprocessor.features)
+                    scored = score_batch(st.session_state["rf_model"], preprocessor, df_score)
+                except KeyError as e:
+                    st.error(f"❌ {e.args[0]}")
+                    st.stop()
+                # validasi rentang & pilihan nilai (skema yang sama dengan form), ditandai per baris
+                report = validate_frame(df_score, schema_for(preprocessor.features))
+                scored["valid_skema"] = ~report["invalid"]
+
+            n_scored = int(scored["prediksi"].notna().sum())
+            c1, c2, c3 = st.columns(3)
+            c1.metric("📋 Total Baris", f"{len(scored):,}")
+            c2.metric("✅ Diprediksi", f"{n_scored:,}")
+            c3.metric("🚨 Berisiko", f"{int((scored['prediksi'] == 1).sum()):,}")
+            n_unknown = int((~scored["kategori_dikenal"]).sum())
+            if n_unknown:
+                st.warning(
+                    f"⚠️ {n_unknown:,} baris berisi nilai kategori yang tidak ada di data training "
+                    "(kolom kategori_dikenal = False) dan tidak diprediksi."
+                )
+            if n_scored + n_unknown < len(scored):
+                st.warning(f"⚠️ {len(scored) - n_scored - n_unknown:,} baris memiliki fitur kosong dan tidak diprediksi.")
+
+            st.markdown("#### 🛡️ Validasi Skema")
+            show_validation(report, df_score)
+
+            st.dataframe(scored.head(100), use_container_width=True)
+            st.download_button(
+                "⬇️ Download Hasil Prediksi (CSV)",
+                data=scored.to_csv(index=False).encode("utf-8"),
+                file_name="hasil_prediksi.csv",
+                mime="text/csv",
+            )
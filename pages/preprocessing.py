@@ -1,15 +1,27 @@
 import streamlit as st
 import pandas as pd
-from helpers import preprocess_data, require_raw_data  # fungsi helper untuk cek data & melakukan preprocessing
+from helpers import get_raw_profile, preprocess_data_cached, require_raw_data  # fungsi helper untuk cek data & melakukan preprocessing
+from core.instrument import stages_frame  # tabel metrik waktu & memori per tahap
 
 
 def show_preprocessing():
     # Judul utama halaman preprocessing
     st.title("Preprocessing Data")
 
+    # Data bersih hasil mode out-of-core (halaman Upload) dibuat tanpa raw_df di memori
+    info = st.session_state.get("preprocess_info")
+    if st.session_state.get("raw_df") is None and info is not None and info.get("out_of_core"):
+        st.info(
+            "🧱 Data bersih berasal dari **preprocessing out-of-core** di halaman Upload Dataset "
+            "(file diproses per chunk tanpa memuat data mentah ke memori)."
+        )
+        _show_preprocess_result()
+        return
+
     # Pastikan dataset mentah sudah di-upload, kalau belum akan stop dan beri peringatan
     require_raw_data()
     df_raw = st.session_state["raw_df"]  # ambil dataset mentah dari session_state
+    profile = get_raw_profile()          # profil kolom (dihitung sekali per versi dataset)
 
     # -----------------------------------------
     # INFORMASI AWAL DATASET
@@ -26,18 +38,15 @@ def show_preprocessing():
         st.metric("📋 Jumlah Kolom", f"{df_raw.shape[1]:,}")
     with col3:
         # Total nilai kosong (missing values) di seluruh kolom
-        st.metric("❓ Missing Values", f"{df_raw.isna().sum().sum():,}")
+        st.metric("❓ Missing Values", f"{profile['missing_total']:,}")
     with col4:
         # Jumlah baris duplikat dalam dataset
-        st.metric("🔄 Duplikat", f"{df_raw.duplicated().sum():,}")
+        st.metric("🔄 Duplikat", f"{profile['duplicates']:,}")
 
     # Expander untuk melihat tipe data tiap kolom
     with st.expander("🔍 Lihat Tipe Data Kolom"):
         st.dataframe(
-            pd.DataFrame({
-                'Kolom': df_raw.dtypes.index,   # nama kolom
-                'Tipe Data': df_raw.dtypes.values  # tipe data tiap kolom
-            }),
+            profile["columns"][["Kolom", "Tipe Data"]],  # nama kolom & tipe data tiap kolom
             use_container_width=True
         )
 
@@ -59,7 +68,10 @@ def show_preprocessing():
         # Tampilkan spinner selama proses berjalan
         with st.spinner("⏳ Sedang memproses data..."):
             # Panggil fungsi preprocess_data dari helpers
-            clean_df, info = preprocess_data(df_raw)
+            # (hasil untuk dataset & fitur yang sama diambil dari cache tanpa diproses ulang)
+            clean_df, info = preprocess_data_cached(
+                df_raw, fingerprint=st.session_state.get("raw_fingerprint"), profile=profile
+            )
 
             # Simpan hasil preprocessing dan info ringkasan ke session_state
             st.session_state["clean_df"] = clean_df
@@ -74,6 +86,11 @@ def show_preprocessing():
     #  BLOK INI SELALU JALAN JIKA clean_df SUDAH ADA DI SESSION
     # ----------------------------------------------------------
     # Jadi user tidak perlu klik preprocess ulang jika halaman direfresh
+    _show_preprocess_result()
+
+
+# Ringkasan hasil preprocessing + preview + navigasi (jika clean_df sudah ada di session)
+def _show_preprocess_result():
     if st.session_state.get("clean_df") is not None:
 
         clean_df = st.session_state["clean_df"]              # data setelah preprocessing
@@ -112,6 +129,45 @@ def show_preprocessing():
                 use_container_width=True
             )
 
+        # Expander waktu & memori tiap tahap preprocessing (hanya untuk preprocessing in-memory)
+        if info.get("stage_timings"):
+            # hasil dari PREPROCESS_CACHE: metrik berasal dari run awal, bukan diukur pada run ini
+            cached = info.get("timings_cached", False)
+            suffix = "_cached" if cached else ""
+            with st.expander("⏱️ Waktu & Memori per Tahap" + (" (dari cache)" if cached else "")):
+                if cached:
+                    st.info(
+                        "♻️ Hasil preprocessing diambil dari cache "
+                        f"({info['cache_lookup_s'] * 1000:.2f} ms pada run ini). Metrik di bawah diukur saat "
+                        "preprocessing pertama kali dijalankan (bisa dari session lain), bukan pada run ini."
+                    )
+                timings_df = stages_frame(info["stage_timings"])
+                if cached:
+                    timings_df["Dari Cache"] = True
+                st.dataframe(timings_df, use_container_width=True, hide_index=True)
+                st.caption(
+                    "Wall = waktu nyata, CPU = waktu CPU proses, Peak Memori = alokasi puncak "
+                    "di atas memori awal tahap (tracemalloc, hanya diukur jika server dijalankan "
+                    "dengan PREPROCESS_TRACE_MEMORY=1)."
+                )
+                d1, d2 = st.columns(2)
+                with d1:
+                    st.download_button(
+                        "⬇️ Unduh CSV",
+                        data=timings_df.to_csv(index=False).encode("utf-8"),
+                        file_name=f"preprocess_stage_timings{suffix}.csv",
+                        mime="text/csv",
+                        key="download_stage_timings_csv",
+                    )
+                with d2:
+                    st.download_button(
+                        "⬇️ Unduh JSON",
+                        data=timings_df.to_json(orient="records", indent=2),
+                        file_name=f"preprocess_stage_timings{suffix}.json",
+                        mime="application/json",
+                        key="download_stage_timings_json",
+                    )
+
         # Preview beberapa baris pertama dari data yang sudah dibersihkan
         st.markdown("### 🔍 Preview Data Hasil Preprocessing")
         st.dataframe(clean_df.head(10), use_container_width=True)
@@ -1,5 +1,166 @@
+import tempfile
+
 import streamlit as st
-import pandas as pd
+
+from core.arrow_dtypes import ARROW_BACKEND, NUMPY_BACKEND
+from core.cache import bytes_fingerprint
+from core.ingest import (
+    SUPPORTED_EXTENSIONS,
+    content_fingerprint,
+    detect_format,
+    ingest_job,
+    read_dataset_cached,
+)
+from core.jobs import CANCELLED, FAILED, forget_job, get_job, start_job
+from core.outofcore import load_clean_store, preprocess_out_of_core
+from core.query_engine import DUCKDB_AVAILABLE, DuckDBSource
+from helpers import (
+    TARGET_COL,
+    collect_ingest_job,
+    get_raw_profile,
+    get_raw_validation,
+    append_batch,
+    show_validation,
+)
+from state import cancel_search_job, cancel_train_job, publish_clean_dataset, publish_raw_dataset
+
+
+# Panel progres job ingest latar belakang, diperbarui sendiri tiap 1 detik
+# (hanya fragment ini yang di-rerun, sidebar & halaman lain tetap responsif)
+@st.fragment(run_every=1)
+def _ingest_progress(job_id):
+    job = get_job(job_id)
+    if job is None or job.finished:
+        # job selesai -> rerun seluruh app supaya hasilnya dipublikasikan ke session_state
+        st.rerun()
+
+    progress = job.progress
+    rows = progress.get("rows", 0)
+    read_mb = progress.get("bytes", 0) / (1024 * 1024)
+    total_bytes = progress.get("total_bytes")
+    if total_bytes:
+        frac = min(progress.get("bytes", 0) / total_bytes, 1.0)
+        text = f"📥 Membaca data di latar belakang... {rows:,} baris • {read_mb:.1f} / {total_bytes / (1024 * 1024):.1f} MB"
+    else:
+        frac = 0.0
+        text = f"📥 Membaca data di latar belakang... {rows:,} baris • {read_mb:.1f} MB"
+    st.progress(frac, text=text)
+    if frac >= 1.0:
+        st.caption(f"⏱️ {job.elapsed:.1f} detik • seluruh file sudah dibaca, menyusun DataFrame...")
+    else:
+        st.caption(f"⏱️ {job.elapsed:.1f} detik")
+
+    if st.button("⏹️ Batalkan", key="cancel_ingest"):
+        job.cancel()
+
+
+# Status job ingest: progres jika masih berjalan, pesan + tombol ulang jika gagal/dibatalkan
+def _show_ingest_status(job):
+    if job.status in (FAILED, CANCELLED):
+        if job.status == FAILED:
+            st.error(f"❌ Terjadi kesalahan saat membaca file: {job.error}")
+            st.info("💡 Pastikan file Anda memiliki format yang benar dan tidak corrupt.")
+        else:
+            st.warning("⏹️ Pembacaan file dibatalkan.")
+        if st.button("🔁 Baca Ulang", key="retry_ingest"):
+            forget_job(job.id)
+            st.session_state["ingest_job"] = None
+            st.rerun()
+    else:
+        _ingest_progress(job.id)
+
+
+# Ambil (atau buat) sumber DuckDB untuk file upload saat ini; satu sumber per session
+def _get_duckdb_source(uploaded_file):
+    cached = st.session_state.get("duckdb_source")
+    if cached is not None and cached[0] == uploaded_file.file_id:
+        return cached[1]
+    _close_duckdb_source()
+    source = DuckDBSource(uploaded_file, uploaded_file.name)
+    st.session_state["duckdb_source"] = (uploaded_file.file_id, source)
+    return source
+
+
+# Sumber DuckDB lama tidak dipakai lagi -> tutup koneksi & hapus file sementara
+def _close_duckdb_source():
+    cached = st.session_state.get("duckdb_source")
+    if cached is not None:
+        cached[1].close()
+        st.session_state["duckdb_source"] = None
+
+
+# Form filter eksplorasi untuk engine DuckDB; filter dijalankan di DuckDB, bukan di pandas
+def _duckdb_filter_form(source):
+    st.markdown("#### 🔎 Filter Data (DuckDB)")
+    filters = []
+    names = source.column_names()
+
+    if "age" in names:
+        lo, hi = (int(v) for v in source.min_max("age"))
+        age_range = st.slider("Rentang usia (tahun)", lo, hi, (lo, hi))
+        if age_range != (lo, hi):
+            filters += [("age", ">=", age_range[0]), ("age", "<=", age_range[1])]
+
+    flags = [c for c in ("hypertension", "diabetes", "obesity", "previous_heart_disease") if c in names]
+    chosen = st.multiselect(
+        "Hanya pasien dengan kondisi",
+        flags,
+        help="Contoh: usia di atas 60 + hypertension = pasien lansia dengan hipertensi",
+    )
+    filters += [(c, "=", 1) for c in chosen]
+    return filters
+
+
+# Preprocessing out-of-core: file di-stream langsung menjadi data bersih (raw_df tidak dimuat)
+def _run_out_of_core(uploaded_file):
+    features = st.session_state["features"]
+    ooc_key = (uploaded_file.file_id, "out_of_core", tuple(features))
+
+    if st.session_state.get("raw_upload_key") != ooc_key:
+        st.info(
+            "💡 Mode out-of-core: file dibaca per chunk, duplikat dideteksi lewat hash baris yang "
+            "disimpan di disk, dan data bersih ditulis ke store Feather. Data mentah tidak dimuat ke memori."
+        )
+        if not st.button("🧱 Jalankan Preprocessing Out-of-Core", key="run_out_of_core"):
+            return
+
+        progress_text = st.empty()
+
+        def on_progress(stage, rows):
+            label = "📥 Membaca & deduplikasi" if stage == "baca" else "🔢 Encoding & menulis store"
+            progress_text.caption(f"{label}... {rows:,} baris")
+
+        # direktori store (spill + Feather) hanya hidup selama preprocessing: setelah store dimuat
+        # ke clean_df, direktori dihapus (seperti CLI) supaya tidak menumpuk di disk tiap kali dijalankan
+        with tempfile.TemporaryDirectory(prefix="heart_ooc_", ignore_cleanup_errors=True) as store_dir:
+            try:
+                with st.spinner("⏳ Menjalankan preprocessing out-of-core..."):
+                    info = preprocess_out_of_core(
+                        uploaded_file, uploaded_file.name, features, TARGET_COL, store_dir, on_progress=on_progress
+                    )
+                    clean_df = load_clean_store(info.pop("store_path"))
+            except KeyError as e:
+                st.error(f"❌ {e.args[0]}")
+                return
+        progress_text.empty()
+        info["out_of_core"] = True  # penanda untuk halaman Preprocessing (data mentah tidak ada di memori)
+
+        fingerprint = bytes_fingerprint(f"{content_fingerprint(uploaded_file)}|out_of_core|{features}".encode())
+        publish_clean_dataset(clean_df, info, fingerprint, ooc_key)
+        st.rerun()
+
+    info = st.session_state["preprocess_info"]
+    st.success("✅ Preprocessing out-of-core selesai!")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("📊 Baris Sebelum", f"{info['rows_before']:,}")
+    c2.metric("✅ Baris Bersih", f"{info['rows_after']:,}")
+    c3.metric("🗑️ Duplikat Dihapus", f"{info['duplicates_removed']:,}")
+    st.dataframe(st.session_state["clean_df"].head(), use_container_width=True)
+
+    if st.button("Lanjut ke Analisis Data >", key="goto_analysis_ooc"):
+        st.session_state["page"] = "Analisis Data"
+        st.rerun()
+
 
 # Fungsi utama halaman "Upload Dataset"
 def show_upload_dataset():
@@ -11,7 +172,9 @@ def show_upload_dataset():
         """
         <div class="data-card">
             <p style="font-size: 1 rem; color: #555; margin-bottom: 1rem;">
-                Silakan unggah file <strong>CSV</strong> dataset <em>Heart Attack Prediction in Indonesia</em> dari Kaggle.
+                Silakan unggah file <strong>CSV</strong> (boleh terkompresi <strong>.csv.gz</strong>,
+                <strong>.csv.zst</strong>, atau <strong>.zip</strong>), <strong>Parquet</strong>, <strong>Feather</strong>,
+                atau <strong>Arrow IPC</strong> dataset <em>Heart Attack Prediction in Indonesia</em> dari Kaggle.
                 Setelah upload berhasil, preview data akan ditampilkan.
             </p>
         </div>
@@ -19,24 +182,189 @@ def show_upload_dataset():
         unsafe_allow_html=True
     )
 
-    # Komponen untuk memilih & mengunggah file CSV
+    # Komponen untuk memilih & mengunggah file dataset
     uploaded_file = st.file_uploader(
-        "Pilih file CSV",
-        type=["csv"],
-        help="Upload file CSV dengan format yang sesuai"
+        "Pilih file dataset",
+        type=SUPPORTED_EXTENSIONS,
+        help="Upload file CSV / Parquet / Feather / Arrow IPC dengan format yang sesuai. "
+             "CSV terkompresi (.csv.gz, .csv.zst, .zip) didekompresi langsung saat dibaca. "
+             "Untuk format kolomnar, hanya kolom fitur + target yang dibaca."
+    )
+
+    # Engine data: pandas (default) atau DuckDB (opsional) yang menjalankan filter & proyeksi
+    # langsung di file tanpa memuat seluruh isinya ke memori
+    engine = st.radio(
+        "🦆 Engine Data",
+        ["pandas", "DuckDB (query tanpa memuat seluruh file)"],
+        horizontal=True,
+        help="Dengan DuckDB, hanya hasil filter (kolom fitur + target) yang dimuat sebagai dataset",
     )
+    use_duckdb = engine.startswith("DuckDB")
+    if use_duckdb and not DUCKDB_AVAILABLE:
+        st.warning("⚠️ DuckDB belum terpasang (`pip install duckdb`). Menggunakan engine pandas.")
+        use_duckdb = False
+
+    # Mode out-of-core untuk file yang lebih besar dari RAM: preprocessing dijalankan langsung
+    # dari file per chunk dengan memori terbatas, hasilnya disimpan di disk (Feather)
+    out_of_core = st.checkbox(
+        "🧱 Preprocessing out-of-core (file sangat besar)",
+        value=False,
+        disabled=use_duckdb,
+        help="Data mentah tidak dimuat ke memori: file langsung diproses menjadi data bersih "
+             "(proyeksi kolom, hapus missing & duplikat, encoding) per chunk",
+    ) and not use_duckdb
+
+    # Pilihan mode pembacaan CSV: chunked (pyarrow) lebih hemat memori untuk file besar
+    ingest_mode = st.radio(
+        "⚙️ Mode Pembacaan CSV",
+        ["Chunked (pyarrow)", "Standar (pandas)"],
+        horizontal=True,
+        help="Mode chunked membaca file per blok dan menampilkan progres jumlah baris",
+    )
+
+    # Opsi untuk mengecilkan tipe data (int8/int16/float32/category) agar hemat memori
+    downcast = st.checkbox(
+        "🗜️ Kompres tipe data (downcast)",
+        value=True,
+        help="Flag 0/1 menjadi int8, angka desimal menjadi float32, dan kolom teks "
+             "dengan sedikit nilai unik menjadi category",
+    )
+
+    # Opsi tipe data berbasis Arrow: kolom teks tanpa objek str Python, kolom kategori
+    # di-encode sebagai dictionary, dan kolom integer tetap integer walau ada missing value
+    arrow_dtypes = st.checkbox(
+        "🏹 Tipe data Arrow (pyarrow)",
+        value=False,
+        disabled=use_duckdb,
+        help="Kolom disimpan dengan tipe Arrow (string[pyarrow], dictionary/category, integer nullable) "
+             "dari pembacaan file sampai preprocessing, lebih hemat memori dan lebih cepat dari tipe object",
+    ) and not use_duckdb
+    dtype_backend = ARROW_BACKEND if arrow_dtypes else NUMPY_BACKEND
+
+    # Opsi membaca file di thread latar belakang (halaman lain tetap bisa dipakai, bisa dibatalkan)
+    background = st.checkbox(
+        "🧵 Baca file di latar belakang",
+        value=True,
+        help="Progres (baris & byte) ditampilkan selama pembacaan dan proses bisa dibatalkan",
+    )
+
+    # Mode sampel: halaman visualisasi & analisis memakai sampel berstrata (heart_attack),
+    # sedangkan data penuh tetap disimpan untuk training penuh
+    use_sample = st.checkbox(
+        "🎲 Mode sampel untuk eksplorasi",
+        value=bool(st.session_state["sample_frac"]),
+        help="Cocok untuk file berukuran sangat besar. Sampel diambil berstrata berdasarkan "
+             f"{TARGET_COL} dengan seed tetap, sehingga selalu sama untuk data yang sama.",
+    )
+    if use_sample:
+        sample_pct = st.slider(
+            "Fraksi sampel (%)",
+            1,
+            50,
+            int((st.session_state["sample_frac"] or 0.1) * 100),
+        )
+        st.session_state["sample_frac"] = sample_pct / 100
+    else:
+        st.session_state["sample_frac"] = None
+
+    # Job ingest latar belakang milik session ini (hasilnya dipublikasikan jika sudah selesai)
+    job = collect_ingest_job()
+    if uploaded_file is None and job is not None:
+        # user sempat pindah halaman saat file masih dibaca -> tetap tampilkan progresnya
+        _show_ingest_status(job)
 
     # Jika user sudah memilih file
+    if uploaded_file is not None and out_of_core:
+        _close_duckdb_source()
+        _run_out_of_core(uploaded_file)
+        return
+
     if uploaded_file is not None:
         try:
-            # Baca file CSV menjadi DataFrame pandas
-            df = pd.read_csv(uploaded_file)
+            chunked = ingest_mode == "Chunked (pyarrow)"
+            if use_duckdb:
+                source = _get_duckdb_source(uploaded_file)
+                filters = _duckdb_filter_form(source)
+                upload_key = (uploaded_file.file_id, "duckdb", tuple(filters), downcast)
+            else:
+                _close_duckdb_source()  # engine DuckDB dimatikan -> sumber lama tidak dipakai lagi
+                upload_key = (uploaded_file.file_id, chunked, downcast, dtype_backend)
+
+            # Streamlit menjalankan ulang script di setiap klik widget.
+            # Jika file & opsi yang sama sudah dimuat di session ini, pakai raw_df yang ada
+            # (tanpa hashing / parsing ulang, dan clean_df/rf_model tetap konsisten).
+            if st.session_state.get("raw_upload_key") == upload_key:
+                df = st.session_state["raw_df"]
+            elif use_duckdb:
+                # hanya hasil query (filter + proyeksi fitur & target) yang dimuat ke pandas
+                if st.button("🔎 Jalankan Query", key="run_duckdb"):
+                    with st.spinner("⏳ Menjalankan query di DuckDB..."):
+                        loaded = source.load(
+                            st.session_state["features"] + [TARGET_COL],
+                            filters,
+                            downcast=downcast,
+                        )
+                    publish_raw_dataset(loaded, upload_key)
+                    st.rerun()
+                st.info("💡 Atur filter lalu klik **Jalankan Query**. Hanya hasil query yang dimuat ke memori.")
+                return
+            elif background:
+                # job lama untuk file/opsi lain tidak diperlukan lagi
+                if job is not None and st.session_state["ingest_job"][1] != upload_key:
+                    job.cancel()
+                    forget_job(job.id)
+                    job = None
+                # mulai job baru; raw_df baru dipublikasikan ke session_state setelah job selesai
+                if job is None:
+                    job = start_job(
+                        ingest_job,
+                        uploaded_file,
+                        uploaded_file.name,
+                        columns=st.session_state["features"] + [TARGET_COL],
+                        chunked=chunked,
+                        downcast=downcast,
+                        dtype_backend=dtype_backend,
+                    )
+                    st.session_state["ingest_job"] = (job.id, upload_key)
+                _show_ingest_status(job)
+                return
+            else:
+                # Placeholder untuk progres pembacaan (jumlah baris & posisi byte)
+                progress_bar = st.progress(0.0)
+                progress_text = st.empty()
+
+                def on_progress(rows_read):
+                    # posisi pointer file dipakai sebagai estimasi persentase yang sudah dibaca
+                    frac = min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0)
+                    progress_bar.progress(frac)
+                    progress_text.caption(f"📥 Membaca data... {rows_read:,} baris")
 
-            # Simpan dataset mentah ke session_state supaya bisa dipakai di halaman lain
-            st.session_state["raw_df"] = df
+                # Baca file menjadi DataFrame pandas (file kolomnar hanya membaca kolom fitur + target).
+                # Hasil parsing di-cache berdasarkan hash isi file, jadi file yang sama
+                # dari session lain tidak diparse ulang.
+                loaded = read_dataset_cached(
+                    uploaded_file,
+                    uploaded_file.name,
+                    columns=st.session_state["features"] + [TARGET_COL],
+                    chunked=chunked,
+                    downcast=downcast,
+                    on_progress=on_progress,
+                    dtype_backend=dtype_backend,
+                )
+
+                # Bersihkan indikator progres setelah selesai
+                progress_bar.empty()
+                progress_text.empty()
+
+                # Simpan dataset mentah ke session_state supaya bisa dipakai di halaman lain.
+                # Hasil preprocessing & model hanya di-reset jika isi dataset benar-benar berubah.
+                publish_raw_dataset(loaded, upload_key)
+                df = st.session_state["raw_df"]
 
             # Notifikasi bahwa upload berhasil
             st.success("✅ Dataset berhasil diupload!")
+            if detect_format(uploaded_file.name) != "csv":
+                st.caption(f"📐 Proyeksi kolom aktif: hanya {df.shape[1]} kolom (fitur + target) yang dibaca dari file.")
             
             # -----------------------------
             #  METRIK RINGKAS DATASET
@@ -49,10 +377,17 @@ def show_upload_dataset():
                 # Total kolom data
                 st.metric("📋 Total Kolom", f"{df.shape[1]:,}")
             with col3:
-                # Perkiraan ukuran memori DataFrame (dalam KB)
+                # Perkiraan ukuran memori DataFrame (dalam KB), sesudah vs sebelum downcast
+                nbytes = st.session_state["raw_nbytes"]
+                nbytes_original = st.session_state["raw_nbytes_original"]
                 st.metric(
                     "💾 Ukuran Data",
-                    f"{df.memory_usage(deep=True).sum() / 1024:.2f} KB"
+                    f"{nbytes / 1024:.2f} KB",
+                    delta=(
+                        f"{(nbytes - nbytes_original) / 1024:,.2f} KB dari {nbytes_original / 1024:,.2f} KB"
+                        if nbytes != nbytes_original else None
+                    ),
+                    delta_color="inverse",
                 )
 
             # Tampilkan 5 baris pertama sebagai preview
@@ -63,20 +398,67 @@ def show_upload_dataset():
             #  INFORMASI TIPE & MISSING
             # -----------------------------
             st.markdown("### 📈 Informasi Kolom")
-            col_info = pd.DataFrame({
-                'Kolom': df.columns,              # nama kolom
-                'Tipe Data': df.dtypes.values,    # tipe data per kolom
-                'Non-Null Count': df.count().values,   # jumlah data tidak null
-                'Null Count': df.isna().sum().values   # jumlah data null per kolom
-            })
+            # Profil kolom (tipe, null, min/max, nilai unik) dihitung sekali per versi dataset
+            col_info = get_raw_profile()["columns"]
             st.dataframe(col_info, use_container_width=True)
 
+            # -----------------------------
+            #  VALIDASI SKEMA (RENTANG & PILIHAN NILAI)
+            # -----------------------------
+            st.markdown("### 🛡️ Validasi Skema")
+            # satu pemindaian vektor per kolom, dihitung sekali per versi dataset
+            show_validation(get_raw_validation(), df)
+
+            # -----------------------------
+            #  APPEND BATCH DATA BARU
+            # -----------------------------
+            with st.expander("➕ Tambah Batch Data Baru (Append)"):
+                st.caption(
+                    "Batch baru ditambahkan ke dataset di atas. Jika preprocessing sudah dijalankan, "
+                    "hanya baris batch yang diproses (dedup, missing values, encoding) lalu digabung ke data bersih."
+                )
+                batch_file = st.file_uploader(
+                    "Pilih file batch",
+                    type=SUPPORTED_EXTENSIONS,
+                    key="append_uploader",
+                )
+                if batch_file is not None and st.button("➕ Tambahkan Batch", key="run_append"):
+                    with st.spinner("⏳ Menambahkan batch..."):
+                        batch = read_dataset_cached(
+                            batch_file,
+                            batch_file.name,
+                            columns=st.session_state["features"] + [TARGET_COL],
+                            chunked=chunked,
+                            downcast=downcast,
+                            dtype_backend=dtype_backend,
+                        )
+
+                        # gabungkan ke data mentah (+ data bersih jika sudah ada); hanya baris batch yang
+                        # diproses, versi dataset baru = gabungan fingerprint lama + batch
+                        result = append_batch(batch.df, batch.fingerprint)
+                        st.session_state["raw_df"] = result.raw_df
+                        st.session_state["raw_fingerprint"] = result.fingerprint
+                        st.session_state["raw_nbytes"] += batch.nbytes
+                        st.session_state["raw_nbytes_original"] += batch.nbytes_original
+
+                        if result.clean_df is not None:
+                            st.session_state["clean_df"] = result.clean_df
+                            st.session_state["preprocess_info"] = result.info
+                            # model & hasil pencarian hyperparameter lama tanpa batch ini, jadi perlu diulang
+                            st.session_state["rf_model"] = None
+                            st.session_state["search_result"] = None
+                            cancel_train_job()
+                            cancel_search_job()
+
+                    st.success(f"✅ Batch berhasil ditambahkan ({batch.df.shape[0]:,} baris)!")
+                    st.rerun()
+
             # Tombol untuk langsung pindah ke halaman preprocessing
             if st.button("Next >", use_container_width=False):
                 st.session_state["page"] = "Preprocessing Data"  # update halaman aktif
                 st.rerun()  # refresh app agar router di app.py mengarahkan ke halaman berikutnya
                 
         except Exception as e:
-            # Jika gagal membaca CSV, tampilkan pesan error
-            st.error(f"❌ Terjadi kesalahan saat membaca file CSV: {e}")
-            st.info("💡 Pastikan file CSV Anda memiliki format yang benar dan tidak corrupt.")
+            # Jika gagal membaca file, tampilkan pesan error
+            st.error(f"❌ Terjadi kesalahan saat membaca file: {e}")
+            st.info("💡 Pastikan file Anda memiliki format yang benar dan tidak corrupt.")
@@ -8,6 +8,9 @@ import seaborn as sns
 # Import helper functions dan konstanta dari helpers.py
 from helpers import (
     require_clean_data,           # memastikan data hasil preprocessing sudah tersedia
+    get_explore_df,               # data bersih (atau sampelnya jika mode sampel aktif)
+    get_active_duckdb_source,     # sumber DuckDB jika dataset berasal dari engine DuckDB
+    show_data_mode,               # info mode data yang sedang aktif
     generate_pdf_visualizations,  # fungsi untuk membuat file PDF berisi beberapa plot
     plot_feature_importance,      # fungsi untuk menampilkan grafik feature importance
     TARGET_COL,                   # nama kolom target (heart_attack)
@@ -20,8 +23,9 @@ def show_visualization():
 
     # Pastikan data hasil preprocessing sudah ada di session_state
     require_clean_data()
-    # Ambil DataFrame yang sudah dibersihkan
-    df = st.session_state["clean_df"]
+    # Ambil DataFrame yang sudah dibersihkan (sampel berstrata jika mode sampel aktif)
+    df = get_explore_df()
+    show_data_mode(df)
 
     # Membuat 4 tab untuk memisahkan jenis visualisasi
     tab1, tab2, tab3, tab4 = st.tabs(
@@ -32,18 +36,41 @@ def show_visualization():
     # --- TAB 1: Distribusi Data & Proporsi Serangan Jantung ---
     # ==========================================================
     with tab1:
+        # Jika dataset berasal dari engine DuckDB, agregat (histogram & jumlah per kelas)
+        # dihitung langsung di DuckDB atas data bersih (baris unik tanpa missing)
+        duckdb_source = get_active_duckdb_source()
+        if duckdb_source is not None and st.session_state.get("sample_frac"):
+            # agregat DuckDB tidak memakai sampel berstrata, jadi banner mode sampel di atas tidak berlaku di sini
+            st.caption(
+                "🦆 Agregat pada tab ini dihitung langsung di DuckDB atas **seluruh** data bersih hasil query: "
+                "mode sampel tidak berlaku untuk histogram usia & jumlah per kelas."
+            )
+        elif duckdb_source is not None:
+            st.caption("🦆 Agregat pada tab ini dihitung langsung di DuckDB.")
+
         st.markdown("### 📊 Distribusi Usia")
 
-        # Membuat figure baru untuk histogram usia
-        fig1, ax1 = plt.subplots(figsize=(10, 5))
-        # Plot distribusi usia menggunakan seaborn
-        sns.histplot(df["age"], bins=20, kde=True, ax=ax1, color="#8B0000")
-        ax1.set_xlabel("Usia (tahun)", fontsize=12, fontweight="bold")
-        ax1.set_ylabel("Frekuensi", fontsize=12, fontweight="bold")
-        ax1.set_title("Distribusi Usia Pasien", fontsize=14, fontweight="bold", pad=15)
-        plt.tight_layout()
-        # Tampilkan plot ke halaman Streamlit
-        st.pyplot(fig1)
+        # Histogram hasil agregasi DuckDB (None jika filter tidak menyisakan baris bersih)
+        age_hist = duckdb_source.histogram("age", bins=20) if duckdb_source is not None else None
+        if duckdb_source is not None and age_hist is None:
+            st.info("ℹ️ Tidak ada baris bersih pada hasil query DuckDB, histogram usia tidak bisa ditampilkan.")
+        else:
+            # Membuat figure baru untuk histogram usia
+            fig1, ax1 = plt.subplots(figsize=(10, 5))
+            if age_hist is not None:
+                # Histogram hasil agregasi DuckDB digambar sebagai bar chart
+                ax1.bar(
+                    age_hist["left"], age_hist["n"], width=age_hist["width"], align="edge", color="#8B0000", alpha=0.8
+                )
+            else:
+                # Plot distribusi usia menggunakan seaborn
+                sns.histplot(df["age"], bins=20, kde=True, ax=ax1, color="#8B0000")
+            ax1.set_xlabel("Usia (tahun)", fontsize=12, fontweight="bold")
+            ax1.set_ylabel("Frekuensi", fontsize=12, fontweight="bold")
+            ax1.set_title("Distribusi Usia Pasien", fontsize=14, fontweight="bold", pad=15)
+            plt.tight_layout()
+            # Tampilkan plot ke halaman Streamlit
+            st.pyplot(fig1)
 
         st.markdown("### 🏥 Proporsi Serangan Jantung")
 
@@ -52,8 +79,11 @@ def show_visualization():
         with col1:
             # Figure untuk bar chart jumlah kasus serangan / tidak
             fig2, ax2 = plt.subplots(figsize=(8, 5))
-            # Menghitung jumlah setiap kelas target
-            heart_counts = df[TARGET_COL].value_counts()
+            # Menghitung jumlah setiap kelas target (di DuckDB jika tersedia)
+            if duckdb_source is not None:
+                heart_counts = duckdb_source.value_counts(TARGET_COL)
+            else:
+                heart_counts = df[TARGET_COL].value_counts()
             colors = ["#28a745", "#8B0000"]
             # Membuat bar chart
             bars = ax2.bar(heart_counts.index, heart_counts.values, color=colors)
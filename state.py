@@ -1,6 +1,11 @@
 # state.py
+import uuid
+
 import streamlit as st
 
+from core.jobs import forget_job, get_job
+from core.pipeline import DEFAULT_FEATURES
+
 def init_session_state():
     """
     Inisialisasi semua variabel st.session_state yang dibutuhkan aplikasi.
@@ -11,6 +16,10 @@ def init_session_state():
     - Tempat penyimpanan model & daftar fitur sudah siap
     """
 
+    # Id session (pemilik job di scheduler training bersama, lihat core.scheduler)
+    if "session_id" not in st.session_state:
+        st.session_state["session_id"] = uuid.uuid4().hex
+
     # Menentukan halaman awal aplikasi (default = "Home")
     if "page" not in st.session_state:
         st.session_state["page"] = "Home"
@@ -19,6 +28,28 @@ def init_session_state():
     if "raw_df" not in st.session_state:
         st.session_state["raw_df"] = None
 
+    # Id versi dataset mentah (hash isi file + opsi pembacaan) & ukuran memorinya
+    # (sesudah dan sebelum downcast tipe data).
+    # Dipakai untuk mendeteksi apakah file yang di-upload berubah antar rerun.
+    if "raw_fingerprint" not in st.session_state:
+        st.session_state["raw_fingerprint"] = None
+    if "raw_nbytes" not in st.session_state:
+        st.session_state["raw_nbytes"] = None
+    if "raw_nbytes_original" not in st.session_state:
+        st.session_state["raw_nbytes_original"] = None
+
+    # Job pembacaan dataset di latar belakang: (job_id, upload_key) atau None
+    if "ingest_job" not in st.session_state:
+        st.session_state["ingest_job"] = None
+
+    # Sumber data DuckDB (engine opsional): (file_id, DuckDBSource) atau None
+    if "duckdb_source" not in st.session_state:
+        st.session_state["duckdb_source"] = None
+
+    # Fraksi sampel untuk halaman eksplorasi (None = mode data penuh)
+    if "sample_frac" not in st.session_state:
+        st.session_state["sample_frac"] = None
+
     # Menyimpan dataset yang sudah melalui proses preprocessing
     if "clean_df" not in st.session_state:
         st.session_state["clean_df"] = None
@@ -27,26 +58,103 @@ def init_session_state():
     if "rf_model" not in st.session_state:
         st.session_state["rf_model"] = None
 
+    # Job training model di latar belakang: (job_id, kunci model, asal model, preprocessor) atau None
+    if "train_job" not in st.session_state:
+        st.session_state["train_job"] = None
+
+    # Job pencarian hyperparameter di latar belakang:
+    # (job_id, data training, test_size, random_state, batas waktu) atau None
+    if "search_job" not in st.session_state:
+        st.session_state["search_job"] = None
+
+    # Hasil pencarian hyperparameter terakhir (leaderboard, konfigurasi terbaik, data & split) atau None
+    if "search_result" not in st.session_state:
+        st.session_state["search_result"] = None
+
+    # Menyimpan Preprocessor (encoding hasil fit) yang dipakai saat model dilatih
+    if "rf_preprocessor" not in st.session_state:
+        st.session_state["rf_preprocessor"] = None
+
     # Menyimpan daftar nama fitur yang digunakan sebagai input model
-    # Urutan dan nama kolom di sini harus sesuai dengan kolom di dataset
+    # (default dari core.pipeline.DEFAULT_FEATURES, disalin supaya tiap session punya list sendiri)
     if "features" not in st.session_state:
-        st.session_state["features"] = [
-            "age",
-            "hypertension",
-            "blood_pressure_systolic",
-            "blood_pressure_diastolic",
-            "diabetes",
-            "cholesterol_level",
-            "cholesterol_hdl",
-            "cholesterol_ldl",
-            "triglycerides",
-            "fasting_blood_sugar",
-            "obesity",
-            "waist_circumference",
-            "previous_heart_disease",
-            "smoking_status",
-            "physical_activity",
-        ]
+        st.session_state["features"] = list(DEFAULT_FEATURES)
+
+
+def _cancel_session_job(key: str):
+    # batalkan & lupakan job yang id-nya tersimpan di session_state[key] (elemen pertama tuple)
+    job_info = st.session_state.get(key)
+    if job_info is not None:
+        job = get_job(job_info[0])
+        if job is not None:
+            job.cancel()
+            forget_job(job.id)
+    st.session_state[key] = None
+
+
+def cancel_train_job():
+    """
+    Membatalkan job training latar belakang milik session ini (jika ada), misalnya karena
+    data training berubah atau training baru dimulai, supaya hasil lama tidak dipublikasikan.
+    """
+    _cancel_session_job("train_job")
+
+
+def cancel_search_job():
+    """Membatalkan job pencarian hyperparameter milik session ini (jika ada), seperti cancel_train_job."""
+    _cancel_session_job("search_job")
+
+
+def reset_downstream_state():
+    """
+    Menghapus hasil tahap-tahap setelah upload (preprocessing & model).
+
+    Dipanggil saat dataset mentah berganti, supaya clean_df dan rf_model
+    tidak tertinggal dari dataset lama.
+    """
+    cancel_train_job()
+    cancel_search_job()
+    st.session_state["search_result"] = None
+    st.session_state["clean_df"] = None
+    st.session_state["preprocess_info"] = None
+    st.session_state["append_state"] = None
+    st.session_state["rf_model"] = None
+    st.session_state["rf_preprocessor"] = None
+    st.session_state["rf_train_key"] = None
+    st.session_state["train_fingerprint"] = None
+
+
+def publish_raw_dataset(loaded, upload_key):
+    """
+    Menyimpan dataset hasil upload (core.ingest.LoadedDataset) ke session_state.
+
+    raw_df dan metadatanya diganti bersamaan; hasil preprocessing & model hanya
+    di-reset jika isi dataset benar-benar berubah (fingerprint berbeda).
+    """
+    if loaded.fingerprint != st.session_state["raw_fingerprint"]:
+        st.session_state["raw_df"] = loaded.df
+        st.session_state["raw_fingerprint"] = loaded.fingerprint
+        st.session_state["raw_nbytes"] = loaded.nbytes
+        st.session_state["raw_nbytes_original"] = loaded.nbytes_original
+        reset_downstream_state()
+    st.session_state["raw_upload_key"] = upload_key
+
+
+def publish_clean_dataset(clean_df, info, fingerprint, upload_key):
+    """
+    Menyimpan hasil preprocessing out-of-core (core.outofcore) ke session_state.
+
+    Pada mode ini data mentah tidak pernah dimuat ke memori, jadi raw_df dikosongkan
+    dan clean_df + info langsung menjadi data aktif untuk halaman berikutnya.
+    """
+    reset_downstream_state()
+    st.session_state["raw_df"] = None
+    st.session_state["raw_fingerprint"] = fingerprint
+    st.session_state["raw_nbytes"] = None
+    st.session_state["raw_nbytes_original"] = None
+    st.session_state["clean_df"] = clean_df
+    st.session_state["preprocess_info"] = info
+    st.session_state["raw_upload_key"] = upload_key
 
 
 def reset_state():
@@ -0,0 +1,25 @@
+# tests/conftest.py
+"""
+Fixture bersama untuk test: dataset sintetis yang meniru dataset Heart Attack Prediction
+in Indonesia (generator yang sama dengan script benchmark).
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# supaya modul di root repo (core/, cli.py, dll.) bisa di-import dari folder tests/
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.common import MODEL_COLUMNS, make_dataset  # noqa: E402
+
+FEATURES = MODEL_COLUMNS[:-1]
+TARGET = MODEL_COLUMNS[-1]
+
+
+@pytest.fixture
+def heart_df():
+    """Dataset kecil dengan missing value & duplikat (cukup untuk training beberapa tree)."""
+    return make_dataset(2000, seed=7, missing_frac=0.02, dup_frac=0.05)
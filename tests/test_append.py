@@ -0,0 +1,114 @@
+# tests/test_append.py
+"""
+Append batch inkremental (core.append.AppendState) harus memberi hasil yang sama dengan
+memproses ulang dataset gabungan dari awal: data mentah, profil, validasi skema,
+data bersih, dan hitungan di info preprocessing.
+"""
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from conftest import FEATURES, TARGET
+from core.append import AppendState
+from core.frame_buffer import FrameBuffer
+from core.preprocess import preprocess_frame
+from core.profiling import PROFILE_CACHE, profile_dataframe
+from core.schema import VALIDATION_CACHE, validate_frame
+
+INFO_COUNTS = ["rows_before", "rows_after", "duplicates_removed", "missing_values_before"]
+
+
+def _with_backend(df, backend):
+    if backend == "pyarrow":
+        return df.convert_dtypes(dtype_backend="pyarrow")
+    return df.assign(smoking_status=df["smoking_status"].astype("category"))
+
+
+def _append_all(base, batches):
+    # fingerprint unik per test supaya tidak memakai hash/profil cache milik test lain
+    clean, info = preprocess_frame(base, FEATURES, TARGET)
+    state = AppendState(base, uuid.uuid4().hex, FEATURES, TARGET)
+    for batch in batches:
+        result = state.append(batch, uuid.uuid4().hex, clean, info)
+        clean, info = result.clean_df, result.info
+    return result
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pyarrow"])
+def test_append_matches_full_preprocess(heart_df, backend):
+    df = _with_backend(heart_df, backend)
+    base = df.iloc[:1200].reset_index(drop=True)
+    # batch kedua mengulang baris lama, termasuk baris dengan missing value
+    batches = [df.iloc[1200:1600], df.iloc[:300], df.iloc[1600:]]
+    result = _append_all(base, [b.reset_index(drop=True) for b in batches])
+
+    full = pd.concat([base, *batches], ignore_index=True)
+    full_clean, full_info = preprocess_frame(full, FEATURES, TARGET)
+
+    assert {k: result.info[k] for k in INFO_COUNTS} == {k: full_info[k] for k in INFO_COUNTS}
+    assert result.info["duplicates_removed"] > heart_df.iloc[:300].duplicated(FEATURES + [TARGET]).sum()
+    pd.testing.assert_frame_equal(result.clean_df, full_clean, check_dtype=False)
+    pd.testing.assert_frame_equal(result.raw_df, full, check_dtype=False)
+
+    # profil & validasi versi dataset baru sudah ada di cache, sama dengan hasil hitung ulang
+    profile, full_profile = PROFILE_CACHE.get(result.fingerprint), profile_dataframe(full)
+    stats = ["Min", "Max"]
+    pd.testing.assert_frame_equal(
+        profile["columns"].drop(columns=stats), full_profile["columns"].drop(columns=stats), check_dtype=False
+    )
+    for col in stats:
+        np.testing.assert_array_equal(
+            profile["columns"][col], pd.to_numeric(full_profile["columns"][col], errors="coerce").astype("float64")
+        )
+    assert {k: profile[k] for k in ("rows", "missing_total", "duplicates")} == {
+        k: full_profile[k] for k in ("rows", "missing_total", "duplicates")
+    }
+    report, full_report = VALIDATION_CACHE.get(result.fingerprint), validate_frame(full)
+    pd.testing.assert_frame_equal(report["columns"], full_report["columns"])
+    np.testing.assert_array_equal(report["invalid"], full_report["invalid"])
+
+
+def test_append_new_category_keeps_old_codes(heart_df):
+    base = heart_df.iloc[:1500].reset_index(drop=True)
+    batch = heart_df.iloc[1500:].reset_index(drop=True)
+    batch.loc[:9, "smoking_status"] = "Vape"
+    result = _append_all(base, [batch])
+
+    full = pd.concat([base, batch], ignore_index=True)
+    full_clean, full_info = preprocess_frame(full, FEATURES, TARGET)
+    assert {k: result.info[k] for k in INFO_COUNTS} == {k: full_info[k] for k in INFO_COUNTS}
+
+    # kategori baru ditambahkan di akhir vocabulary; nilai hasil decode sama dengan proses penuh
+    assert result.info["category_mappings"]["smoking_status"][-1] == "Vape"
+    for col, cats in full_info["category_mappings"].items():
+        decoded = np.asarray(result.info["category_mappings"][col], dtype=object)[result.clean_df[col]]
+        np.testing.assert_array_equal(decoded, np.asarray(cats, dtype=object)[full_clean[col]])
+
+
+def test_frame_buffer_matches_concat():
+    base = pd.DataFrame({
+        "a": np.arange(5, dtype="int8"),
+        "b": pd.Categorical(list("xyxyx")),
+        "c": pd.array(list("pqrst"), dtype=pd.ArrowDtype(pa.string())),
+    })
+    batch = pd.DataFrame({"b": ["z", "x"], "c": pd.Categorical(["u", None]), "d": [1.5, 2.5]})
+    buffer = FrameBuffer(base)
+    rows = buffer.append(batch)
+
+    # sama seperti pd.concat setelah kategori diseragamkan: kategori baru di akhir, kolom yang
+    # tidak ada di salah satu frame berisi missing value
+    expected = pd.DataFrame({
+        "a": [0, 1, 2, 3, 4, np.nan, np.nan],
+        "b": pd.Categorical(list("xyxyxzx"), categories=["x", "y", "z"]),
+        "c": pd.array(list("pqrstu") + [None], dtype=pd.ArrowDtype(pa.string())),
+        "d": [np.nan] * 5 + [1.5, 2.5],
+    })
+    pd.testing.assert_frame_equal(buffer.frame, expected)
+    pd.testing.assert_frame_equal(rows, expected.iloc[5:])
+    # baris lama tidak disalin ulang saat batch berikutnya ditambahkan
+    frame = buffer.frame
+    buffer.append(batch)
+    assert np.shares_memory(buffer.frame["d"].to_numpy(), frame["d"].to_numpy())
@@ -0,0 +1,55 @@
+# tests/test_cli.py
+import json
+
+import pandas as pd
+import pytest
+
+import cli
+
+
+@pytest.mark.parametrize("suffix, compression", [("csv.gz", "gzip"), ("csv.zst", "zstd")])
+@pytest.mark.parametrize("out_of_core", [False, True])
+def test_cli_compressed_path(tmp_path, heart_df, suffix, compression, out_of_core):
+    # path file terkompresi dari command line dibaca sampai scoring tanpa error
+    path = tmp_path / f"heart.{suffix}"
+    heart_df.to_csv(path, index=False, compression=compression)
+    out_dir = tmp_path / "out"
+    argv = [str(path), "--out-dir", str(out_dir), "--n-estimators", "5"]
+    if out_of_core:
+        argv.append("--out-of-core")
+
+    assert cli.main(argv) == 0
+    metrics = json.loads((out_dir / cli.METRICS_FILE).read_text(encoding="utf-8"))
+    assert metrics["preprocess"]["rows_before"] == len(heart_df)
+    assert metrics["scored_rows"] > 0
+    assert (out_dir / cli.SCORES_FILE).exists()
+
+
+def test_cli_rejects_dtype_backend_with_out_of_core(tmp_path):
+    # backend dtype tidak berlaku di mode out-of-core, kombinasi ini ditolak argparse
+    with pytest.raises(SystemExit) as exc:
+        cli.parse_args(["heart.csv", "--out-dir", str(tmp_path), "--out-of-core", "--dtype-backend", "pyarrow"])
+    assert exc.value.code == 2
+
+
+def test_cli_out_of_core_scores_without_loading_input(tmp_path, heart_df, monkeypatch):
+    # --out-of-core tanpa --score: file input di-scoring per batch, tidak dimuat utuh dengan read_dataset
+    path = tmp_path / "heart.csv"
+    heart_df.to_csv(path, index=False)
+    argv = [str(path), "--n-estimators", "5", "--n-jobs", "1"]
+    assert cli.main(argv + ["--out-dir", str(tmp_path / "mem")]) == 0
+
+    def fail(*args, **kwargs):
+        raise AssertionError("read_dataset tidak boleh dipakai di mode out-of-core")
+
+    monkeypatch.setattr(cli, "read_dataset", fail)
+    assert cli.main(argv + ["--out-dir", str(tmp_path / "ooc"), "--out-of-core"]) == 0
+
+    metrics = {
+        name: json.loads((tmp_path / name / cli.METRICS_FILE).read_text(encoding="utf-8")) for name in ("mem", "ooc")
+    }
+    for key in ("scored_rows", "unscored_rows", "unknown_category_rows"):
+        assert metrics["ooc"][key] == metrics["mem"][key]
+    assert metrics["ooc"]["schema_violations"]["score"] == metrics["mem"]["schema_violations"]["score"]
+    scores = {name: pd.read_csv(tmp_path / name / cli.SCORES_FILE) for name in ("mem", "ooc")}
+    pd.testing.assert_frame_equal(scores["ooc"], scores["mem"], check_dtype=False)
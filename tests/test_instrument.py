@@ -0,0 +1,49 @@
+# tests/test_instrument.py
+"""StageTimer: memori hanya diukur jika diminta, dan tracemalloc aman dipakai dari banyak thread."""
+import threading
+import tracemalloc
+
+import numpy as np
+
+from core.instrument import StageTimer, stages_frame
+
+
+def test_memory_not_traced_by_default():
+    timer = StageTimer()
+    with timer.stage("a"):
+        assert not tracemalloc.is_tracing()
+    assert "Peak Memori (MB)" not in timer.records[0]
+    assert "Peak Memori (MB)" not in stages_frame(timer.records).columns
+
+
+def test_nested_stage_keeps_outer_tracing():
+    outer, inner = StageTimer(trace_memory=True), StageTimer(trace_memory=True)
+    with outer.stage("luar"):
+        with inner.stage("dalam"):
+            pass
+        assert tracemalloc.is_tracing()
+        data = np.ones(4 * 1024 * 1024)  # 32 MB
+    del data
+    assert not tracemalloc.is_tracing()
+    assert outer.records[0]["Peak Memori (MB)"] >= 30
+
+
+def test_concurrent_stages_stop_tracing_once():
+    started, release = threading.Barrier(4), threading.Event()
+    timers = [StageTimer(trace_memory=True) for _ in range(4)]
+
+    def work(timer):
+        with timer.stage("job"):
+            started.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in timers]
+    for t in threads:
+        t.start()
+    threads[0].join(timeout=0.1)
+    assert tracemalloc.is_tracing()
+    release.set()
+    for t in threads:
+        t.join()
+    assert not tracemalloc.is_tracing()
+    assert all(len(t.records) == 1 for t in timers)
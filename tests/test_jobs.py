@@ -0,0 +1,54 @@
+# tests/test_jobs.py
+import io
+import threading
+
+import core.ingest as ingest
+from core.ingest import ingest_job
+from core.jobs import CANCELLED, DONE, Job
+
+
+def test_cancel_after_last_checkpoint_marks_cancelled():
+    # pembatalan yang masuk saat fungsi job sudah melewati titik pengecekan terakhir
+    started, release = threading.Event(), threading.Event()
+
+    def work(job):
+        started.set()
+        release.wait()
+        return "hasil"
+
+    job = Job(work)
+    thread = threading.Thread(target=job.run)
+    thread.start()
+    started.wait()
+    job.cancel()
+    release.set()
+    thread.join()
+
+    assert job.status == CANCELLED
+    assert job.result is None
+
+
+def test_job_without_cancel_is_done():
+    job = Job(lambda job: 42)
+    job.run()
+    assert job.status == DONE and job.result == 42
+
+
+def test_cancelled_parquet_ingest_is_not_published(heart_df, monkeypatch):
+    # Parquet tidak punya callback per chunk: pembatalan selama pembacaan harus tetap berlaku
+    buf = io.BytesIO()
+    heart_df.to_parquet(buf, index=False)
+    job = Job(ingest_job, buf, "heart.parquet")
+
+    original = ingest.read_dataset
+
+    def read_then_cancel(*args, **kwargs):
+        df = original(*args, **kwargs)
+        job.cancel()
+        return df
+
+    monkeypatch.setattr(ingest, "read_dataset", read_then_cancel)
+    job.run()
+
+    assert job.status == CANCELLED
+    assert job.result is None
@@ -0,0 +1,38 @@
+# tests/test_outofcore.py
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from conftest import FEATURES, TARGET
+from core.ingest import iter_batches
+from core.outofcore import load_clean_store, preprocess_out_of_core
+from core.preprocess import preprocess_frame
+
+BLOCK_SIZE = 16 * 1024
+
+
+@pytest.mark.parametrize("suffix, compression", [("csv", None), ("csv.gz", "gzip")])
+def test_out_of_core_falls_back_to_pandas_on_type_change(tmp_path, heart_df, suffix, compression):
+    # kolom integer yang baru berisi desimal setelah blok pertama: pass 1 diulang dengan engine pandas
+    df = heart_df[FEATURES + [TARGET]].copy()
+    df["age"] = df["age"].astype("object")
+    df.loc[df.index[-5:], "age"] = df["age"].iloc[-5:] + 0.5
+    path = tmp_path / f"heart.{suffix}"
+    df.to_csv(path, index=False, compression=compression)
+
+    with pytest.raises(pa.ArrowInvalid):
+        list(iter_batches(str(path), path.name, FEATURES + [TARGET], block_size=BLOCK_SIZE))
+    batches = list(iter_batches(str(path), path.name, FEATURES + [TARGET], block_size=BLOCK_SIZE, engine="pandas"))
+    assert len(batches) > 1
+    assert all(b.schema == batches[0].schema for b in batches)
+
+    store_dir = tmp_path / "store"
+    store_dir.mkdir()
+    info = preprocess_out_of_core(str(path), path.name, FEATURES, TARGET, str(store_dir), block_size=BLOCK_SIZE)
+    clean = load_clean_store(info["store_path"])
+    expected, expected_info = preprocess_frame(pd.read_csv(path), FEATURES, TARGET)
+
+    pd.testing.assert_frame_equal(clean, expected.reset_index(drop=True), check_dtype=False)
+    assert info["duplicates_removed"] == expected_info["duplicates_removed"]
+    assert info["missing_values_before"] == expected_info["missing_values_before"]
+    assert not (store_dir / "spill").exists()
@@ -0,0 +1,42 @@
+# tests/test_query_engine.py
+"""DuckDBSource: file sementara & koneksi dilepas, histogram kosong mengembalikan None."""
+import gc
+import io
+import os
+
+import pytest
+
+from conftest import FEATURES, TARGET
+
+duckdb = pytest.importorskip("duckdb")
+
+from core.query_engine import DuckDBSource  # noqa: E402
+
+
+@pytest.fixture
+def csv_upload(heart_df):
+    return io.BytesIO(heart_df.to_csv(index=False).encode())
+
+
+def test_close_removes_temp_file(csv_upload):
+    source = DuckDBSource(csv_upload, "heart.csv")
+    assert os.path.exists(source.path)
+    source.close()
+    source.close()
+    assert not os.path.exists(source.path)
+
+
+def test_dropped_source_is_cleaned_up(csv_upload):
+    source = DuckDBSource(csv_upload, "heart.csv")
+    path = source.path
+    del source
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_histogram_empty_filter_returns_none(csv_upload):
+    source = DuckDBSource(csv_upload, "heart.csv")
+    source.load(FEATURES + [TARGET], [("age", ">", 1000)])
+    assert source.histogram("age") is None
+    assert source.value_counts(TARGET).empty
+    source.close()
@@ -0,0 +1,71 @@
+# tests/test_scheduler.py
+import threading
+import time
+
+from core.jobs import CANCELLED, DONE
+from core.scheduler import TrainingScheduler
+
+
+def _wait(jobs, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not all(job.finished for job in jobs):
+        assert time.monotonic() < deadline, "job tidak selesai dalam batas waktu"
+        time.sleep(0.01)
+
+
+def _blocked_scheduler():
+    # scheduler satu worker yang sedang menjalankan job penahan, jadi job berikutnya tetap antre
+    scheduler = TrainingScheduler(max_workers=1, threads_per_job=1)
+    started, release = threading.Event(), threading.Event()
+
+    def hold(job):
+        started.set()
+        release.wait()
+
+    blocker = scheduler.submit("penahan", hold)
+    assert started.wait(5)
+    return scheduler, blocker, release
+
+
+def test_owners_are_interleaved_round_robin():
+    # satu session dengan banyak job tidak membuat job session lain menunggu semuanya selesai
+    scheduler, blocker, release = _blocked_scheduler()
+    ran = []
+
+    def record(job, name):
+        ran.append(name)
+
+    jobs = {name: scheduler.submit(owner, record, name)
+            for owner, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("b", "b2")]}
+
+    expected = ["a1", "b1", "a2", "b2", "a3"]
+    assert [scheduler.position(jobs[name].id) for name in expected] == [1, 2, 3, 4, 5]
+    assert scheduler.stats()["queued"] == 5
+    assert scheduler.position(blocker.id) is None  # sedang berjalan, bukan antre
+
+    release.set()
+    _wait([blocker, *jobs.values()])
+    assert ran == expected
+    assert all(job.status == DONE for job in jobs.values())
+
+
+def test_cancelled_queued_job_never_runs():
+    scheduler, blocker, release = _blocked_scheduler()
+    ran = []
+
+    def record(job, name):
+        ran.append(name)
+
+    cancelled = scheduler.submit("a", record, "batal")
+    kept = scheduler.submit("b", record, "lanjut")
+    cancelled.cancel()
+
+    # langsung keluar dari antrean dan berstatus CANCELLED tanpa menunggu worker
+    assert cancelled.status == CANCELLED
+    assert scheduler.position(cancelled.id) is None
+    assert scheduler.position(kept.id) == 1
+
+    release.set()
+    _wait([blocker, kept])
+    assert ran == ["lanjut"]
+    assert kept.status == DONE
@@ -0,0 +1,64 @@
+# tests/test_scoring.py
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from conftest import FEATURES, TARGET
+from core.pipeline import preprocess_frame, score_batch, train_model
+from core.transform import Preprocessor
+
+
+def _train(df):
+    clean, info = preprocess_frame(df[FEATURES + [TARGET]], FEATURES, TARGET)
+    return train_model(clean, FEATURES, TARGET, n_estimators=5, n_jobs=1).model, info["preprocessor"]
+
+
+def test_unseen_category_is_not_scored(heart_df):
+    # smoking_status yang tidak ada saat training tidak boleh di-encode sebagai -1 lalu diprediksi
+    model, preprocessor = _train(heart_df)
+    batch = heart_df[FEATURES].dropna().head(6).reset_index(drop=True)
+    batch["smoking_status"] = batch["smoking_status"].astype("object")
+    batch.loc[[1, 4], "smoking_status"] = "Vape"
+
+    scored = score_batch(model, preprocessor, batch)
+
+    unknown = np.zeros(len(batch), dtype=bool)
+    unknown[[1, 4]] = True
+    assert (scored["kategori_dikenal"].to_numpy() == ~unknown).all()
+    assert scored.loc[unknown, "proba"].isna().all()
+    assert scored.loc[unknown, "prediksi"].isna().all()
+    assert scored.loc[~unknown, "prediksi"].notna().all()
+
+
+def test_missing_category_is_not_scored(heart_df):
+    # kategori kosong juga tidak diprediksi, tetapi bukan termasuk kategori tak dikenal
+    model, preprocessor = _train(heart_df)
+    batch = heart_df[FEATURES].dropna().head(3).reset_index(drop=True)
+    batch["smoking_status"] = batch["smoking_status"].astype("object")
+    batch.loc[0, "smoking_status"] = None
+
+    scored = score_batch(model, preprocessor, batch)
+
+    assert scored["kategori_dikenal"].all()
+    assert scored["prediksi"].isna().tolist() == [True, False, False]
+
+
+@pytest.mark.parametrize("dtype", ["category", pd.ArrowDtype(pa.string())])
+def test_all_missing_category_column_is_not_scored(heart_df, dtype):
+    # kolom kategori yang seluruhnya kosong (tanpa kategori sama sekali) tidak membuat transform gagal
+    model, preprocessor = _train(heart_df)
+    batch = heart_df[FEATURES].dropna().head(4).reset_index(drop=True)
+    batch["smoking_status"] = pd.Series([None] * len(batch), dtype=dtype)
+
+    scored = score_batch(model, preprocessor, batch)
+
+    assert scored["kategori_dikenal"].all()
+    assert scored["prediksi"].isna().all()
+
+
+def test_fit_ignores_missing_values_in_object_column():
+    # NaN tidak ikut diurutkan bersama string saat fit, dan di-encode sebagai -1
+    df = pd.DataFrame({"s": ["b", None, "a", np.nan], "y": [0, 1, 0, 1]})
+    encoded = Preprocessor(["s"], "y").fit_transform(df)
+    assert encoded["s"].tolist() == [1, -1, 0, -1]
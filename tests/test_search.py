@@ -0,0 +1,77 @@
+# tests/test_search.py
+import math
+import types
+
+import pytest
+
+import core.search as search
+from conftest import FEATURES, TARGET
+from core.pipeline import DEFAULT_TEST_SIZE, RANDOM_STATE, preprocess_frame, split_data
+from core.search import VALIDATION_SIZE, halving_schedule, search_hyperparameters
+
+N_CANDIDATES = 4
+FACTOR = 2
+
+# filter modul core.pipeline untuk peringatan warm_start + class_weight direset pytest per test
+pytestmark = pytest.mark.filterwarnings("ignore:class_weight presets:UserWarning")
+
+
+@pytest.fixture
+def clean_df(heart_df):
+    return preprocess_frame(heart_df[FEATURES + [TARGET]], FEATURES, TARGET)[0]
+
+
+def _n_fit_rows(df):
+    # jumlah baris training setelah data validasi dipisahkan (sama seperti di search_hyperparameters)
+    n_train = len(split_data(df, FEATURES, TARGET, DEFAULT_TEST_SIZE, RANDOM_STATE)[0])
+    return n_train - math.ceil(n_train * VALIDATION_SIZE)
+
+
+def test_halving_schedule_keeps_fraction_and_grows_samples():
+    # tiap ronde: 1/3 kandidat lanjut, data 3x lebih banyak, ronde terakhir memakai seluruh data
+    assert halving_schedule(27, 13_500) == [(27, 500), (9, 1_500), (3, 4_500), (1, 13_500)]
+    # ronde dikurangi supaya ronde pertama tetap memakai minimal MIN_RESOURCE sampel
+    assert halving_schedule(27, 3_000) == [(27, 1_000), (9, 3_000)]
+    assert halving_schedule(27, 100) == [(27, 100)]
+
+
+def test_halving_search_runs_every_round(clean_df):
+    result = search_hyperparameters(
+        clean_df, FEATURES, TARGET, n_candidates=N_CANDIDATES, factor=FACTOR, time_budget=math.inf, n_jobs=2
+    )
+    n_fit = _n_fit_rows(clean_df)
+    schedule = halving_schedule(N_CANDIDATES, n_fit, FACTOR)
+    assert schedule[-1][1] == n_fit
+
+    board = result["leaderboard"]
+    assert len(board) == result["fits"] == sum(n for n, _ in schedule)
+    assert board.groupby("Ronde")["Sampel"].agg(["size", "first"]).values.tolist() == [list(r) for r in schedule]
+    # kandidat terbaik berasal dari ronde terakhir (seluruh data training)
+    assert board.loc[0, "Ronde"] == len(schedule) and board.loc[0, "Sampel"] == n_fit
+    assert result["rounds"] == len(schedule)
+    assert result["skipped"] == 0 and not result["budget_exhausted"]
+
+
+def test_time_budget_skips_remaining_fits(clean_df, monkeypatch):
+    # jam palsu: batas waktu habis tepat saat ronde kedua dimulai, jadi fit ronde tsb dilewati
+    clock = [0.0]
+    monkeypatch.setattr(search, "time", types.SimpleNamespace(perf_counter=lambda: clock[0]))
+
+    def on_progress(done, total, rnd, rows):
+        if rnd == 2:
+            clock[0] = 100.0
+
+    result = search_hyperparameters(
+        clean_df, FEATURES, TARGET, n_candidates=N_CANDIDATES, factor=FACTOR, time_budget=10, n_jobs=2,
+        on_progress=on_progress,
+    )
+    board = result["leaderboard"]
+    assert len(board) == result["fits"] == N_CANDIDATES
+    assert (board["Ronde"] == 1).all()
+    assert result["skipped"] == N_CANDIDATES // FACTOR
+    assert result["budget_exhausted"]
+
+
+def test_zero_budget_raises(clean_df):
+    with pytest.raises(ValueError):
+        search_hyperparameters(clean_df, FEATURES, TARGET, n_candidates=N_CANDIDATES, time_budget=0)